@@ -18,6 +18,7 @@ from .auth import create_session_token, verify_credentials, verify_session_token
 from .config import get_settings
 from .ingestion import run_ingestion
 from .policy import evaluate_source_policy
+from .politeness import host_slot
 from .publisher import enqueue_publish, run_publisher
 from .relevance import article_age_days, article_relevance
 from .rewrite import generate_article_tags, merge_generated_tags, rewrite_article_text
@@ -35,6 +36,7 @@ from .repositories import (
     list_articles,
     list_articles_page,
     bulk_update_wp_post_ids,
+    list_circuit_breakers,
     list_feeds,
     list_publish_jobs,
     list_runs,
@@ -509,6 +511,7 @@ def admin_dashboard(request: Request):
             "sources": sources,
             "source_policy": source_policy,
             "feeds": feeds,
+            "tripped_hosts": list_circuit_breakers(scope="host", tripped_only=True),
             "runs": runs,
             "publish_jobs": publish_jobs,
             "articles": articles,
@@ -652,7 +655,7 @@ def admin_image_proxy(request: Request, url: str):
                 "Referer": referer or url,
             },
         )
-        with urlopen(req, timeout=10) as resp:
+        with host_slot(url), urlopen(req, timeout=10) as resp:
             body = resp.read()
             content_type = resp.headers.get("Content-Type", "application/octet-stream")
     except Exception:
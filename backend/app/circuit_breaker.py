@@ -0,0 +1,214 @@
+"""Persistent circuit breakers for feeds and article hosts.
+
+A feed or host that keeps failing is "opened" for a backoff period that
+doubles with every further failure (``CIRCUIT_OPEN_BASE_MINUTES`` up to
+``CIRCUIT_OPEN_MAX_MINUTES``). While open, requests are refused immediately
+instead of spending retries and timeouts. Once the period has passed the
+breaker is half-open: exactly one probe request is let through, and its
+outcome closes the breaker again or re-opens it with a longer backoff.
+
+State lives in memory for cheap checks from the ingestion worker threads and
+is persisted to the ``circuit_breakers`` table by the single DB writer
+(``flush``), so it survives restarts and shows up in the admin dashboard and
+``/api/feeds``.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+import logging
+import sqlite3
+import threading
+from typing import Any, Iterator
+from urllib.parse import urlparse
+
+import httpx
+
+from .config import get_settings
+from .repositories import list_circuit_breakers, store_circuit_breakers
+
+logger = logging.getLogger(__name__)
+
+SCOPE_FEED = "feed"
+SCOPE_HOST = "host"
+HALF_OPEN_PROBE_SECONDS = 60  # lease of the single probe request in half-open state
+
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a request is refused because its breaker is open."""
+
+
+class _Breaker:
+    def __init__(self, scope: str, key: str) -> None:
+        self.scope = scope
+        self.key = key
+        self.state = "closed"
+        self.failure_count = 0
+        self.open_until: datetime | None = None
+        self.last_error: str | None = None
+        self.last_failure_at: datetime | None = None
+
+    def as_row(self) -> dict[str, Any]:
+        return {
+            "scope": self.scope,
+            "key": self.key,
+            "state": self.state,
+            "failure_count": self.failure_count,
+            "open_until": _format(self.open_until),
+            "last_error": self.last_error,
+            "last_failure_at": _format(self.last_failure_at),
+        }
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def _format(value: datetime | None) -> str | None:
+    return value.strftime(_TIMESTAMP_FORMAT) if value else None
+
+
+def _parse(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, _TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def host_key(url: str) -> str:
+    try:
+        return (urlparse(url).hostname or "").lower()
+    except Exception:
+        return ""
+
+
+def feed_key(feed_id: int) -> str:
+    return str(int(feed_id))
+
+
+class CircuitBoard:
+    def __init__(self, failure_threshold: int, open_base_minutes: int, open_max_minutes: int) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_base_minutes = max(1, open_base_minutes)
+        self.open_max_minutes = max(self.open_base_minutes, open_max_minutes)
+        self._breakers: dict[tuple[str, str], _Breaker] = {}
+        self._dirty: set[tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    def load(self, rows: list[dict[str, Any]]) -> None:
+        with self._lock:
+            for row in rows:
+                breaker = _Breaker(row["scope"], row["key"])
+                breaker.state = row.get("state") or "closed"
+                breaker.failure_count = int(row.get("failure_count") or 0)
+                breaker.open_until = _parse(row.get("open_until"))
+                breaker.last_error = row.get("last_error")
+                breaker.last_failure_at = _parse(row.get("last_failure_at"))
+                self._breakers[(breaker.scope, breaker.key)] = breaker
+
+    def allow(self, scope: str, key: str) -> bool:
+        """True if a request may go out now; claims the half-open probe if due."""
+        if not key:
+            return True
+        with self._lock:
+            breaker = self._breakers.get((scope, key))
+            if breaker is None or breaker.state == "closed":
+                return True
+            now = _now()
+            if breaker.open_until and now < breaker.open_until:
+                return False
+            breaker.state = "half_open"
+            breaker.open_until = now + timedelta(seconds=HALF_OPEN_PROBE_SECONDS)
+            self._dirty.add((scope, key))
+            return True
+
+    def record_success(self, scope: str, key: str) -> None:
+        if not key:
+            return
+        with self._lock:
+            breaker = self._breakers.get((scope, key))
+            if breaker is None or (breaker.state == "closed" and breaker.failure_count == 0):
+                return
+            breaker.state = "closed"
+            breaker.failure_count = 0
+            breaker.open_until = None
+            self._dirty.add((scope, key))
+
+    def record_failure(self, scope: str, key: str, error: str) -> None:
+        if not key:
+            return
+        with self._lock:
+            breaker = self._breakers.setdefault((scope, key), _Breaker(scope, key))
+            now = _now()
+            breaker.failure_count += 1
+            breaker.last_error = error[:500]
+            breaker.last_failure_at = now
+            if breaker.state == "half_open" or breaker.failure_count >= self.failure_threshold:
+                exponent = max(0, breaker.failure_count - self.failure_threshold)
+                minutes = min(self.open_max_minutes, self.open_base_minutes * 2 ** min(exponent, 16))
+                breaker.state = "open"
+                breaker.open_until = now + timedelta(minutes=minutes)
+            self._dirty.add((scope, key))
+
+    def flush(self, conn: sqlite3.Connection | None = None) -> None:
+        """Persist changed breakers; call from the DB writer."""
+        with self._lock:
+            rows = [self._breakers[key].as_row() for key in self._dirty if key in self._breakers]
+            self._dirty.clear()
+        store_circuit_breakers(rows, conn=conn)
+
+
+_board: CircuitBoard | None = None
+_board_settings: object | None = None
+_board_lock = threading.Lock()
+
+
+def get_circuit_board() -> CircuitBoard:
+    """Process-wide board, loaded from the DB; rebuilt whenever the settings object is replaced."""
+    global _board, _board_settings
+    settings = get_settings()
+    with _board_lock:
+        if _board is None or _board_settings is not settings:
+            board = CircuitBoard(
+                failure_threshold=settings.circuit_failure_threshold,
+                open_base_minutes=settings.circuit_open_base_minutes,
+                open_max_minutes=settings.circuit_open_max_minutes,
+            )
+            try:
+                board.load(list_circuit_breakers())
+            except sqlite3.Error as exc:
+                # Breakers are advisory: start empty rather than block fetches.
+                logger.warning("Circuit-Breaker-Status konnte nicht geladen werden: %s", exc)
+            _board = board
+            _board_settings = settings
+        return _board
+
+
+@contextmanager
+def host_guard(url: str) -> Iterator[None]:
+    """Refuse requests to hosts with an open breaker and record the outcome.
+
+    Transport errors (connect/read timeouts, resets) and HTTP 5xx count as
+    host failures; any other response – including 4xx – proves the host is up.
+    """
+    board = get_circuit_board()
+    key = host_key(url)
+    if not board.allow(SCOPE_HOST, key):
+        raise CircuitOpenError(f"Host {key} voruebergehend gesperrt (Circuit Breaker offen)")
+    try:
+        yield
+    except httpx.HTTPStatusError as exc:
+        if exc.response.status_code >= 500:
+            board.record_failure(SCOPE_HOST, key, f"HTTP {exc.response.status_code}")
+        else:
+            board.record_success(SCOPE_HOST, key)
+        raise
+    except httpx.TransportError as exc:
+        board.record_failure(SCOPE_HOST, key, f"{type(exc).__name__}: {exc}")
+        raise
+    else:
+        board.record_success(SCOPE_HOST, key)
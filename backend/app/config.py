@@ -32,6 +32,7 @@ class Settings(BaseSettings):
     wordpress_default_status: str = "draft"
     openai_api_key: str | None = Field(default=None, validation_alias=AliasChoices("OPENAI_API_KEY"))
     openai_model: str = "gpt-4o-mini"
+    llm_cache_enabled: bool = True  # reuse stored OpenAI responses for identical prompts
 
     # Telegram Bot
     telegram_bot_token: str | None = Field(default=None, validation_alias=AliasChoices("TELEGRAM_BOT_TOKEN"))
@@ -50,6 +51,42 @@ class Settings(BaseSettings):
     pipeline_min_words_rewritten: int = 150  # minimum words in rewritten content (else reject)
     pipeline_max_article_age_days: int = 7   # skip articles older than N days during ingestion (0 = no limit)
 
+    # Ingestion
+    ingestion_workers: int = 1  # parallel feed fetch/extract threads (1 = sequential)
+    image_probe_cache_ttl_hours: int = 72  # reuse image HEAD probe results (0 = no cache)
+    ingestion_poll_default_minutes: int = 60   # initial adaptive poll interval per feed
+    ingestion_poll_min_minutes: int = 15       # busy feeds are never polled more often
+    ingestion_poll_max_minutes: int = 1440     # quiet feeds back off up to this interval
+    near_duplicate_detection: bool = True      # cluster syndicated copies, only one goes through the LLM
+    html_archive_enabled: bool = False         # keep fetched article HTML for offline replay
+    html_archive_dir: str = "backend/data/html_archive"
+    extraction_max_page_bytes: int = 3_000_000  # stop reading article pages after N bytes (0 = no limit)
+    extraction_stop_after_article: bool = False  # stop reading once </article> has arrived
+    extraction_body_budget_bytes: int = 0      # stop reading N bytes after <body> (0 = off)
+    extraction_cache_ttl_hours: int = 24       # reuse extraction results after a 304 revalidation (0 = off)
+    extraction_cache_max_entries: int = 5000   # least recently used entries are evicted beyond this
+    extraction_cache_path: str = "backend/data/extraction_cache.sqlite"
+    extraction_time_budget_ms: int = 1500      # CPU time per page before cheaper strategies take over (0 = off)
+    extraction_processes: int = 0              # decode/extract in N worker processes (0 = in-process)
+    extraction_backend: str = "builtin"       # page parser: builtin tokenizer or selectolax (optional package)
+    light_variants_enabled: bool = False       # learn per host whether AMP/print variants are cheaper and equivalent
+    light_variant_min_trials: int = 3          # equivalent full/variant pairs before a host decision
+    light_variant_min_savings: float = 0.2     # share of bytes the variant must save to be preferred
+
+    # Outbound politeness (shared by feeds, article pages, image probes/downloads)
+    fetch_host_max_concurrency: int = 2      # max parallel requests per host
+    fetch_host_rate_per_second: float = 2.0  # sustained requests/s per host (0 = unlimited)
+    fetch_host_burst: int = 4                # token bucket size per host
+    fetch_host_max_wait_seconds: float = 30.0
+    fetch_host_overrides: str = "presseportal.de=1/1"  # domain=concurrency/rate, comma-separated
+    http_max_connections: int = 50           # shared keep-alive pool across all hosts
+    http_max_keepalive_connections: int = 20
+    http_keepalive_seconds: float = 30.0
+    http2_enabled: bool = True               # only effective if the optional "h2" package is installed
+    circuit_failure_threshold: int = 3       # consecutive failures before a feed/host is skipped
+    circuit_open_base_minutes: int = 15      # first skip period, doubles per further failure
+    circuit_open_max_minutes: int = 1440
+
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
@@ -25,6 +25,28 @@ def get_conn() -> Iterator[sqlite3.Connection]:
         conn.close()
 
 
+@contextmanager
+def use_conn(conn: sqlite3.Connection | None = None) -> Iterator[sqlite3.Connection]:
+    """Reuse ``conn`` if given (the caller owns the transaction), else open a fresh one."""
+    if conn is not None:
+        yield conn
+        return
+    with get_conn() as fresh:
+        yield fresh
+
+
+@contextmanager
+def write_transaction() -> Iterator[sqlite3.Connection]:
+    """Single connection for a batch of writes, committed (and synced) once at the end.
+
+    WAL + synchronous=NORMAL skips the per-commit fsync of the default FULL mode;
+    the database stays consistent, at worst the last batch is lost on power failure.
+    """
+    with get_conn() as conn:
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        yield conn
+
+
 def init_db() -> None:
     with get_conn() as conn:
         conn.executescript(
@@ -132,6 +154,65 @@ def init_db() -> None:
             CREATE INDEX IF NOT EXISTS idx_articles_published_at ON articles(published_at);
             CREATE INDEX IF NOT EXISTS idx_publish_jobs_status_created_at ON publish_jobs(status, created_at);
 
+            CREATE TABLE IF NOT EXISTS image_probe_cache (
+                url TEXT PRIMARY KEY,
+                status_code INTEGER NOT NULL,
+                checked_at TEXT NOT NULL DEFAULT (datetime('now'))
+            );
+
+            CREATE TABLE IF NOT EXISTS article_minhash (
+                article_id INTEGER PRIMARY KEY,
+                signature BLOB NOT NULL,
+                cluster_id INTEGER NOT NULL,
+                similarity REAL NOT NULL DEFAULT 1.0,
+                created_at TEXT NOT NULL DEFAULT (datetime('now')),
+                FOREIGN KEY(article_id) REFERENCES articles(id) ON DELETE CASCADE
+            );
+            CREATE INDEX IF NOT EXISTS idx_article_minhash_cluster_id ON article_minhash(cluster_id);
+
+            CREATE TABLE IF NOT EXISTS article_minhash_bands (
+                band_key INTEGER NOT NULL,
+                article_id INTEGER NOT NULL,
+                PRIMARY KEY (band_key, article_id),
+                FOREIGN KEY(article_id) REFERENCES articles(id) ON DELETE CASCADE
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS circuit_breakers (
+                scope TEXT NOT NULL CHECK (scope IN ('feed', 'host')),
+                key TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'closed' CHECK (state IN ('closed', 'open', 'half_open')),
+                failure_count INTEGER NOT NULL DEFAULT 0,
+                open_until TEXT,
+                last_error TEXT,
+                last_failure_at TEXT,
+                updated_at TEXT NOT NULL DEFAULT (datetime('now')),
+                PRIMARY KEY (scope, key)
+            );
+
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                model TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                temperature REAL NOT NULL,
+                input_hash TEXT NOT NULL,
+                response TEXT NOT NULL,
+                hit_count INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL DEFAULT (datetime('now')),
+                last_hit_at TEXT,
+                PRIMARY KEY (model, prompt_version, temperature, input_hash)
+            );
+
+            CREATE TABLE IF NOT EXISTS light_variants (
+                host TEXT PRIMARY KEY,
+                rule TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'learning' CHECK (state IN ('learning', 'preferred', 'rejected')),
+                trials INTEGER NOT NULL DEFAULT 0,
+                matches INTEGER NOT NULL DEFAULT 0,
+                full_bytes INTEGER NOT NULL DEFAULT 0,
+                light_bytes INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+            );
+
             CREATE TRIGGER IF NOT EXISTS trg_sources_updated_at
             AFTER UPDATE ON sources
             FOR EACH ROW
@@ -288,6 +369,35 @@ def init_db() -> None:
                 """
             )
 
+        # Columns added after the no_image table rebuild above; must run after it
+        # because the rebuild copies an explicit column list.
+        article_columns = {
+            row["name"] for row in conn.execute("PRAGMA table_info(articles)").fetchall()
+        }
+        late_article_columns = {
+            "entry_fingerprint": "ALTER TABLE articles ADD COLUMN entry_fingerprint TEXT",
+        }
+        for column, ddl in late_article_columns.items():
+            if column not in article_columns:
+                conn.execute(ddl)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_entry_fingerprint ON articles(entry_fingerprint)")
+
+        # Adaptive polling schedule per feed.
+        feed_columns = {
+            row["name"] for row in conn.execute("PRAGMA table_info(feeds)").fetchall()
+        }
+        feed_migration_columns = {
+            "poll_interval_minutes": "ALTER TABLE feeds ADD COLUMN poll_interval_minutes INTEGER",
+            "next_poll_at": "ALTER TABLE feeds ADD COLUMN next_poll_at TEXT",
+            "new_entries_per_day": "ALTER TABLE feeds ADD COLUMN new_entries_per_day REAL",
+            "last_new_entry_at": "ALTER TABLE feeds ADD COLUMN last_new_entry_at TEXT",
+            "content_hash": "ALTER TABLE feeds ADD COLUMN content_hash TEXT",
+        }
+        for column, ddl in feed_migration_columns.items():
+            if column not in feed_columns:
+                conn.execute(ddl)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_feeds_next_poll_at ON feeds(next_poll_at)")
+
 
 def rows_to_dicts(rows: list[sqlite3.Row]) -> list[dict[str, Any]]:
     return [dict(r) for r in rows]
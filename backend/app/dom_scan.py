@@ -0,0 +1,280 @@
+"""``PageScan`` built from a C-parsed DOM (optional ``selectolax`` package).
+
+Drop-in alternative to ``page_scan.scan_page``: the page is parsed by
+lexbor (via selectolax) and the fields are filled with CSS queries, so the
+per-token Python loop of the builtin tokenizer disappears. Only byline
+texts and image credits walk a few nodes in Python.
+
+The builtin tokenizer defines the semantics; this module reproduces them
+on the tree:
+
+- ``chunks`` are the text nodes outside script/style/noscript; section
+  ranges are located with sentinel text nodes around the section elements.
+- Byline and credit texts run from the element's start to the next tag the
+  tokenizer would have split at. Untracked inline tags in between are
+  re-serialized from their attributes, as the tokenizer kept them in the
+  text.
+- The adjacent-credit window counts text and (re-serialized) tag lengths
+  instead of raw source offsets.
+
+An HTML5 tree builder repairs broken markup, e.g. it closes a ``<p>``
+before a ``<div>``, so such pages can come out slightly differently. On
+well-formed pages (the benchmark corpus and the test fixtures) both
+scanners produce the same ``ExtractedArticle``.
+"""
+from __future__ import annotations
+
+import importlib.util
+import re
+from typing import Any, Callable, Iterator
+
+from .page_scan import (
+    ADJACENT_CREDIT_WINDOW,
+    FigureScan,
+    ImageScan,
+    PageScan,
+    SectionText,
+    image_from_attrs,
+)
+
+_NOISE_TAGS = ["script", "style", "noscript"]
+# Tags the builtin tokenizer turns into tokens (text chunks end at them).
+_TRACKED_TAGS = {
+    "meta", "link", "title", "h1", "h2", "h3", "h4", "p", "article", "main", "body",
+    "figure", "figcaption", "img", "amp-img", "span", "div", "script", "style", "noscript",
+}
+_IMG_TAGS = {"img", "amp-img"}
+_IMG_SELECTOR = "img, amp-img"
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+_CREDIT_ELEMENT_TAGS = {"span", "p", "div"}
+_CREDIT_CLASS_RE = re.compile(
+    r"copyright|credit|photographer|photo-credit|image-credit|bildrechte|fotocredit",
+    re.IGNORECASE,
+)
+# Class substrings covering every _CREDIT_CLASS_RE alternative (photo-credit, fotocredit ... contain "credit").
+_CREDIT_SELECTOR = ", ".join(f'[class*="{word}" i]' for word in ("copyright", "credit", "photographer", "bildrechte"))
+_BYLINE_CLASS_RE = re.compile(r"author|byline", re.IGNORECASE)
+_BODY_TAG_RE = re.compile(r"<body[\s/>]", re.IGNORECASE)
+_SEPARATOR = "\x00"  # the parser replaces NUL in text, so it cannot occur in a text node
+_START_MARK, _END_MARK = "\x01", "\x02"  # prefixes of the section sentinel texts
+
+
+def available() -> bool:
+    return importlib.util.find_spec("selectolax") is not None
+
+
+def _start_tag(node: Any) -> str:
+    attrs = "".join(f' {name}="{value}"' if value is not None else f" {name}" for name, value in node.attributes.items())
+    return f"<{node.tag}{attrs}>"
+
+
+def _is_marker(node: Any) -> bool:
+    return bool(_BYLINE_CLASS_RE.search(node.attributes.get("class") or ""))
+
+
+def _events(node: Any) -> Iterator[tuple[str, Any]]:
+    """``start``/``text``/``end`` events from ``node`` on, in document order (past its end)."""
+    current = node
+    while current is not None:
+        if current.is_text_node:
+            yield "text", current
+        elif current.is_element_node:
+            yield "start", current
+            if current.child is not None:
+                current = current.child
+                continue
+            if current.tag not in _VOID_TAGS:
+                yield "end", current
+        while current is not None and current.next is None:
+            current = current.parent
+            if current is not None and current.is_element_node:
+                yield "end", current
+        current = current.next if current is not None else None
+
+
+def _raw_length(kind: str, node: Any) -> int:
+    if kind == "text":
+        return len(node.text_content or "")
+    return len(_start_tag(node)) if kind == "start" else len(node.tag) + 3
+
+
+def _text_until(node: Any, stop: Callable[[str, Any], bool], limit: int | None = None) -> str | None:
+    """Text and untracked markup after ``node``'s start tag until ``stop`` fires.
+
+    ``stop`` is asked at every tag the tokenizer would split at. Returns None
+    if more than ``limit`` characters (the stopping tag included) pass first.
+    """
+    pieces: list[str] = []
+    seen = 0
+    events = _events(node)
+    next(events)  # the start tag of ``node`` itself
+    for kind, current in events:
+        seen += _raw_length(kind, current)
+        if limit is not None and seen > limit:
+            return None
+        if kind == "text":
+            pieces.append(current.text_content or "")
+        elif current.tag in _TRACKED_TAGS or (kind == "start" and _is_marker(current)):
+            if stop(kind, current):
+                return "".join(pieces)
+            pieces.append(" ")
+        else:
+            pieces.append(_start_tag(current) if kind == "start" else f"</{current.tag}>")
+    return "".join(pieces) if limit is None else None
+
+
+def _ends_credit(kind: str, node: Any) -> bool:
+    return kind == "end" and node.tag in _CREDIT_ELEMENT_TAGS
+
+
+def _is_credit_element(node: Any) -> bool:
+    return node.tag in _CREDIT_ELEMENT_TAGS and bool(_CREDIT_CLASS_RE.search(node.attributes.get("class") or ""))
+
+
+def _adjacent_credit(img: Any, figure_credits: set[int]) -> str | None:
+    """First credit element that starts and ends within ADJACENT_CREDIT_WINDOW chars after ``img``."""
+    seen = 0
+    events = _events(img)
+    next(events)
+    for kind, current in events:
+        if kind == "start" and current.tag in _IMG_TAGS and image_from_attrs(current.attributes) is not None:
+            return None
+        seen += _raw_length(kind, current)
+        if seen > ADJACENT_CREDIT_WINDOW:
+            return None
+        if kind == "start" and _is_credit_element(current) and current.mem_id not in figure_credits:
+            return _text_until(current, _ends_credit, ADJACENT_CREDIT_WINDOW - seen)
+    return None
+
+
+def _text(node: Any) -> str:
+    return node.text(deep=True, separator=" ")
+
+
+def _section(node: Any, start: int, end: int) -> SectionText:
+    return SectionText(
+        start=start,
+        end=end,
+        headings=[_text(heading) for heading in node.css("h2, h3, h4")],
+        paragraphs=[_text(paragraph) for paragraph in node.css("p")],
+    )
+
+
+def _figures(tree: Any, images: dict[int, ImageScan]) -> tuple[list[FigureScan], set[int]]:
+    figures: list[FigureScan] = []
+    credit_ids: set[int] = set()
+    for node in tree.css("figure"):
+        parent = node.parent
+        while parent is not None and parent.tag != "figure":
+            parent = parent.parent
+        if parent is not None:
+            continue  # nested figures belong to the outermost one
+        figure = FigureScan()
+        figure.img_src = next((images[img.mem_id].url for img in node.css(_IMG_SELECTOR) if img.mem_id in images), None)
+        figcaption = node.css_first("figcaption")
+        if figcaption is not None:
+            figure.caption = _text(figcaption)
+            credit = next((item for item in figcaption.css("span, p, div") if _is_credit_element(item)), None)
+            if credit is not None:
+                figure.credit = _text_until(credit, _ends_credit)
+                credit_ids.add(credit.mem_id)
+        figures.append(figure)
+    return figures, credit_ids
+
+
+def scan_page(
+    html: str, content_classes: tuple[str, ...] = (), out_of_time: Callable[[], bool] | None = None
+) -> PageScan:
+    """Same contract as ``page_scan.scan_page``; ``out_of_time`` is polled between stages."""
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    scan = PageScan()
+    scan.json_ld = [
+        node.text(deep=True)
+        for node in tree.css("script")
+        if any("ld+json" in f"{name}={value}".lower() for name, value in node.attributes.items())
+    ]
+    tree.strip_tags(_NOISE_TAGS)
+    scan.sections["document"] = SectionText(start=0)  # replaced by _collect_sections unless out of time
+
+    scan.metas = [{name: (value or "").strip() for name, value in node.attributes.items()} for node in tree.css("meta")]
+    links = [((node.attributes["rel"] or "").lower(), node.attributes["href"]) for node in tree.css("link[rel][href]")]
+    scan.canonical = next((href for rel, href in links if rel == "canonical" and href), None)
+    scan.amphtml = next((href for rel, href in links if rel == "amphtml" and href), None)
+    title = tree.css_first("title")
+    scan.title = _text(title) if title is not None else None
+    h1 = tree.css_first("h1")
+    scan.h1 = _text(h1) if h1 is not None else None
+
+    stages: list[Callable[[], None]] = [
+        lambda: _collect_sections(scan, tree, html, content_classes),
+        lambda: _collect_bylines(scan, tree),
+        lambda: _collect_images(scan, tree),
+    ]
+    for stage in stages:
+        if out_of_time is not None and out_of_time():
+            scan.incomplete = True
+            break
+        stage()
+    return scan
+
+
+def _collect_sections(scan: PageScan, tree: Any, html: str, content_classes: tuple[str, ...]) -> None:
+    """Document chunks plus the article/main/body/profile sections as ranges of them.
+
+    Sentinel text nodes around each section element mark where its text nodes
+    start and end in the document; they are removed again afterwards.
+    """
+    nodes = {}
+    for tag in ("article", "main", "body"):
+        node = tree.css_first(tag)
+        # The tree builder always adds a <body>; the tokenizer only sees an explicit one.
+        if node is not None and (tag != "body" or _BODY_TAG_RE.search(html)):
+            nodes[tag] = node
+    if content_classes:
+        candidates = [
+            (item, (item.attributes["class"] or "").split()) for item in tree.css("div[class], article[class], main[class]")
+        ]
+        for name in content_classes:
+            node = next((item for item, classes in candidates if name in classes), None)
+            if node is not None:
+                nodes["profile"] = node
+                break
+
+    sentinels = []
+    for name, node in nodes.items():
+        node.insert_before(f"{_START_MARK}{name}")
+        node.insert_after(f"{_END_MARK}{name}")
+        sentinels += [node.prev, node.next]
+    chunks = tree.root.text(deep=True, separator=_SEPARATOR).split(_SEPARATOR)
+    for sentinel in sentinels:
+        sentinel.decompose()
+    marks = sorted((chunks.index(f"{mark}{name}"), f"{mark}{name}") for name in nodes for mark in (_START_MARK, _END_MARK))
+    bounds = {key: index - removed for removed, (index, key) in enumerate(marks)}
+    for index, _ in reversed(marks):
+        del chunks[index]
+    scan.chunks = chunks
+
+    scan.sections["document"] = _section(tree.root, 0, len(chunks))
+    for name, node in nodes.items():
+        scan.sections[name] = _section(node, bounds[f"{_START_MARK}{name}"], bounds[f"{_END_MARK}{name}"])
+
+
+def _collect_bylines(scan: PageScan, tree: Any) -> None:
+    for node in tree.css('[class*="author" i], [class*="byline" i]'):
+        text = _text_until(node, lambda kind, current: True)
+        if text:
+            scan.byline_texts.append(text)
+
+
+def _collect_images(scan: PageScan, tree: Any) -> None:
+    images = {img.mem_id: image for img in tree.css(_IMG_SELECTOR) if (image := image_from_attrs(img.attributes)) is not None}
+    scan.images = list(images.values())
+    scan.figures, figure_credits = _figures(tree, images)
+    if all(node.mem_id in figure_credits or not _is_credit_element(node) for node in tree.css(_CREDIT_SELECTOR)):
+        return  # no credit element an <img> could claim
+    for img in tree.css(_IMG_SELECTOR):
+        image = images.get(img.mem_id)
+        if image is not None:
+            image.adjacent_credit = _adjacent_credit(img, figure_credits)
@@ -0,0 +1,154 @@
+"""Cache of article extraction results, revalidated with conditional GETs.
+
+Re-ingestion, duplicate feed entries and admin re-runs extract the same URL
+again and again. Each successful extraction is stored under the normalized
+URL together with the page's ``ETag``/``Last-Modified``; the next lookup sends
+``If-None-Match``/``If-Modified-Since`` and reuses the stored result on
+``304 Not Modified`` – no body transfer, no parsing.
+
+Entries expire after ``EXTRACTION_CACHE_TTL_HOURS`` (0 disables the cache)
+and the table is capped at ``EXTRACTION_CACHE_MAX_ENTRIES``, evicting the
+least recently used entries. Like the HTML archive, the cache lives in its
+own SQLite file so extraction workers can write to it without competing with
+the ingestion writer.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+import json
+import logging
+from pathlib import Path
+import sqlite3
+from typing import Any, Iterator
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ocid"}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+@dataclass(frozen=True)
+class CachedExtraction:
+    result: dict[str, Any]  # ExtractedArticle fields
+    etag: str | None
+    last_modified: str | None
+
+
+def cache_key(url: str) -> str:
+    """Normalize ``url``: lower-case scheme/host, no default port, fragment or tracking params, sorted query."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def cache_enabled() -> bool:
+    return get_settings().extraction_cache_ttl_hours > 0
+
+
+@contextmanager
+def _cache_conn() -> Iterator[sqlite3.Connection]:
+    path = Path(get_settings().extraction_cache_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS extractions (
+                url_key TEXT PRIMARY KEY,
+                result_json TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at TEXT NOT NULL DEFAULT (datetime('now')),
+                used_at TEXT NOT NULL DEFAULT (datetime('now'))
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_extractions_used_at ON extractions(used_at)")
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def lookup(url: str) -> CachedExtraction | None:
+    """Cached result for ``url`` if it is younger than the TTL and can be revalidated."""
+    ttl_hours = get_settings().extraction_cache_ttl_hours
+    if ttl_hours <= 0:
+        return None
+    try:
+        with _cache_conn() as conn:
+            row = conn.execute(
+                """
+                SELECT result_json, etag, last_modified FROM extractions
+                WHERE url_key = ? AND stored_at >= datetime('now', ?)
+                """,
+                (cache_key(url), f"-{ttl_hours} hours"),
+            ).fetchone()
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning("Extraktions-Cache nicht lesbar: %s", exc)
+        return None
+    if not row or not (row["etag"] or row["last_modified"]):
+        return None
+    return CachedExtraction(json.loads(row["result_json"]), row["etag"], row["last_modified"])
+
+
+def touch(url: str) -> None:
+    """Mark a revalidated entry as used and fresh again."""
+    try:
+        with _cache_conn() as conn:
+            conn.execute(
+                "UPDATE extractions SET used_at = datetime('now'), stored_at = datetime('now') WHERE url_key = ?",
+                (cache_key(url),),
+            )
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning("Extraktions-Cache nicht aktualisierbar: %s", exc)
+
+
+def store(url: str, result: dict[str, Any], etag: str | None, last_modified: str | None) -> None:
+    """Best-effort insert; evicts expired and least recently used entries."""
+    settings = get_settings()
+    if settings.extraction_cache_ttl_hours <= 0 or not (etag or last_modified):
+        return
+    try:
+        with _cache_conn() as conn:
+            conn.execute(
+                """
+                INSERT INTO extractions (url_key, result_json, etag, last_modified, stored_at, used_at)
+                VALUES (?, ?, ?, ?, datetime('now'), datetime('now'))
+                ON CONFLICT(url_key) DO UPDATE SET
+                    result_json = excluded.result_json,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    stored_at = excluded.stored_at,
+                    used_at = excluded.used_at
+                """,
+                (cache_key(url), json.dumps(result, ensure_ascii=False), etag, last_modified),
+            )
+            conn.execute(
+                "DELETE FROM extractions WHERE stored_at < datetime('now', ?)",
+                (f"-{settings.extraction_cache_ttl_hours} hours",),
+            )
+            conn.execute(
+                """
+                DELETE FROM extractions WHERE url_key IN (
+                    SELECT url_key FROM extractions ORDER BY used_at DESC, rowid DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (max(1, settings.extraction_cache_max_entries),),
+            )
+    except (sqlite3.Error, OSError) as exc:
+        logger.warning("Extraktions-Cache: %s konnte nicht gespeichert werden: %s", url, exc)
@@ -0,0 +1,88 @@
+"""Optional process pool for the CPU-bound part of article extraction.
+
+Decoding and the extraction heuristics are regex-heavy pure Python and hold
+the GIL. When ingestion runs inside the API process (``/api/ingestion/run``,
+``/api/n8n/ingest``, the pipeline), that makes the admin UI and the Telegram
+webhook sluggish. With ``EXTRACTION_PROCESSES`` > 0 the work runs in a
+``ProcessPoolExecutor`` instead: only the raw page bytes go in and the
+``ExtractedArticle`` comes back. Fetching, caching and archiving stay in
+the calling process. ``0`` (default) keeps everything in-process.
+
+Workers are started with ``spawn``, because forking a process that is
+already running threads can deadlock. The pool is created on first use and
+is shut down with the app. Profile hit counters recorded in a worker are
+sent back with each result, so ``profile_stats`` still covers every page.
+A broken pool (e.g. a worker killed by the OOM killer) is discarded and
+the page is extracted in-process.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import logging
+import multiprocessing
+import threading
+from typing import Any, Callable, TypeVar
+
+from .config import get_settings
+from .extraction_profiles import add_profile_counts, take_profile_counts
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_pool: ProcessPoolExecutor | None = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+
+
+def _call_in_worker(func: Callable[..., T], args: tuple[Any, ...]) -> tuple[T, dict[str, dict[str, int]]]:
+    take_profile_counts()
+    result = func(*args)
+    return result, take_profile_counts()
+
+
+def _get_pool(processes: int) -> ProcessPoolExecutor:
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is None or _pool_size != processes:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+            _pool_size = processes
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def run(func: Callable[..., T], *args: Any) -> T:
+    """Call ``func(*args)`` in the extraction pool, or directly if it is disabled.
+
+    ``func`` must be a module-level function and ``args``/result picklable.
+    """
+    processes = get_settings().extraction_processes
+    if processes <= 0:
+        return func(*args)
+    pool = _get_pool(processes)
+    try:
+        result, counts = pool.submit(_call_in_worker, func, args).result()
+    except BrokenProcessPool as exc:
+        logger.warning("Extraktions-Prozesspool ausgefallen, extrahiere im Hauptprozess: %s", exc)
+        _discard_pool(pool)
+        return func(*args)
+    add_profile_counts(counts)
+    return result
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,133 @@
+"""Per-domain extraction profiles.
+
+A profile bundles what we know about a publisher's markup:
+
+- ``content_classes``: classes of the element that wraps the article text
+  (e.g. ``article__text`` on promobil.de), in priority order like the legacy
+  selector lists. The page scanner collects the paragraphs of the first
+  element with the highest-priority class present on the page, so known
+  sites skip the generic article/main/body cascade.
+- ``image_rules``: path patterns with score adjustments used by
+  ``ingestion._rank_image_candidates``; the first matching rule applies.
+- ``light_variant``: rule for a lighter print/AMP page of the site, see
+  ``light_variants``.
+
+Domains match the host and its subdomains. Every use is counted per profile
+as a hit or a miss – content: the element was found (miss = fell back to the
+generic engine); images: at least one candidate matched a rule.
+``profile_stats`` exposes the counters so stale selectors show up after a
+site redesign.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import re
+import threading
+from urllib.parse import urlparse
+
+
+@dataclass(frozen=True)
+class ImageRule:
+    pattern: re.Pattern[str]  # searched in the lower-cased, unquoted image path
+    score: int
+    reason: str
+
+
+@dataclass(frozen=True)
+class ExtractionProfile:
+    name: str
+    domains: tuple[str, ...]
+    content_classes: tuple[str, ...] = ()  # priority order: an earlier class wins wherever it is in the page
+    image_rules: tuple[ImageRule, ...] = ()
+    light_variant: str | None = None  # light_variants rule, e.g. "query:print=1", tried when the page has no amphtml link
+
+
+PROFILES: tuple[ExtractionProfile, ...] = (
+    ExtractionProfile(
+        name="presseportal",
+        domains=("presseportal.de",),
+        image_rules=(
+            ImageRule(re.compile(r"/thumbnail/story_big/"), 120, "presseportal-story-big"),
+            ImageRule(re.compile(r"/thumbnail/highlight/"), 45, "presseportal-highlight"),
+            ImageRule(re.compile(r"/thumbnail/liste/"), -40, "presseportal-list"),
+        ),
+    ),
+    ExtractionProfile(
+        name="promobil",
+        domains=("promobil.de",),
+        content_classes=("article__text", "article-content", "content-text"),
+    ),
+    ExtractionProfile(
+        name="camping.info",
+        domains=("camping.info",),
+        content_classes=("article-body", "post-content"),
+    ),
+    ExtractionProfile(
+        name="caravaning",
+        domains=("caravaning.de",),
+        content_classes=("article__content", "entry-content"),
+    ),
+)
+
+
+def profile_for(url: str) -> ExtractionProfile | None:
+    try:
+        host = (urlparse(url).hostname or "").lower()
+    except ValueError:
+        return None
+    if not host:
+        return None
+    for profile in PROFILES:
+        if any(host == domain or host.endswith(f".{domain}") for domain in profile.domains):
+            return profile
+    return None
+
+
+_EMPTY_STATS = {"content_hits": 0, "content_misses": 0, "image_hits": 0, "image_misses": 0}
+_stats: dict[str, dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def record_profile_result(profile: ExtractionProfile, kind: str, hit: bool) -> None:
+    """Count one use of ``profile``; ``kind`` is ``content`` or ``image``."""
+    with _stats_lock:
+        counters = _stats.setdefault(profile.name, dict(_EMPTY_STATS))
+        counters[f"{kind}_hits" if hit else f"{kind}_misses"] += 1
+
+
+def profile_stats() -> list[dict[str, object]]:
+    """Registry with hit/miss counters since process start."""
+    with _stats_lock:
+        snapshot = {name: dict(counters) for name, counters in _stats.items()}
+    return [
+        {
+            "name": profile.name,
+            "domains": list(profile.domains),
+            "content_classes": list(profile.content_classes),
+            "image_rules": [rule.reason for rule in profile.image_rules],
+            **snapshot.get(profile.name, _EMPTY_STATS),
+        }
+        for profile in PROFILES
+    ]
+
+
+def reset_profile_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def take_profile_counts() -> dict[str, dict[str, int]]:
+    """Return and clear the raw counters (used to ship them out of pool workers)."""
+    with _stats_lock:
+        counts = {name: dict(counters) for name, counters in _stats.items()}
+        _stats.clear()
+    return counts
+
+
+def add_profile_counts(counts: dict[str, dict[str, int]]) -> None:
+    """Merge counters taken with ``take_profile_counts`` in another process."""
+    with _stats_lock:
+        for name, values in counts.items():
+            counters = _stats.setdefault(name, dict(_EMPTY_STATS))
+            for key, value in values.items():
+                counters[key] = counters.get(key, 0) + value
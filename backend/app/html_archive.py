@@ -0,0 +1,108 @@
+"""Optional archive of fetched article HTML for offline re-extraction.
+
+Pages are stored gzip-compressed and content-addressed
+(``<archive_dir>/<sha256[:2]>/<sha256>.html.gz``), so identical pages are kept
+once. A small SQLite index next to the blobs maps each URL to its latest
+content hash. The index lives in its own file, so extraction workers never
+compete with the ingestion writer for the main database.
+
+Enable with ``HTML_ARCHIVE_ENABLED=true``; the archive is what
+``ingestion.run_replay`` reads from.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+import gzip
+import hashlib
+import logging
+from pathlib import Path
+import sqlite3
+from typing import Iterator
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def _archive_dir() -> Path:
+    path = Path(get_settings().html_archive_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@contextmanager
+def _index_conn() -> Iterator[sqlite3.Connection]:
+    conn = sqlite3.connect(_archive_dir() / "index.sqlite", timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                charset TEXT,
+                size INTEGER NOT NULL,
+                fetched_at TEXT NOT NULL DEFAULT (datetime('now'))
+            )
+            """
+        )
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _blob_path(content_hash: str) -> Path:
+    return _archive_dir() / content_hash[:2] / f"{content_hash}.html.gz"
+
+
+def archive_enabled() -> bool:
+    return bool(get_settings().html_archive_enabled)
+
+
+def store_page(url: str, raw: bytes, charset: str | None) -> str:
+    """Store ``raw`` for ``url`` and return its content hash."""
+    content_hash = hashlib.sha256(raw).hexdigest()
+    blob = _blob_path(content_hash)
+    if not blob.exists():
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = blob.with_suffix(".tmp")
+        tmp.write_bytes(gzip.compress(raw, compresslevel=6))
+        tmp.replace(blob)
+    with _index_conn() as conn:
+        conn.execute(
+            """
+            INSERT INTO pages (url, content_hash, charset, size, fetched_at)
+            VALUES (?, ?, ?, ?, datetime('now'))
+            ON CONFLICT(url) DO UPDATE SET
+                content_hash = excluded.content_hash,
+                charset = excluded.charset,
+                size = excluded.size,
+                fetched_at = excluded.fetched_at
+            """,
+            (url, content_hash, charset, len(raw)),
+        )
+    return content_hash
+
+
+def archive_page(url: str, raw: bytes, charset: str | None) -> None:
+    """Best-effort hook for the extractor: never lets archive errors break a fetch."""
+    if not archive_enabled():
+        return
+    try:
+        store_page(url, raw, charset)
+    except Exception as exc:
+        logger.warning("HTML-Archiv: %s konnte nicht gespeichert werden: %s", url, exc)
+
+
+def load_page(url: str) -> tuple[bytes, str | None] | None:
+    """Return ``(raw, charset)`` of the latest archived page for ``url``."""
+    with _index_conn() as conn:
+        row = conn.execute("SELECT content_hash, charset FROM pages WHERE url = ?", (url,)).fetchone()
+    if not row:
+        return None
+    blob = _blob_path(row["content_hash"])
+    if not blob.exists():
+        return None
+    return gzip.decompress(blob.read_bytes()), row["charset"]
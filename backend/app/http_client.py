@@ -0,0 +1,61 @@
+"""Shared HTTP client for outbound fetches (feeds, article pages, image probes).
+
+One process-wide ``httpx.Client`` keeps connections to the same few news
+hosts alive between requests, so repeated fetches skip the TCP and TLS
+handshakes. HTTP/2 is used when enabled and the optional ``h2`` package is
+installed. Responses are requested compressed (gzip/deflate, plus brotli
+when the optional ``brotli`` package is installed) and decompressed
+transparently by httpx. The client is thread-safe and shared by all
+ingestion workers and the WordPress publisher; per-host concurrency and
+request rates are still enforced by ``politeness.host_slot``.
+"""
+from __future__ import annotations
+
+import importlib.util
+import threading
+
+import httpx
+
+from .config import get_settings
+
+USER_AGENT = "rss-news-bot/1.0 (+https://news.vanityontour.de)"
+
+_client: httpx.Client | None = None
+_client_settings: object | None = None
+_client_lock = threading.Lock()
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def brotli_available() -> bool:
+    return any(importlib.util.find_spec(name) is not None for name in ("brotli", "brotlicffi"))
+
+
+def accept_encoding() -> str:
+    """Encodings httpx can decode in this environment."""
+    return "gzip, deflate, br" if brotli_available() else "gzip, deflate"
+
+
+def get_http_client() -> httpx.Client:
+    """Process-wide pooled client; rebuilt whenever the settings object is replaced."""
+    global _client, _client_settings
+    settings = get_settings()
+    with _client_lock:
+        if _client is None or _client_settings is not settings:
+            if _client is not None:
+                _client.close()
+            _client = httpx.Client(
+                http2=settings.http2_enabled and http2_available(),
+                limits=httpx.Limits(
+                    max_connections=settings.http_max_connections,
+                    max_keepalive_connections=settings.http_max_keepalive_connections,
+                    keepalive_expiry=settings.http_keepalive_seconds,
+                ),
+                timeout=httpx.Timeout(15.0, connect=10.0),
+                follow_redirects=True,
+                headers={"User-Agent": USER_AGENT, "Accept-Encoding": accept_encoding()},
+            )
+            _client_settings = settings
+        return _client
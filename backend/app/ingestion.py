@@ -1,30 +1,51 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 import hashlib
 import json
 import re
+import sqlite3
 import time
-from typing import Any
+from typing import Any, Iterator
 from urllib.parse import unquote, urlencode, urlparse, parse_qs
-import urllib.error
-import urllib.request as _urllib_req
 
 import feedparser
+import httpx
 
+from .circuit_breaker import SCOPE_FEED, feed_key, get_circuit_board, host_guard
+from .config import get_settings
+from .db import write_transaction
+from .politeness import host_slot
 from .repositories import (
     ArticleUpsert,
     RunCreate,
+    claim_run_for_resume,
     create_run,
+    find_article_ingest_state,
     find_existing_article_for_upsert,
     finish_run,
+    get_article_by_id,
     get_feed_by_id,
+    get_image_probe_results,
+    get_run_by_id,
+    has_article_minhash,
+    list_article_ids_for_replay,
+    list_due_feeds,
     list_enabled_feeds,
+    store_image_probe_results,
     update_feed_fetch_state,
+    update_feed_poll_schedule,
+    update_run_progress,
     upsert_article,
 )
-from .source_extraction import extract_article, extracted_article_to_meta
+from .html_archive import load_page
+from .light_variants import get_variant_board
+from .extraction_profiles import profile_for, record_profile_result
+from .http_client import get_http_client
+from .near_duplicates import assign_cluster, minhash_signature
+from .source_extraction import extract_article, extract_page, extracted_article_to_meta
 
 
 @dataclass(frozen=True)
@@ -37,7 +58,18 @@ class IngestionStats:
     message: str
 
 
+@dataclass(frozen=True)
+class ReplayStats:
+    run_id: int
+    articles_seen: int
+    articles_replayed: int
+    missing_archive: int
+    status: str
+    message: str
+
+
 MAX_FEED_FETCH_RETRIES = 3
+REPLAY_BATCH_SIZE = 100
 
 
 def _normalize_article_url(url: str) -> str:
@@ -110,6 +142,45 @@ def _entry_hash(entry: dict, feed_id: int, link: str, title: str, summary: str)
     return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
 
 
+def _entry_fingerprint(entry: dict, link: str) -> str:
+    """Hash of the raw feed entry, computable before any page fetch.
+
+    Unlike _entry_hash it only uses fields the feed itself delivers, so an
+    unchanged entry yields the same fingerprint on every poll. The feed is
+    not part of it: the same entry syndicated in two feeds hashes the same.
+    """
+    source_id = entry.get("id") or entry.get("guid") or ""
+    summary, content = _entry_text(entry)
+    updated = entry.get("updated") or entry.get("published") or ""
+    fingerprint = f"{source_id}|{link}|{(entry.get('title') or '').strip()}|{summary.strip()}|{content.strip()}|{updated}"
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+def _feed_content_hash(parsed: object) -> str:
+    """Digest of the feed's entries as parsed by feedparser.
+
+    Not a hash of the response body: many feeds rewrite <lastBuildDate>,
+    generator comments or tracking parameters on every request, which would
+    make every body look new. The digest covers only the entry fields that
+    ingestion actually consumes.
+    """
+    digest = hashlib.sha256()
+    for entry in _parsed_get(parsed, "entries", []) or []:
+        summary, content = _entry_text(entry)
+        for value in (
+            entry.get("id") or entry.get("guid") or "",
+            entry.get("link") or "",
+            entry.get("title") or "",
+            summary,
+            content,
+            entry.get("updated") or entry.get("published") or "",
+        ):
+            digest.update(str(value).encode("utf-8"))
+            digest.update(b"\x1f")
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
 def _parsed_get(parsed: object, key: str, default: object = None) -> object:
     if isinstance(parsed, dict):
         return parsed.get(key, default)
@@ -121,29 +192,31 @@ def _normalize_tokens(text: str) -> set[str]:
     return {token for token in normalized.split() if len(token) >= 4}
 
 
-def _probe_image_url(url: str, timeout: int = 5) -> bool:
-    """Return True if URL responds without a 4xx/5xx error (HEAD request).
+def _probe_image_status(url: str, timeout: int = 5) -> int | None:
+    """Return the HTTP status of a HEAD request, or None on network errors.
 
-    Returns True on network/connection errors so that a flaky server does not
-    cause a valid image to be silently dropped.
+    None means "unknown" and is treated as usable so that a flaky server does
+    not cause a valid image to be silently dropped; it is also never cached.
     """
     try:
-        req = _urllib_req.Request(
-            url,
-            method="HEAD",
-            headers={"User-Agent": "Mozilla/5.0 (compatible; rss-news/1.0)"},
-        )
-        with _urllib_req.urlopen(req, timeout=timeout) as resp:
-            return resp.status < 400
-    except urllib.error.HTTPError as exc:
-        return exc.code < 400  # 3xx redirects are OK; 4xx/5xx are not
+        with host_guard(url), host_slot(url):
+            resp = get_http_client().head(
+                url,
+                headers={"User-Agent": "Mozilla/5.0 (compatible; rss-news/1.0)"},
+                timeout=timeout,
+            )
+            resp.raise_for_status()
+        return int(resp.status_code)
+    except httpx.HTTPStatusError as exc:
+        return int(exc.response.status_code)  # 3xx redirects are OK; 4xx/5xx are not
     except Exception:
-        return True  # network error → don't filter, let WP try later
+        return None  # network error → don't filter, let WP try later
 
 
 def _rank_image_candidates(source_url: str, title: str, images: list[str]) -> list[dict[str, Any]]:
-    source_host = (urlparse(source_url).hostname or "").lower()
-    is_presseportal = "presseportal.de" in source_host
+    profile = profile_for(source_url)
+    image_rules = profile.image_rules if profile else ()
+    rule_matched = False
     title_tokens = _normalize_tokens(title)
     blocked_patterns = ("logo", "badge", "app-store", "google-play", "na-logo", "sprite", "icon", "favicon", "tracking", "pixel", ".svg", ".ico", ".gif")
     # Known placeholder/default images that should never be used as featured image
@@ -170,15 +243,12 @@ def _rank_image_candidates(source_url: str, title: str, images: list[str]) -> li
             score -= 150
             reasons.append("blocked-pattern")
 
-        if is_presseportal and "/thumbnail/story_big/" in path:
-            score += 120
-            reasons.append("presseportal-story-big")
-        elif is_presseportal and "/thumbnail/highlight/" in path:
-            score += 45
-            reasons.append("presseportal-highlight")
-        elif is_presseportal and "/thumbnail/liste/" in path:
-            score -= 40
-            reasons.append("presseportal-list")
+        for rule in image_rules:
+            if rule.pattern.search(path):
+                score += rule.score
+                reasons.append(rule.reason)
+                rule_matched = True
+                break
 
         if "crop=" in (parsed.query or "").lower():
             score -= 10
@@ -192,11 +262,63 @@ def _rank_image_candidates(source_url: str, title: str, images: list[str]) -> li
 
         ranked.append({"url": url, "score": score, "reasons": reasons})
 
+    if image_rules and ranked:
+        record_profile_result(profile, "image", hit=rule_matched)
     ranked.sort(key=lambda item: item["score"], reverse=True)
     return ranked
 
 
-def _select_relevant_images(source_url: str, title: str, images: list[str], max_keep: int = 3) -> tuple[list[str], str | None, list[dict[str, Any]]]:
+def _probe_candidates(
+    candidates: list[str],
+    max_keep: int,
+    probe_log: dict[str, int] | None,
+    offline: bool = False,
+) -> list[str]:
+    """Probe candidates concurrently; return usable ones in rank order.
+
+    Cached results (see image_probe_cache) cost no request. Stops as soon as
+    the best ``max_keep`` candidates are confirmed – probes still pending at
+    that point are cancelled. Fresh definitive results are added to
+    ``probe_log`` so the ingestion writer can persist them. ``offline`` only
+    consults the cache; unknown candidates count as usable.
+    """
+    if not candidates:
+        return []
+    ttl_hours = get_settings().image_probe_cache_ttl_hours
+    cached = get_image_probe_results(candidates, max_age_hours=ttl_hours) if ttl_hours > 0 else {}
+    to_probe = [] if offline else [url for url in candidates if url not in cached]
+
+    kept: list[str] = []
+    executor = ThreadPoolExecutor(max_workers=max(1, len(to_probe)), thread_name_prefix="image-probe") if to_probe else None
+    try:
+        futures = {url: executor.submit(_probe_image_status, url) for url in to_probe} if executor else {}
+        for url in candidates:
+            if url in cached:
+                status = cached[url]
+            elif offline:
+                status = None
+            else:
+                status = futures[url].result()
+                if status is not None and probe_log is not None:
+                    probe_log[url] = status
+            if status is None or status < 400:
+                kept.append(url)
+                if len(kept) >= max_keep:
+                    break
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+    return kept
+
+
+def _select_relevant_images(
+    source_url: str,
+    title: str,
+    images: list[str],
+    max_keep: int = 3,
+    probe_log: dict[str, int] | None = None,
+    offline: bool = False,
+) -> tuple[list[str], str | None, list[dict[str, Any]]]:
     # dedupe incoming order first
     deduped: list[str] = []
     seen: set[str] = set()
@@ -210,15 +332,8 @@ def _select_relevant_images(source_url: str, title: str, images: list[str], max_
 
     # Probe top candidates (max 4) to skip definitively broken URLs (HTTP 4xx).
     # Network errors are treated as OK to avoid false negatives on flaky servers.
-    primary = None
-    kept: list[str] = []
-    for url in candidates[:4]:
-        if _probe_image_url(url):
-            if primary is None:
-                primary = url
-            kept.append(url)
-            if len(kept) >= max_keep:
-                break
+    kept = _probe_candidates(candidates[:4], max_keep, probe_log, offline=offline)
+    primary = kept[0] if kept else None
 
     # Fallback: if all probes failed with network errors, use best candidate anyway
     if not kept and candidates:
@@ -242,245 +357,866 @@ def _merge_ingestion_meta(existing_meta_json: str | None, attribution: dict[str,
     return json.dumps(meta, ensure_ascii=False)
 
 
-def run_ingestion(feed_id: int | None = None) -> IngestionStats:
-    run_id = create_run(RunCreate(run_type="ingestion", status="running", details="started"))
-    feeds_processed = 0
-    entries_seen = 0
-    articles_upserted = 0
-    feed_results: list[dict[str, object]] = []
+@dataclass(frozen=True)
+class _PreparedEntry:
+    payload: ArticleUpsert
+    attribution: dict[str, Any]
+    extraction_meta: dict[str, Any]
+    probe_results: dict[str, int] = field(default_factory=dict)
+    near_duplicate_signature: tuple[int, ...] | None = None
 
-    try:
-        if feed_id is not None:
-            feed = get_feed_by_id(feed_id)
-            feeds = [feed] if feed and int(feed.get("is_enabled", 0)) == 1 else []
+
+@dataclass(frozen=True)
+class _FeedFetchResult:
+    feed: dict[str, Any]
+    parsed: object | None
+    error: str | None
+    entries_seen: int
+    prepared: list[_PreparedEntry]
+    entries_unchanged: int = 0
+    entries_deferred: int = 0  # page not requested (host breaker open or host busy); retried next poll
+    fetch_status: str = "changed"  # changed | unchanged | not_modified
+    content_hash: str | None = None
+    retry_pending: bool = False  # some entries failed transiently and must be fetched again next poll
+
+
+def _download_feed(feed: dict[str, Any]) -> httpx.Response:
+    """Conditional GET of the feed body over the shared keep-alive client.
+
+    Server errors raise, so they are retried and count as a feed failure.
+    Feed outcomes only go to the feed's own breaker (see ``_collect_feed``):
+    one bad feed must not block the article pages of its host.
+    """
+    headers: dict[str, str] = {}
+    if feed.get("etag"):
+        headers["If-None-Match"] = feed["etag"]
+    if feed.get("last_modified"):
+        headers["If-Modified-Since"] = feed["last_modified"]
+    with host_slot(feed["url"]):
+        response = get_http_client().get(feed["url"], headers=headers)
+    if response.status_code >= 500:
+        response.raise_for_status()
+    return response
+
+
+def _apply_http_state(parsed: object, response: httpx.Response) -> object:
+    """Expose status and validators on the parse result like feedparser's own fetcher did."""
+    http_state = {
+        "status": response.status_code,
+        "etag": response.headers.get("etag"),
+        "modified": response.headers.get("last-modified"),
+        "href": str(response.url),
+    }
+    for key, value in http_state.items():
+        if value is None or _parsed_get(parsed, key) is not None:
+            continue
+        if isinstance(parsed, dict):
+            parsed[key] = value
         else:
-            feeds = list_enabled_feeds()
+            setattr(parsed, key, value)
+    return parsed
 
-        for feed in feeds:
-            if not feed:
-                continue
-            feeds_processed += 1
-
-            parsed = None
-            feed_error = None
-            for attempt in range(1, MAX_FEED_FETCH_RETRIES + 1):
-                try:
-                    parsed = feedparser.parse(
-                        feed["url"],
-                        etag=feed.get("etag"),
-                        modified=feed.get("last_modified"),
-                    )
-                    break
-                except Exception as exc:
-                    feed_error = str(exc)
-                    if attempt < MAX_FEED_FETCH_RETRIES:
-                        time.sleep(0.5 * attempt)
-
-            if parsed is None:
-                feed_results.append(
-                    {
-                        "feed_id": int(feed["id"]),
-                        "feed_url": feed["url"],
-                        "status": "failed",
-                        "error": feed_error or "unknown",
-                        "entries_seen": 0,
-                        "upserts": 0,
-                    }
-                )
-                continue
 
-            # Persist ETag/Last-Modified for conditional requests.
-            parsed_etag = _parsed_get(parsed, "etag")
-            parsed_modified = _parsed_get(parsed, "modified")
-            if parsed_modified and not isinstance(parsed_modified, str):
-                parsed_modified = str(parsed_modified)
-            update_feed_fetch_state(
-                feed_id=int(feed["id"]),
-                etag=parsed_etag if isinstance(parsed_etag, str) else None,
-                last_modified=parsed_modified if isinstance(parsed_modified, str) else None,
+def _fetch_feed(feed: dict[str, Any]) -> tuple[object | None, str | None]:
+    parsed = None
+    feed_error = None
+    for attempt in range(1, MAX_FEED_FETCH_RETRIES + 1):
+        try:
+            response = _download_feed(feed)
+            parsed = _apply_http_state(
+                feedparser.parse(response.content, response_headers=dict(response.headers)),
+                response,
             )
+            break
+        except Exception as exc:
+            feed_error = str(exc)
+            if attempt < MAX_FEED_FETCH_RETRIES:
+                time.sleep(0.5 * attempt)
+    return parsed, feed_error
+
+
+def _entry_link(entry: dict, max_age_days: int) -> str | None:
+    """Return the normalized article link, or None if the entry is to be skipped."""
+    link = entry.get("link")
+    if not link:
+        return None
 
-            feed_entries_seen = 0
-            feed_upserts = 0
-            from .config import get_settings as _get_settings
-            _max_age_days = _get_settings().pipeline_max_article_age_days
-            for entry in _parsed_get(parsed, "entries", []):
-                entries_seen += 1
-                feed_entries_seen += 1
-                link = entry.get("link")
-                if not link:
-                    continue
+    # Age filter: skip articles older than max_age_days (0 = no limit)
+    if max_age_days > 0:
+        published_iso = _entry_published_iso(entry)
+        if published_iso:
+            try:
+                published_dt = datetime.fromisoformat(published_iso)
+                age = datetime.now(timezone.utc) - published_dt
+                if age > timedelta(days=max_age_days):
+                    return None
+            except Exception:
+                pass  # can't parse date → allow through
 
-                # Age filter: skip articles older than max_age_days (0 = no limit)
-                if _max_age_days > 0:
-                    published_iso = _entry_published_iso(entry)
-                    if published_iso:
-                        try:
-                            published_dt = datetime.fromisoformat(published_iso)
-                            age = datetime.now(timezone.utc) - published_dt
-                            if age > timedelta(days=_max_age_days):
-                                continue
-                        except Exception:
-                            pass  # can't parse date → allow through
-
-                # Resolve Google redirect URLs (google.com/url?...&url=<actual_url>&...)
-                link = _resolve_google_redirect(link)
-                # Normalize AMP/tracking params (e.g. ?outputType=valid_amp)
-                link = _normalize_article_url(link)
-
-                summary, content_raw = _entry_text(entry)
-                # Strip HTML tags from title (Google Alerts wraps matched keywords in <b>)
-                raw_title = entry.get("title") or "Ohne Titel"
-                title = re.sub(r"<[^>]+>", "", raw_title).strip() or "Ohne Titel"
-                extracted = extract_article(link)
-
-                final_title = extracted.title or title
-                final_author = extracted.author or entry.get("author")
-                final_summary = extracted.summary or (summary[:1000] if summary else None)
-                final_content_raw = extracted.content_text or content_raw
-                final_canonical = extracted.canonical_url or entry.get("link")
-                selected_images, primary_image, ranked_images = _select_relevant_images(
-                    link,
-                    final_title,
-                    extracted.images,
-                    max_keep=3,
-                )
-
-                source_hash = _entry_hash(
-                    entry,
-                    int(feed["id"]),
-                    link,
-                    final_title,
-                    final_summary or "",
-                )
-                attribution = {
-                    "source_name": feed.get("source_name"),
-                    "source_base_url": feed.get("source_base_url"),
-                    "source_terms_url": feed.get("source_terms_url"),
-                    "source_license_name": feed.get("source_license_name"),
-                    "source_risk_level": feed.get("source_risk_level"),
-                    "original_link": link,
-                    "feed_name": feed.get("name"),
-                    "feed_id": int(feed["id"]),
-                    "imported_at": datetime.now(timezone.utc).isoformat(),
-                }
-                extraction_meta: dict[str, Any] = extracted_article_to_meta(extracted)
-                extraction_meta["fetched_from"] = link
-                extraction_meta["image_selection"] = {
-                    "primary": primary_image,
-                    "selected_count": len(selected_images),
-                    "total_candidates": len(extracted.images),
-                    "ranked": ranked_images,
-                }
-                base_payload = ArticleUpsert(
-                    feed_id=int(feed["id"]),
-                    source_article_id=entry.get("id") or entry.get("guid"),
-                    source_hash=source_hash,
-                    title=final_title,
-                    source_url=link,
-                    canonical_url=final_canonical,
-                    published_at=_entry_published_iso(entry),
-                    author=final_author,
-                    summary=final_summary,
-                    content_raw=final_content_raw,
-                    content_rewritten=None,
-                    image_urls_json=json.dumps(selected_images, ensure_ascii=False) if selected_images else None,
-                    press_contact=extracted.press_contact,
-                    source_name_snapshot=feed.get("source_name"),
-                    source_terms_url_snapshot=feed.get("source_terms_url"),
-                    source_license_name_snapshot=feed.get("source_license_name"),
-                    legal_checked=False,
-                    legal_checked_at=None,
-                    legal_note=None,
-                    wp_post_id=None,
-                    wp_post_url=None,
-                    publish_attempts=0,
-                    publish_last_error=None,
-                    published_to_wp_at=None,
-                    word_count=len((final_content_raw or "").split()),
-                    status="new",
-                    meta_json=json.dumps({"attribution": attribution, "extraction": extraction_meta}, ensure_ascii=False),
-                )
-                existing = find_existing_article_for_upsert(base_payload)
-                if existing and existing.get("status") == "error":
-                    # Explicitly closed article: ignore on subsequent ingestion runs.
-                    continue
+    # Resolve Google redirect URLs (google.com/url?...&url=<actual_url>&...)
+    link = _resolve_google_redirect(link)
+    # Normalize AMP/tracking params (e.g. ?outputType=valid_amp)
+    return _normalize_article_url(link)
 
-                payload = base_payload
-                if existing:
-                    payload = ArticleUpsert(
-                        feed_id=base_payload.feed_id,
-                        source_article_id=base_payload.source_article_id,
-                        source_hash=base_payload.source_hash,
-                        title=base_payload.title,
-                        source_url=base_payload.source_url,
-                        canonical_url=base_payload.canonical_url,
-                        published_at=base_payload.published_at,
-                        author=base_payload.author,
-                        summary=base_payload.summary,
-                        content_raw=base_payload.content_raw,
-                        content_rewritten=existing.get("content_rewritten"),
-                        image_urls_json=base_payload.image_urls_json,
-                        press_contact=base_payload.press_contact or existing.get("press_contact"),
-                        source_name_snapshot=base_payload.source_name_snapshot,
-                        source_terms_url_snapshot=base_payload.source_terms_url_snapshot,
-                        source_license_name_snapshot=base_payload.source_license_name_snapshot,
-                        legal_checked=bool(int(existing.get("legal_checked", 0))),
-                        legal_checked_at=existing.get("legal_checked_at"),
-                        legal_note=existing.get("legal_note"),
-                        wp_post_id=existing.get("wp_post_id"),
-                        wp_post_url=existing.get("wp_post_url"),
-                        publish_attempts=int(existing.get("publish_attempts", 0)),
-                        publish_last_error=existing.get("publish_last_error"),
-                        published_to_wp_at=existing.get("published_to_wp_at"),
-                        word_count=base_payload.word_count,
-                        status=existing.get("status") or "new",
-                        meta_json=_merge_ingestion_meta(existing.get("meta_json"), attribution, extraction_meta),
-                    )
-
-                article_id = upsert_article(payload)
-                if article_id:
-                    articles_upserted += 1
-                    feed_upserts += 1
-
-            feed_results.append(
-                {
-                    "feed_id": int(feed["id"]),
-                    "feed_url": feed["url"],
-                    "status": "success",
-                    "entries_seen": feed_entries_seen,
-                    "upserts": feed_upserts,
-                }
+
+def _is_known_unchanged(feed: dict[str, Any], entry: dict, link: str, fingerprint: str) -> bool:
+    """True if the entry is already stored and either closed or unchanged since the last run.
+
+    Such entries skip the page fetch, HTML parse and image probes entirely.
+    """
+    state = find_article_ingest_state(
+        source_url=link,
+        feed_id=int(feed["id"]),
+        source_article_id=entry.get("id") or entry.get("guid"),
+        entry_fingerprint=fingerprint,
+    )
+    if not state:
+        return False
+    if state.get("status") == "error":
+        # Explicitly closed article: the writer would ignore it anyway.
+        return True
+    if state.get("feed_id") is not None and int(state["feed_id"]) != int(feed["id"]):
+        # Same story in another feed (e.g. Google Alerts and the publisher's own): the feed that
+        # stored it first tracks its changes; taking turns would overwrite each other's fingerprint.
+        return True
+    return state.get("entry_fingerprint") == fingerprint
+
+
+def _prepare_entry(feed: dict[str, Any], entry: dict, link: str, fingerprint: str) -> _PreparedEntry | None:
+    """Fetch and extract a single feed entry. Performs no DB writes.
+
+    Returns None if the page was not requested because its host is blocked
+    or busy; the entry is left untouched and picked up by a later poll.
+    """
+    summary, content_raw = _entry_text(entry)
+    # Strip HTML tags from title (Google Alerts wraps matched keywords in <b>)
+    raw_title = entry.get("title") or "Ohne Titel"
+    title = re.sub(r"<[^>]+>", "", raw_title).strip() or "Ohne Titel"
+    extracted = extract_article(link)
+    if extracted.deferred:
+        return None
+
+    final_title = extracted.title or title
+    final_author = extracted.author or entry.get("author")
+    final_summary = extracted.summary or (summary[:1000] if summary else None)
+    final_content_raw = extracted.content_text or content_raw
+    final_canonical = extracted.canonical_url or entry.get("link")
+    probe_log: dict[str, int] = {}
+    selected_images, primary_image, ranked_images = _select_relevant_images(
+        link,
+        final_title,
+        extracted.images,
+        max_keep=3,
+        probe_log=probe_log,
+    )
+
+    source_hash = _entry_hash(
+        entry,
+        int(feed["id"]),
+        link,
+        final_title,
+        final_summary or "",
+    )
+    attribution = {
+        "source_name": feed.get("source_name"),
+        "source_base_url": feed.get("source_base_url"),
+        "source_terms_url": feed.get("source_terms_url"),
+        "source_license_name": feed.get("source_license_name"),
+        "source_risk_level": feed.get("source_risk_level"),
+        "original_link": link,
+        "feed_name": feed.get("name"),
+        "feed_id": int(feed["id"]),
+        "imported_at": datetime.now(timezone.utc).isoformat(),
+    }
+    extraction_meta: dict[str, Any] = extracted_article_to_meta(extracted)
+    extraction_meta["fetched_from"] = link
+    extraction_meta["image_selection"] = {
+        "primary": primary_image,
+        "selected_count": len(selected_images),
+        "total_candidates": len(extracted.images),
+        "ranked": ranked_images,
+    }
+    payload = ArticleUpsert(
+        feed_id=int(feed["id"]),
+        source_article_id=entry.get("id") or entry.get("guid"),
+        source_hash=source_hash,
+        title=final_title,
+        source_url=link,
+        canonical_url=final_canonical,
+        published_at=_entry_published_iso(entry) or extracted.published_at,
+        author=final_author,
+        summary=final_summary,
+        content_raw=final_content_raw,
+        content_rewritten=None,
+        image_urls_json=json.dumps(selected_images, ensure_ascii=False) if selected_images else None,
+        press_contact=extracted.press_contact,
+        source_name_snapshot=feed.get("source_name"),
+        source_terms_url_snapshot=feed.get("source_terms_url"),
+        source_license_name_snapshot=feed.get("source_license_name"),
+        legal_checked=False,
+        legal_checked_at=None,
+        legal_note=None,
+        wp_post_id=None,
+        wp_post_url=None,
+        publish_attempts=0,
+        publish_last_error=None,
+        published_to_wp_at=None,
+        word_count=len((final_content_raw or "").split()),
+        status="new",
+        meta_json=json.dumps({"attribution": attribution, "extraction": extraction_meta}, ensure_ascii=False),
+        # Without a fingerprint the next poll fetches the page again instead of
+        # treating a transient failure as "known and unchanged". A permanent one
+        # (404, 410, 403, undecodable page) would only fail again on every poll.
+        entry_fingerprint=None if extracted.transient_error else fingerprint,
+    )
+    return _PreparedEntry(
+        payload=payload,
+        attribution=attribution,
+        extraction_meta=extraction_meta,
+        probe_results=probe_log,
+        near_duplicate_signature=(
+            minhash_signature(final_title, final_content_raw or "") if get_settings().near_duplicate_detection else None
+        ),
+    )
+
+
+def _collect_feed(feed: dict[str, Any], max_age_days: int) -> _FeedFetchResult:
+    """Network half of a feed run: fetch, parse and extract all entries.
+
+    Safe to run in a worker thread – all DB writes are left to the caller.
+    Feeds with an open circuit breaker are skipped without a request.
+    """
+    board = get_circuit_board()
+    breaker_key = feed_key(feed["id"])
+    if not board.allow(SCOPE_FEED, breaker_key):
+        return _FeedFetchResult(
+            feed=feed, parsed=None, error="circuit_open", entries_seen=0, prepared=[], fetch_status="skipped"
+        )
+
+    parsed, feed_error = _fetch_feed(feed)
+    if parsed is None:
+        board.record_failure(SCOPE_FEED, breaker_key, feed_error or "unknown")
+        return _FeedFetchResult(feed=feed, parsed=None, error=feed_error or "unknown", entries_seen=0, prepared=[])
+    http_status = _parsed_get(parsed, "status")
+    if isinstance(http_status, int) and http_status >= 400:
+        board.record_failure(SCOPE_FEED, breaker_key, f"HTTP {http_status}")
+    else:
+        board.record_success(SCOPE_FEED, breaker_key)
+
+    if _parsed_get(parsed, "status") == 304:
+        return _FeedFetchResult(
+            feed=feed, parsed=parsed, error=None, entries_seen=0, prepared=[], fetch_status="not_modified"
+        )
+
+    content_hash = _feed_content_hash(parsed)
+    if content_hash == feed.get("content_hash"):
+        unchanged_count = len(_parsed_get(parsed, "entries", []) or [])
+        return _FeedFetchResult(
+            feed=feed,
+            parsed=parsed,
+            error=None,
+            entries_seen=unchanged_count,
+            prepared=[],
+            entries_unchanged=unchanged_count,
+            fetch_status="unchanged",
+            content_hash=content_hash,
+        )
+
+    entries_seen = 0
+    entries_unchanged = 0
+    entries_deferred = 0
+    prepared: list[_PreparedEntry] = []
+    for entry in _parsed_get(parsed, "entries", []):
+        entries_seen += 1
+        link = _entry_link(entry, max_age_days)
+        if not link:
+            continue
+        fingerprint = _entry_fingerprint(entry, link)
+        if _is_known_unchanged(feed, entry, link, fingerprint):
+            entries_unchanged += 1
+            continue
+        item = _prepare_entry(feed, entry, link, fingerprint)
+        if item is None:
+            entries_deferred += 1
+            continue
+        prepared.append(item)
+    # A feed with entries that failed transiently must not short-circuit the
+    # next poll (content hash, conditional GET), or they are never retried.
+    # Permanent failures do not hold the feed back.
+    retry_pending = entries_deferred > 0 or any(item.extraction_meta.get("transient_error") for item in prepared)
+    return _FeedFetchResult(
+        feed=feed,
+        parsed=parsed,
+        error=None,
+        entries_seen=entries_seen,
+        prepared=prepared,
+        entries_unchanged=entries_unchanged,
+        entries_deferred=entries_deferred,
+        content_hash=None if retry_pending else content_hash,
+        retry_pending=retry_pending,
+    )
+
+
+def _merge_with_existing(item: _PreparedEntry, existing: dict[str, Any]) -> ArticleUpsert:
+    base_payload = item.payload
+    return ArticleUpsert(
+        feed_id=base_payload.feed_id,
+        source_article_id=base_payload.source_article_id,
+        source_hash=base_payload.source_hash,
+        title=base_payload.title,
+        source_url=base_payload.source_url,
+        canonical_url=base_payload.canonical_url,
+        published_at=base_payload.published_at,
+        author=base_payload.author,
+        summary=base_payload.summary,
+        content_raw=base_payload.content_raw,
+        content_rewritten=existing.get("content_rewritten"),
+        image_urls_json=base_payload.image_urls_json,
+        press_contact=base_payload.press_contact or existing.get("press_contact"),
+        source_name_snapshot=base_payload.source_name_snapshot,
+        source_terms_url_snapshot=base_payload.source_terms_url_snapshot,
+        source_license_name_snapshot=base_payload.source_license_name_snapshot,
+        legal_checked=bool(int(existing.get("legal_checked", 0))),
+        legal_checked_at=existing.get("legal_checked_at"),
+        legal_note=existing.get("legal_note"),
+        wp_post_id=existing.get("wp_post_id"),
+        wp_post_url=existing.get("wp_post_url"),
+        publish_attempts=int(existing.get("publish_attempts", 0)),
+        publish_last_error=existing.get("publish_last_error"),
+        published_to_wp_at=existing.get("published_to_wp_at"),
+        word_count=base_payload.word_count,
+        status=existing.get("status") or "new",
+        meta_json=_merge_ingestion_meta(existing.get("meta_json"), item.attribution, item.extraction_meta),
+        entry_fingerprint=base_payload.entry_fingerprint,
+    )
+
+
+def _next_poll_interval(entries_per_day: float | None) -> int:
+    """Poll about once per new entry: 1/rate, clamped to the configured bounds.
+
+    Without an observed rate yet (first poll) the default interval applies.
+    """
+    settings = get_settings()
+    low = max(1, settings.ingestion_poll_min_minutes)
+    high = max(low, settings.ingestion_poll_max_minutes)
+    if entries_per_day is None:
+        return min(high, max(low, settings.ingestion_poll_default_minutes))
+    if entries_per_day <= 0:
+        return high
+    return min(high, max(low, round(1440 / entries_per_day)))
+
+
+def _observed_entries_per_day(feed: dict[str, Any], new_entries: int | None) -> float | None:
+    """Exponentially weighted rate of new entries per day since the last poll.
+
+    ``new_entries`` None (failed poll) keeps the previous rate; the next
+    successful poll covers the whole period since the last check. Without a
+    stored rate (new feed, or the first poll after the migration) the average
+    starts from the rate the current interval stands for, so one quiet poll
+    backs off gradually instead of jumping to the maximum interval.
+    """
+    previous = feed.get("new_entries_per_day")
+    previous = float(previous) if previous is not None else None
+    last_checked = feed.get("last_checked_at")
+    if new_entries is None or not last_checked:
+        return previous
+    try:
+        checked_dt = datetime.fromisoformat(str(last_checked)).replace(tzinfo=timezone.utc)
+        elapsed_days = (datetime.now(timezone.utc) - checked_dt).total_seconds() / 86400
+    except Exception:
+        return previous
+    if elapsed_days <= 0:
+        return previous
+    observed = new_entries / elapsed_days
+    if previous is None:
+        interval = feed.get("poll_interval_minutes") or get_settings().ingestion_poll_default_minutes
+        previous = 1440 / max(1, int(interval))
+    return 0.3 * observed + 0.7 * previous
+
+
+def _update_poll_schedule(feed: dict[str, Any], new_entries: int | None, conn: sqlite3.Connection) -> int:
+    """Schedule the next poll from the feed's rate of newly inserted articles."""
+    rate = _observed_entries_per_day(feed, new_entries)
+    interval = _next_poll_interval(rate)
+    update_feed_poll_schedule(
+        int(feed["id"]),
+        poll_interval_minutes=interval,
+        new_entries_per_day=rate,
+        had_new_entries=bool(new_entries),
+        conn=conn,
+    )
+    return interval
+
+
+def _write_feed_result(result: _FeedFetchResult, conn: sqlite3.Connection) -> dict[str, object]:
+    """DB half of a feed run. Only ever called from the single writer thread.
+
+    All writes for one feed (probe cache, article upserts, fetch state and
+    poll schedule) go through ``conn``; the caller commits them – together
+    with the run checkpoint – as one transaction.
+    """
+    feed = result.feed
+    get_circuit_board().flush(conn)
+    get_variant_board().flush(conn)
+    if result.fetch_status == "skipped":
+        # Open circuit breaker: nothing was fetched, keep the poll schedule.
+        return {
+            "feed_id": int(feed["id"]),
+            "feed_url": feed["url"],
+            "status": "skipped",
+            "fetch_status": "skipped",
+            "error": result.error,
+            "entries_seen": 0,
+            "upserts": 0,
+        }
+    if result.parsed is None:
+        return {
+            "feed_id": int(feed["id"]),
+            "feed_url": feed["url"],
+            "status": "failed",
+            "error": result.error or "unknown",
+            "entries_seen": 0,
+            "upserts": 0,
+            "poll_interval_minutes": _update_poll_schedule(feed, None, conn),
+        }
+
+    probe_results: dict[str, int] = {}
+    for item in result.prepared:
+        probe_results.update(item.probe_results)
+    store_image_probe_results(probe_results, conn=conn)
+
+    feed_upserts = 0
+    feed_inserts = 0  # new articles only; edits of known items do not speed up polling
+    near_duplicates = 0
+    for item in result.prepared:
+        existing = find_existing_article_for_upsert(item.payload, conn=conn)
+        if existing and existing.get("status") == "error":
+            # Explicitly closed article: ignore on subsequent ingestion runs.
+            continue
+
+        payload = _merge_with_existing(item, existing) if existing else item.payload
+        article_id = upsert_article(payload, conn=conn, existing_id=int(existing["id"]) if existing else None)
+        if article_id:
+            feed_upserts += 1
+            if not existing:
+                feed_inserts += 1
+        signature = item.near_duplicate_signature
+        if article_id and signature is not None and not (existing and has_article_minhash(article_id, conn=conn)):
+            cluster_id, _ = assign_cluster(article_id, signature, conn)
+            if cluster_id != article_id:
+                near_duplicates += 1
+
+    # Persist ETag/Last-Modified for conditional requests. The content hash is
+    # committed together with the entries, so an aborted feed re-processes.
+    parsed_etag = _parsed_get(result.parsed, "etag")
+    parsed_modified = _parsed_get(result.parsed, "modified")
+    if parsed_modified and not isinstance(parsed_modified, str):
+        parsed_modified = str(parsed_modified)
+    if result.fetch_status == "not_modified":
+        # A 304 often omits the validators – keep the stored ones.
+        parsed_etag = parsed_etag or feed.get("etag")
+        parsed_modified = parsed_modified or feed.get("last_modified")
+    if result.retry_pending:
+        parsed_etag = parsed_modified = None
+    update_feed_fetch_state(
+        feed_id=int(feed["id"]),
+        etag=parsed_etag if isinstance(parsed_etag, str) else None,
+        last_modified=parsed_modified if isinstance(parsed_modified, str) else None,
+        content_hash=result.content_hash,
+        conn=conn,
+    )
+
+    return {
+        "feed_id": int(feed["id"]),
+        "feed_url": feed["url"],
+        "status": "success",
+        "fetch_status": result.fetch_status,
+        "entries_seen": result.entries_seen,
+        "entries_unchanged": result.entries_unchanged,
+        "entries_deferred": result.entries_deferred,
+        "upserts": feed_upserts,
+        "near_duplicates": near_duplicates,
+        "extraction_budget_exhausted": sum(1 for item in result.prepared if item.extraction_meta.get("budget_exhausted")),
+        "poll_interval_minutes": _update_poll_schedule(feed, feed_inserts, conn),
+    }
+
+
+def _iter_feed_results(feeds: list[dict[str, Any]], max_age_days: int, workers: int) -> Iterator[_FeedFetchResult]:
+    if workers <= 1 or len(feeds) <= 1:
+        for feed in feeds:
+            yield _collect_feed(feed, max_age_days)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingestion") as executor:
+        futures = [executor.submit(_collect_feed, feed, max_age_days) for feed in feeds]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+@dataclass
+class _RunProgress:
+    """Running totals of an ingestion run; stored in ``runs.details`` as its checkpoint."""
+
+    feed_id: int | None = None
+    due_only: bool = False
+    workers: int = 1
+    feeds_total: int = 0
+    feeds_processed: int = 0
+    entries_seen: int = 0
+    entries_unchanged: int = 0
+    entries_deferred: int = 0
+    articles_upserted: int = 0
+    near_duplicates: int = 0
+    extraction_budget_exhausted: int = 0  # pages whose extraction ran out of EXTRACTION_TIME_BUDGET_MS
+    fetch_status_counts: dict[str, int] = field(
+        default_factory=lambda: {"changed": 0, "unchanged": 0, "not_modified": 0, "skipped": 0}
+    )
+    completed_feed_ids: list[int] = field(default_factory=list)
+    feed_results: list[dict[str, object]] = field(default_factory=list)
+
+    def add(self, feed_result: dict[str, object]) -> None:
+        self.feeds_processed += 1
+        self.entries_seen += int(feed_result["entries_seen"])
+        self.entries_unchanged += int(feed_result.get("entries_unchanged", 0))
+        self.entries_deferred += int(feed_result.get("entries_deferred", 0))
+        self.articles_upserted += int(feed_result["upserts"])
+        self.near_duplicates += int(feed_result.get("near_duplicates", 0))
+        self.extraction_budget_exhausted += int(feed_result.get("extraction_budget_exhausted", 0))
+        if feed_result.get("fetch_status") in self.fetch_status_counts:
+            self.fetch_status_counts[str(feed_result["fetch_status"])] += 1
+        self.completed_feed_ids.append(int(feed_result["feed_id"]))
+        self.feed_results.append(feed_result)
+
+    def details(self, **extra: object) -> str:
+        return json.dumps(
+            {
+                "feed_id": self.feed_id,
+                "feeds_total": self.feeds_total,
+                "feeds_processed": self.feeds_processed,
+                "entries_seen": self.entries_seen,
+                "entries_unchanged": self.entries_unchanged,
+                "entries_deferred": self.entries_deferred,
+                "upserts": self.articles_upserted,
+                "near_duplicates": self.near_duplicates,
+                "extraction_budget_exhausted": self.extraction_budget_exhausted,
+                "workers": self.workers,
+                "due_only": self.due_only,
+                "feeds_changed": self.fetch_status_counts["changed"],
+                "feeds_unchanged": self.fetch_status_counts["unchanged"],
+                "feeds_not_modified": self.fetch_status_counts["not_modified"],
+                "feeds_skipped": self.fetch_status_counts["skipped"],
+                "completed_feed_ids": self.completed_feed_ids,
+                "feeds": self.feed_results,
+                **extra,
+            },
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def from_details(cls, details: str | None) -> _RunProgress | None:
+        try:
+            data = json.loads(details or "")
+        except ValueError:
+            return None
+        if not isinstance(data, dict) or not isinstance(data.get("completed_feed_ids"), list):
+            return None
+        progress = cls(
+            feed_id=data.get("feed_id"),
+            due_only=bool(data.get("due_only")),
+            workers=int(data.get("workers") or 1),
+            feeds_total=int(data.get("feeds_total") or 0),
+            feeds_processed=int(data.get("feeds_processed") or 0),
+            entries_seen=int(data.get("entries_seen") or 0),
+            entries_unchanged=int(data.get("entries_unchanged") or 0),
+            entries_deferred=int(data.get("entries_deferred") or 0),
+            articles_upserted=int(data.get("upserts") or 0),
+            near_duplicates=int(data.get("near_duplicates") or 0),
+            extraction_budget_exhausted=int(data.get("extraction_budget_exhausted") or 0),
+            completed_feed_ids=[int(value) for value in data["completed_feed_ids"]],
+            feed_results=list(data.get("feeds") or []),
+        )
+        for status in progress.fetch_status_counts:
+            progress.fetch_status_counts[status] = int(data.get(f"feeds_{status}") or 0)
+        return progress
+
+    def event(self, name: str, run_id: int, **extra: object) -> dict[str, Any]:
+        return {
+            "event": name,
+            "run_id": run_id,
+            "feeds_total": self.feeds_total,
+            "feeds_processed": self.feeds_processed,
+            "entries_seen": self.entries_seen,
+            "articles_upserted": self.articles_upserted,
+            **extra,
+        }
+
+
+def _select_feeds(feed_id: int | None, due_only: bool) -> list[dict[str, Any]]:
+    if feed_id is not None:
+        feed = get_feed_by_id(feed_id)
+        return [feed] if feed and int(feed.get("is_enabled", 0)) == 1 else []
+    feeds = list_due_feeds() if due_only else list_enabled_feeds()
+    return [feed for feed in feeds if feed]
+
+
+def iter_ingestion(
+    feed_id: int | None = None,
+    workers: int | None = None,
+    due_only: bool = False,
+    resume_run_id: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Run an ingestion and yield progress events while it goes.
+
+    Events: ``started``, one ``feed_collected`` (network phase done) and
+    ``feed_written`` (committed) per feed, and a final ``finished``. Every
+    ``feed_written`` also stores the run totals as checkpoint in
+    ``runs.details`` – in the same transaction as the feed's articles. A run
+    that died half-way can be continued with ``resume_run_id``; feeds already
+    committed in it are skipped and its original feed selection is reused.
+    Only stopped runs can be resumed: a run that is still ``running`` is
+    refused, so one checkpoint never has two writers. If the consumer stops
+    iterating (e.g. a streaming client disconnects), the run is marked failed
+    and can be resumed later.
+    """
+    settings = get_settings()
+    if resume_run_id is not None:
+        run = get_run_by_id(resume_run_id)
+        progress = _RunProgress.from_details(run.get("details")) if run else None
+        if progress is None or not claim_run_for_resume(resume_run_id, "ingestion"):
+            still_running = bool(run) and run["status"] == "running"
+            yield {
+                "event": "finished",
+                "run_id": resume_run_id,
+                "status": "failed",
+                "message": f"Run #{resume_run_id} kann nicht fortgesetzt werden" + (" (laeuft noch)" if still_running else ""),
+                "feeds_total": 0,
+                "feeds_processed": 0,
+                "entries_seen": 0,
+                "articles_upserted": 0,
+            }
+            return
+        run_id = resume_run_id
+        feed_id, due_only = progress.feed_id, progress.due_only
+    else:
+        progress = _RunProgress(feed_id=feed_id, due_only=due_only and feed_id is None)
+        run_id = create_run(RunCreate(run_type="ingestion", status="running", details=progress.details()))
+    progress.workers = max(1, workers if workers is not None else settings.ingestion_workers)
+
+    finished = False
+    try:
+        done = set(progress.completed_feed_ids)
+        feeds = [feed for feed in _select_feeds(feed_id, progress.due_only) if int(feed["id"]) not in done]
+        progress.feeds_total = len(done) + len(feeds)
+        update_run_progress(run_id, progress.details())
+        yield progress.event("started", run_id, resumed=resume_run_id is not None, feeds_remaining=len(feeds))
+
+        for result in _iter_feed_results(feeds, settings.pipeline_max_article_age_days, progress.workers):
+            yield progress.event(
+                "feed_collected",
+                run_id,
+                feed_id=int(result.feed["id"]),
+                fetch_status="failed" if result.error and result.fetch_status != "skipped" else result.fetch_status,
+                entries_prepared=len(result.prepared),
             )
+            with write_transaction() as conn:
+                feed_result = _write_feed_result(result, conn)
+                progress.add(feed_result)
+                update_run_progress(run_id, progress.details(), conn=conn)
+            yield progress.event("feed_written", run_id, feed=feed_result)
+
+        # Host breakers and variant trials touched by workers after the last feed write.
+        with write_transaction() as conn:
+            get_circuit_board().flush(conn)
+            get_variant_board().flush(conn)
+        finish_run(run_id=run_id, status="success", details=progress.details())
+        finished = True
+        yield progress.event("finished", run_id, status="success", message="Ingestion abgeschlossen")
+    except Exception as exc:
+        # The last committed checkpoint is the truth; an aborted feed is not in it.
+        checkpoint = _RunProgress.from_details((get_run_by_id(run_id) or {}).get("details")) or progress
+        finish_run(run_id=run_id, status="failed", details=checkpoint.details(error=str(exc)))
+        finished = True
+        yield checkpoint.event("finished", run_id, status="failed", message=str(exc))
+    finally:
+        if not finished:
+            # GeneratorExit (consumer gone) or an interrupt: leave a resumable run, not one stuck in "running".
+            checkpoint = _RunProgress.from_details((get_run_by_id(run_id) or {}).get("details")) or progress
+            finish_run(run_id=run_id, status="failed", details=checkpoint.details(error="Ingestion abgebrochen"))
+
+
+def run_ingestion(
+    feed_id: int | None = None,
+    workers: int | None = None,
+    due_only: bool = False,
+    resume_run_id: int | None = None,
+) -> IngestionStats:
+    """Fetch all enabled feeds (or a single one) and upsert their entries.
+
+    With ``workers > 1`` feeds are fetched, parsed and extracted in a thread
+    pool; the calling thread stays the only DB writer. ``due_only`` restricts
+    the run to feeds whose adaptive ``next_poll_at`` has passed. See
+    ``iter_ingestion`` for progress events and resuming.
+    """
+    finished: dict[str, Any] = {}
+    for event in iter_ingestion(feed_id=feed_id, workers=workers, due_only=due_only, resume_run_id=resume_run_id):
+        finished = event
+    return IngestionStats(
+        run_id=int(finished["run_id"]),
+        feeds_processed=int(finished["feeds_processed"]),
+        entries_seen=int(finished["entries_seen"]),
+        articles_upserted=int(finished["articles_upserted"]),
+        status=str(finished["status"]),
+        message=str(finished["message"]),
+    )
+
+
+def _replay_fields(article: dict[str, Any]) -> dict[str, Any] | None:
+    """Re-run extraction on the archived page of ``article``; no network access."""
+    source_url = article["source_url"]
+    page = load_page(source_url)
+    if page is None:
+        return None
+    raw, charset = page
+    extracted = extract_page(raw, charset, source_url)
+    final_title = extracted.title or article["title"]
+    selected_images, primary_image, ranked_images = _select_relevant_images(
+        source_url,
+        final_title,
+        extracted.images,
+        max_keep=3,
+        offline=True,
+    )
+    extraction_meta: dict[str, Any] = extracted_article_to_meta(extracted)
+    extraction_meta["fetched_from"] = source_url
+    extraction_meta["replayed_at"] = datetime.now(timezone.utc).isoformat()
+    extraction_meta["image_selection"] = {
+        "primary": primary_image,
+        "selected_count": len(selected_images),
+        "total_candidates": len(extracted.images),
+        "ranked": ranked_images,
+    }
+    return {
+        "title": final_title,
+        "author": extracted.author or article.get("author"),
+        "summary": extracted.summary or article.get("summary"),
+        "content_raw": extracted.content_text or article.get("content_raw"),
+        "canonical_url": extracted.canonical_url or article.get("canonical_url"),
+        "image_urls_json": json.dumps(selected_images, ensure_ascii=False) if selected_images else article.get("image_urls_json"),
+        "press_contact": extracted.press_contact or article.get("press_contact"),
+        "extraction_meta": extraction_meta,
+    }
+
+
+def _apply_replay(article: dict[str, Any], fields: dict[str, Any]) -> ArticleUpsert:
+    meta: dict[str, Any] = {}
+    if article.get("meta_json"):
+        try:
+            parsed = json.loads(article["meta_json"])
+            if isinstance(parsed, dict):
+                meta = parsed
+        except Exception:
+            meta = {}
+    meta["extraction"] = fields["extraction_meta"]
+    return ArticleUpsert(
+        feed_id=article.get("feed_id"),
+        source_article_id=article.get("source_article_id"),
+        source_hash=article["source_hash"],
+        title=fields["title"],
+        source_url=article["source_url"],
+        canonical_url=fields["canonical_url"],
+        published_at=article.get("published_at"),
+        author=fields["author"],
+        summary=fields["summary"],
+        content_raw=fields["content_raw"],
+        content_rewritten=article.get("content_rewritten"),
+        image_urls_json=fields["image_urls_json"],
+        press_contact=fields["press_contact"],
+        source_name_snapshot=article.get("source_name_snapshot"),
+        source_terms_url_snapshot=article.get("source_terms_url_snapshot"),
+        source_license_name_snapshot=article.get("source_license_name_snapshot"),
+        legal_checked=bool(int(article.get("legal_checked", 0))),
+        legal_checked_at=article.get("legal_checked_at"),
+        legal_note=article.get("legal_note"),
+        wp_post_id=article.get("wp_post_id"),
+        wp_post_url=article.get("wp_post_url"),
+        publish_attempts=int(article.get("publish_attempts", 0)),
+        publish_last_error=article.get("publish_last_error"),
+        published_to_wp_at=article.get("published_to_wp_at"),
+        word_count=len((fields["content_raw"] or "").split()),
+        status=article.get("status") or "new",
+        meta_json=json.dumps(meta, ensure_ascii=False),
+    )
+
+
+def run_replay(feed_id: int | None = None, limit: int = 500) -> ReplayStats:
+    """Re-extract stored articles from the HTML archive without touching the network.
+
+    Only extraction-derived fields (text, summary, author, images, press
+    contact, extraction meta) are replaced; status, rewrites, review and
+    WordPress state are kept. Articles without an archived page are counted
+    as ``missing_archive`` and left untouched.
+    """
+    run_id = create_run(RunCreate(run_type="replay", status="running", details="started"))
+    articles_seen = 0
+    articles_replayed = 0
+    missing_archive = 0
+    budget_exhausted = 0
+    try:
+        article_ids = list_article_ids_for_replay(feed_id=feed_id, limit=limit)
+        for start in range(0, len(article_ids), REPLAY_BATCH_SIZE):
+            replayed: dict[int, dict[str, Any]] = {}
+            for article_id in article_ids[start : start + REPLAY_BATCH_SIZE]:
+                article = get_article_by_id(article_id)
+                if not article:
+                    continue
+                articles_seen += 1
+                fields = _replay_fields(article)
+                if fields is None:
+                    missing_archive += 1
+                    continue
+                replayed[article_id] = fields
+                if fields["extraction_meta"].get("budget_exhausted"):
+                    budget_exhausted += 1
+            if not replayed:
+                continue
+            with write_transaction() as conn:
+                for article_id, fields in replayed.items():
+                    # Re-read inside the transaction so concurrent review edits are kept.
+                    current = get_article_by_id(article_id, conn=conn)
+                    if not current:
+                        continue
+                    upsert_article(_apply_replay(current, fields), conn=conn, existing_id=article_id)
+                    articles_replayed += 1
 
         finish_run(
             run_id=run_id,
             status="success",
             details=json.dumps(
                 {
-                    "feeds_processed": feeds_processed,
-                    "entries_seen": entries_seen,
-                    "upserts": articles_upserted,
-                    "feeds": feed_results,
+                    "feed_id": feed_id,
+                    "articles_seen": articles_seen,
+                    "articles_replayed": articles_replayed,
+                    "missing_archive": missing_archive,
+                    "extraction_budget_exhausted": budget_exhausted,
                 },
                 ensure_ascii=False,
             ),
         )
-        return IngestionStats(
+        return ReplayStats(
             run_id=run_id,
-            feeds_processed=feeds_processed,
-            entries_seen=entries_seen,
-            articles_upserted=articles_upserted,
+            articles_seen=articles_seen,
+            articles_replayed=articles_replayed,
+            missing_archive=missing_archive,
             status="success",
-            message="Ingestion abgeschlossen",
+            message="Replay abgeschlossen",
         )
     except Exception as exc:
         finish_run(run_id=run_id, status="failed", details=str(exc))
-        return IngestionStats(
+        return ReplayStats(
             run_id=run_id,
-            feeds_processed=feeds_processed,
-            entries_seen=entries_seen,
-            articles_upserted=articles_upserted,
+            articles_seen=articles_seen,
+            articles_replayed=articles_replayed,
+            missing_archive=missing_archive,
             status="failed",
             message=str(exc),
         )
@@ -0,0 +1,149 @@
+"""schema.org article data from ``<script type="application/ld+json">`` blocks.
+
+Many publishers embed a ``NewsArticle`` (or ``Article``/``BlogPosting``)
+object carrying headline, author, description, datePublished, images and the
+full ``articleBody``. When present it is more reliable than any markup
+heuristic, so ``source_extraction`` takes these fields from here and only runs
+its heuristics for whatever the JSON-LD leaves out.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from html import unescape
+import json
+import re
+from typing import Any, Iterable, Iterator
+from urllib.parse import urljoin
+
+_ARTICLE_TYPES = {"blogposting", "liveblogposting", "report"}
+
+
+@dataclass(frozen=True)
+class JsonLdArticle:
+    title: str | None = None
+    author: str | None = None
+    summary: str | None = None
+    content_text: str | None = None
+    canonical_url: str | None = None
+    published_at: str | None = None
+    images: list[str] = field(default_factory=list)
+    image_metadata: dict[str, dict] = field(default_factory=dict)
+
+
+def _text(value: Any) -> str | None:
+    if not isinstance(value, str):
+        return None
+    text = re.sub(r"<[^>]+>", " ", unescape(value))
+    text = re.sub(r"\s+", " ", text).strip()
+    return text or None
+
+
+def _body_text(value: Any) -> str | None:
+    """``articleBody`` keeps its paragraph breaks, like the heuristic content text."""
+    if not isinstance(value, str):
+        return None
+    lines = (_text(line) for line in re.split(r"\n+", unescape(value)))
+    body = "\n".join(line for line in lines if line)
+    return body or None
+
+
+def _names(value: Any) -> list[str]:
+    if isinstance(value, list):
+        return [name for item in value for name in _names(item)]
+    if isinstance(value, dict):
+        value = value.get("name")
+    text = _text(value)
+    return [text] if text else []
+
+
+def _is_article(node: dict[str, Any]) -> bool:
+    types = node.get("@type")
+    for item in types if isinstance(types, list) else [types]:
+        if isinstance(item, str):
+            name = item.rsplit("/", 1)[-1].lower()
+            if name.endswith("article") or name in _ARTICLE_TYPES:
+                return True
+    return False
+
+
+def _nodes(data: Any) -> Iterator[dict[str, Any]]:
+    if isinstance(data, list):
+        for item in data:
+            yield from _nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from _nodes(data["@graph"])
+
+
+def _published_iso(value: Any) -> str | None:
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def _images(value: Any, page_url: str) -> tuple[list[str], dict[str, dict]]:
+    images: list[str] = []
+    metadata: dict[str, dict] = {}
+    for item in value if isinstance(value, list) else [value]:
+        if isinstance(item, str):
+            url = item.strip()
+            if url:
+                images.append(urljoin(page_url, url))
+            continue
+        if not isinstance(item, dict):
+            continue
+        url = item.get("url") or item.get("contentUrl")
+        if not isinstance(url, str) or not url.strip():
+            continue
+        url = urljoin(page_url, url.strip())
+        images.append(url)
+        entry: dict[str, Any] = {}
+        caption = _text(item.get("caption")) or _text(item.get("description"))
+        credit = _text(item.get("creditText")) or ", ".join(_names(item.get("copyrightHolder")) or _names(item.get("author")))
+        if caption:
+            entry["caption"] = caption
+        if credit:
+            entry["credit"] = credit
+        for key in ("width", "height"):
+            try:
+                entry[key] = int(str(item.get(key)).removesuffix("px"))
+            except (TypeError, ValueError):
+                pass
+        if entry:
+            metadata[url] = entry
+    return list(dict.fromkeys(images)), metadata
+
+
+def parse_json_ld(blocks: Iterable[str], page_url: str) -> JsonLdArticle | None:
+    """Return the first article object found in ``blocks``; invalid JSON is skipped."""
+    for raw in blocks:
+        try:
+            data = json.loads(raw.strip(), strict=False)
+        except ValueError:
+            continue
+        for node in _nodes(data):
+            if not _is_article(node):
+                continue
+            images, image_metadata = _images(node.get("image"), page_url)
+            main_entity = node.get("mainEntityOfPage")
+            canonical = node.get("url") or (main_entity.get("@id") if isinstance(main_entity, dict) else main_entity)
+            authors = list(dict.fromkeys(_names(node.get("author"))))
+            return JsonLdArticle(
+                title=_text(node.get("headline")) or _text(node.get("name")),
+                author=", ".join(authors) or None,
+                summary=_text(node.get("description")),
+                content_text=_body_text(node.get("articleBody")),
+                canonical_url=urljoin(page_url, canonical.strip()) if isinstance(canonical, str) and canonical.strip() else None,
+                published_at=_published_iso(node.get("datePublished")),
+                images=images,
+                image_metadata=image_metadata,
+            )
+    return None
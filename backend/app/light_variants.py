@@ -0,0 +1,298 @@
+"""Learned lightweight page variants (AMP, print) per article host.
+
+Many publishers serve the same article as a much smaller AMP or print page.
+With ``LIGHT_VARIANTS_ENABLED`` the extractor learns per host whether such a
+variant is an equivalent, cheaper source:
+
+1. A full fetch reveals a candidate: the page's ``<link rel="amphtml">`` or
+   the ``light_variant`` rule of the host's extraction profile. The candidate
+   is turned into a rule (``derive_rule``) so it applies to every article of
+   the host, e.g. ``suffix:/amp/`` or ``query:outputType=valid_amp``.
+2. While the host is ``learning``, the variant is fetched in addition to the
+   full page and both extractions are compared. A single mismatch (title,
+   text, images or press contact lost) rejects the host.
+3. After ``LIGHT_VARIANT_MIN_TRIALS`` equivalent pairs the host becomes
+   ``preferred`` if the variant saved at least ``LIGHT_VARIANT_MIN_SAVINGS``
+   of the bytes, otherwise ``rejected``.
+4. Preferred hosts fetch only the variant. A failing or empty variant sends
+   the host back to ``learning``; the full page is fetched instead.
+
+Rejected hosts are trialled again after ``REJECTED_RETRY_DAYS``, a site
+redesign may have changed the picture. The article keeps its canonical URL
+either way; the variant only changes where the bytes come from.
+
+Like the circuit breakers, the state lives in memory for the worker threads
+and is persisted by the single DB writer (``flush``).
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import logging
+import sqlite3
+import threading
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from .circuit_breaker import host_key
+from .config import get_settings
+from .repositories import list_light_variants, store_light_variants
+
+logger = logging.getLogger(__name__)
+
+STATE_LEARNING = "learning"
+STATE_PREFERRED = "preferred"
+STATE_REJECTED = "rejected"
+REJECTED_RETRY_DAYS = 30
+
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def _format(value: datetime | None) -> str | None:
+    return value.strftime(_TIMESTAMP_FORMAT) if value else None
+
+
+def _parse(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, _TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def derive_rule(url: str, variant_url: str) -> str | None:
+    """Rule that turns ``url`` into ``variant_url``; None if no simple rule fits.
+
+    Supported: extra query parameters (``query:``), a path suffix
+    (``suffix:``), a path prefix (``prefix:``), an infix before the file
+    extension (``ext:``) and a different host with the same path (``host:``).
+    """
+    try:
+        full, variant = urlparse(url), urlparse(variant_url)
+    except ValueError:
+        return None
+    if full.scheme not in ("http", "https") or variant.scheme not in ("http", "https") or not variant.hostname:
+        return None
+    if variant.hostname != full.hostname:
+        if variant.path == full.path and variant.query == full.query:
+            return f"host:{variant.hostname}"
+        return None
+    if variant.path == full.path:
+        full_params = parse_qsl(full.query, keep_blank_values=True)
+        variant_params = parse_qsl(variant.query, keep_blank_values=True)
+        extra = [item for item in variant_params if item not in full_params]
+        if extra and all(item in variant_params for item in full_params):
+            return f"query:{urlencode(extra)}"
+        return None
+    if variant.query != full.query:
+        return None
+    base = full.path.rstrip("/")
+    if base and variant.path.startswith(base) and variant.path[len(base) :].strip("/"):
+        return f"suffix:{variant.path[len(base):]}"
+    if variant.path.endswith(full.path) and full.path.startswith("/"):
+        return f"prefix:{variant.path[: -len(full.path)]}"
+    stem, dot, extension = full.path.rpartition(".")
+    if dot and "/" not in extension and variant.path.startswith(stem) and variant.path.endswith(f".{extension}"):
+        infix = variant.path[len(stem) : -len(extension) - 1]
+        if infix:
+            return f"ext:{infix}"
+    return None
+
+
+def apply_rule(url: str, rule: str) -> str | None:
+    """``url`` rewritten by ``rule``; None if the rule does not apply to it."""
+    kind, _, value = rule.partition(":")
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return None
+    if not value or not parsed.hostname:
+        return None
+    if kind == "query":
+        extra = parse_qsl(value, keep_blank_values=True)
+        keys = {key for key, _ in extra}
+        params = [item for item in parse_qsl(parsed.query, keep_blank_values=True) if item[0] not in keys]
+        return parsed._replace(query=urlencode(params + extra)).geturl()
+    if kind == "suffix":
+        return parsed._replace(path=parsed.path.rstrip("/") + value).geturl()
+    if kind == "prefix":
+        return parsed._replace(path=value.rstrip("/") + (parsed.path or "/")).geturl()
+    if kind == "ext":
+        stem, dot, extension = parsed.path.rpartition(".")
+        if not dot or "/" in extension:
+            return None
+        return parsed._replace(path=f"{stem}{value}.{extension}").geturl()
+    if kind == "host":
+        netloc = value if parsed.port is None else f"{value}:{parsed.port}"
+        return parsed._replace(netloc=netloc).geturl()
+    return None
+
+
+class _HostVariant:
+    def __init__(self, host: str, rule: str) -> None:
+        self.host = host
+        self.rule = rule
+        self.state = STATE_LEARNING
+        self.trials = 0
+        self.matches = 0
+        self.full_bytes = 0
+        self.light_bytes = 0
+        self.last_error: str | None = None
+        self.updated_at: datetime | None = _now()
+
+    def reset(self, rule: str, error: str | None = None) -> None:
+        self.rule = rule
+        self.state = STATE_LEARNING
+        self.trials = self.matches = self.full_bytes = self.light_bytes = 0
+        self.last_error = error
+        self.updated_at = _now()
+
+    def as_row(self) -> dict[str, Any]:
+        return {
+            "host": self.host,
+            "rule": self.rule,
+            "state": self.state,
+            "trials": self.trials,
+            "matches": self.matches,
+            "full_bytes": self.full_bytes,
+            "light_bytes": self.light_bytes,
+            "last_error": self.last_error,
+            "updated_at": _format(self.updated_at),
+        }
+
+
+class VariantBoard:
+    def __init__(self, min_trials: int, min_savings: float) -> None:
+        self.min_trials = max(1, min_trials)
+        self.min_savings = min(max(0.0, min_savings), 1.0)
+        self._hosts: dict[str, _HostVariant] = {}
+        self._dirty: set[str] = set()
+        self._lock = threading.Lock()
+
+    def load(self, rows: list[dict[str, Any]]) -> None:
+        with self._lock:
+            for row in rows:
+                entry = _HostVariant(row["host"], row["rule"])
+                entry.state = row.get("state") or STATE_LEARNING
+                entry.trials = int(row.get("trials") or 0)
+                entry.matches = int(row.get("matches") or 0)
+                entry.full_bytes = int(row.get("full_bytes") or 0)
+                entry.light_bytes = int(row.get("light_bytes") or 0)
+                entry.last_error = row.get("last_error")
+                entry.updated_at = _parse(row.get("updated_at"))
+                self._hosts[entry.host] = entry
+
+    def preferred_url(self, url: str) -> str | None:
+        """Variant to fetch instead of ``url`` once the host is ``preferred``."""
+        with self._lock:
+            entry = self._hosts.get(host_key(url))
+            if entry is None or entry.state != STATE_PREFERRED:
+                return None
+            variant = apply_rule(url, entry.rule)
+        return variant if variant and variant != url else None
+
+    def trial_url(self, url: str, rule: str | None) -> str | None:
+        """Variant to fetch next to the full page while the host is learning.
+
+        ``rule`` is the candidate from the profile or the page's amphtml link.
+        A different rule than the stored one starts the learning over.
+        """
+        key = host_key(url)
+        if not key or not rule:
+            return None
+        variant = apply_rule(url, rule)
+        if not variant or variant == url:
+            return None
+        with self._lock:
+            entry = self._hosts.get(key)
+            if entry is None:
+                self._hosts[key] = _HostVariant(key, rule)
+                self._dirty.add(key)
+                return variant
+            if entry.state == STATE_PREFERRED:
+                return None
+            if entry.state == STATE_REJECTED:
+                retry_after = (entry.updated_at or _now()) + timedelta(days=REJECTED_RETRY_DAYS)
+                if entry.rule == rule and _now() < retry_after:
+                    return None
+                entry.reset(rule)
+                self._dirty.add(key)
+            elif entry.rule != rule:
+                entry.reset(rule)
+                self._dirty.add(key)
+        return variant
+
+    def record_trial(self, url: str, rule: str, matched: bool, full_bytes: int, light_bytes: int, reason: str | None = None) -> None:
+        key = host_key(url)
+        with self._lock:
+            entry = self._hosts.get(key)
+            if entry is None or entry.state != STATE_LEARNING or entry.rule != rule:
+                return  # decided meanwhile by another worker, or the rule changed
+            entry.trials += 1
+            entry.updated_at = _now()
+            self._dirty.add(key)
+            if not matched:
+                entry.state = STATE_REJECTED
+                entry.last_error = (reason or "Inhalt weicht ab")[:500]
+                logger.info("Leichte Variante fuer %s verworfen: %s", key, entry.last_error)
+                return
+            entry.matches += 1
+            entry.full_bytes += max(0, full_bytes)
+            entry.light_bytes += max(0, light_bytes)
+            if entry.trials < self.min_trials:
+                return
+            savings = 1 - entry.light_bytes / entry.full_bytes if entry.full_bytes else 0.0
+            if savings >= self.min_savings:
+                entry.state = STATE_PREFERRED
+                entry.last_error = None
+                logger.info("Leichte Variante fuer %s bevorzugt (%s, %.0f%% weniger Bytes)", key, entry.rule, savings * 100)
+            else:
+                entry.state = STATE_REJECTED
+                entry.last_error = f"Ersparnis {savings:.0%} unter {self.min_savings:.0%}"
+
+    def record_failure(self, url: str, error: str) -> None:
+        """The preferred variant failed or came back empty: learn the host again."""
+        key = host_key(url)
+        with self._lock:
+            entry = self._hosts.get(key)
+            if entry is None:
+                return
+            entry.reset(entry.rule, error[:500])
+            self._dirty.add(key)
+        logger.info("Leichte Variante fuer %s fehlgeschlagen, lerne neu: %s", key, error)
+
+    def flush(self, conn: sqlite3.Connection | None = None) -> None:
+        """Persist changed hosts; call from the DB writer."""
+        with self._lock:
+            rows = [self._hosts[key].as_row() for key in self._dirty if key in self._hosts]
+            self._dirty.clear()
+        store_light_variants(rows, conn=conn)
+
+
+_board: VariantBoard | None = None
+_board_settings: object | None = None
+_board_lock = threading.Lock()
+
+
+def get_variant_board() -> VariantBoard:
+    """Process-wide board, loaded from the DB; rebuilt whenever the settings object is replaced."""
+    global _board, _board_settings
+    settings = get_settings()
+    with _board_lock:
+        if _board is None or _board_settings is not settings:
+            board = VariantBoard(
+                min_trials=settings.light_variant_min_trials,
+                min_savings=settings.light_variant_min_savings,
+            )
+            try:
+                board.load(list_light_variants())
+            except sqlite3.Error as exc:
+                # Variants are an optimization: start empty rather than block fetches.
+                logger.warning("Status der leichten Varianten konnte nicht geladen werden: %s", exc)
+            _board = board
+            _board_settings = settings
+        return _board
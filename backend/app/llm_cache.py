@@ -0,0 +1,101 @@
+"""Persistent cache of OpenAI chat responses.
+
+Relevance scoring, rewrite and tag generation are pure functions of their
+prompt: a Telegram "rewrite" callback, an admin re-run, an override of a
+rejected article or a pipeline retry after a WordPress failure would
+otherwise pay again for identical input. Responses are stored in the
+``llm_responses`` table under
+
+    (model, prompt version, temperature, sha256 of system + user message)
+
+The user message is built from the sanitized article text, so any change to
+the input, the template wording, the model or the temperature is a miss.
+Bump a prompt's version when its meaning changes without its text (e.g. how
+the answer is parsed). Callers that really want a new answer pass
+``refresh=True``: the lookup is skipped and the stored response replaced.
+
+Hits, misses and bypasses are counted per prompt version in memory
+(``cache_stats``); the table keeps a persistent hit count per entry.
+``LLM_CACHE_ENABLED=false`` turns the cache off. It is advisory: database
+errors are logged and the request goes to OpenAI.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import logging
+import sqlite3
+import threading
+
+from .config import get_settings
+from .repositories import get_llm_response, list_llm_response_stats, store_llm_response
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LlmCacheKey:
+    model: str
+    prompt_version: str
+    temperature: float
+    input_hash: str
+
+
+def cache_key(model: str, prompt_version: str, temperature: float, system: str, user: str) -> LlmCacheKey:
+    digest = hashlib.sha256()
+    for part in (system, user):
+        data = part.encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return LlmCacheKey(model, prompt_version, round(float(temperature), 3), digest.hexdigest())
+
+
+_counts: dict[str, dict[str, int]] = {}
+_counts_lock = threading.Lock()
+
+
+def _count(prompt_version: str, outcome: str) -> None:
+    with _counts_lock:
+        counts = _counts.setdefault(prompt_version, {"hits": 0, "misses": 0, "bypassed": 0})
+        counts[outcome] += 1
+
+
+def lookup(key: LlmCacheKey, refresh: bool = False) -> str | None:
+    """Stored response for ``key``; None on a miss, a bypass or with the cache disabled."""
+    if not get_settings().llm_cache_enabled:
+        return None
+    if refresh:
+        _count(key.prompt_version, "bypassed")
+        return None
+    try:
+        response = get_llm_response(key.model, key.prompt_version, key.temperature, key.input_hash)
+    except sqlite3.Error as exc:
+        logger.warning("LLM-Cache konnte nicht gelesen werden: %s", exc)
+        response = None
+    _count(key.prompt_version, "misses" if response is None else "hits")
+    return response
+
+
+def store(key: LlmCacheKey, response: str) -> None:
+    if not get_settings().llm_cache_enabled:
+        return
+    try:
+        store_llm_response(key.model, key.prompt_version, key.temperature, key.input_hash, response)
+    except sqlite3.Error as exc:
+        logger.warning("LLM-Antwort konnte nicht gespeichert werden: %s", exc)
+
+
+def cache_stats() -> dict[str, object]:
+    """Counters of this process per prompt version plus the stored entries."""
+    with _counts_lock:
+        counts = {version: dict(values) for version, values in sorted(_counts.items())}
+    return {
+        "enabled": get_settings().llm_cache_enabled,
+        "counters": counts,
+        "stored": list_llm_response_stats(),
+    }
+
+
+def reset_cache_stats() -> None:
+    with _counts_lock:
+        _counts.clear()
@@ -8,7 +8,7 @@ import logging
 from pathlib import Path
 
 from fastapi import Depends, FastAPI, HTTPException, Request, Response, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from fastapi.staticfiles import StaticFiles
 
@@ -16,7 +16,10 @@ from .admin_ui import router as admin_router
 from .auth import create_session_token, verify_credentials, verify_session_token
 from .config import get_settings
 from .db import init_db
-from .ingestion import run_ingestion
+from .extraction_pool import shutdown_pool
+from .extraction_profiles import profile_stats
+from .llm_cache import cache_stats as llm_cache_stats
+from .ingestion import iter_ingestion, run_ingestion, run_replay
 from .pipeline import run_auto_pipeline
 from .policy import evaluate_source_policy, is_source_allowed
 from .publisher import enqueue_publish, run_publisher
@@ -39,6 +42,7 @@ from .repositories import (
     list_publish_jobs,
     list_articles as repo_list_articles,
     list_feeds as repo_list_feeds,
+    list_light_variants,
     list_runs,
     list_sources as repo_list_sources,
     set_article_legal_review,
@@ -54,6 +58,7 @@ settings = get_settings()
 async def app_lifespan(_: FastAPI):
     init_db()
     yield
+    shutdown_pool()
 
 
 app = FastAPI(title=settings.app_name, lifespan=app_lifespan)
@@ -131,6 +136,14 @@ class ArticleUpsertRequest(BaseModel):
 
 class IngestionRunRequest(BaseModel):
     feed_id: int | None = None
+    workers: int | None = Field(default=None, ge=1, le=32)
+    due_only: bool = False
+    resume_run_id: int | None = None  # continue an interrupted/failed run from its checkpoint
+
+
+class ReplayRunRequest(BaseModel):
+    feed_id: int | None = None
+    limit: int = Field(default=500, ge=1, le=5000)
 
 
 class ArticleTransitionRequest(BaseModel):
@@ -323,6 +336,21 @@ def api_list_runs(limit: int = 50, username: str = Depends(require_auth)) -> dic
     return {"ok": True, "items": list_runs(limit=limit), "requested_by": username}
 
 
+@app.get("/api/extraction/profiles")
+def api_extraction_profiles(username: str = Depends(require_auth)) -> dict:
+    return {"ok": True, "items": profile_stats(), "requested_by": username}
+
+
+@app.get("/api/llm-cache")
+def api_llm_cache(username: str = Depends(require_auth)) -> dict:
+    return {"ok": True, **llm_cache_stats(), "requested_by": username}
+
+
+@app.get("/api/extraction/light-variants")
+def api_extraction_light_variants(state: str | None = None, username: str = Depends(require_auth)) -> dict:
+    return {"ok": True, "items": list_light_variants(state=state), "requested_by": username}
+
+
 @app.get("/api/runs/{run_id}")
 def api_get_run(run_id: int, username: str = Depends(require_auth)) -> dict:
     run = get_run_by_id(run_id)
@@ -510,17 +538,17 @@ def api_article_transition(article_id: int, payload: ArticleTransitionRequest, u
 
 
 @app.post("/api/articles/{article_id}/rewrite-run")
-def api_article_rewrite_run(article_id: int, username: str = Depends(require_auth)) -> dict:
+def api_article_rewrite_run(article_id: int, refresh: bool = False, username: str = Depends(require_auth)) -> dict:
     article = get_article_by_id(article_id)
     if not article:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artikel nicht gefunden")
     if internal_to_ui_status(article.get("status")) not in {"rewrite", "new"}:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Rewrite nur aus Status 'new' oder 'rewrite'")
 
-    rewritten = rewrite_article_text(article)
+    rewritten = rewrite_article_text(article, refresh=refresh)
     tags: list[str] = []
     try:
-        tags = generate_article_tags(article, rewritten_text=rewritten)
+        tags = generate_article_tags(article, rewritten_text=rewritten, refresh=refresh)
     except Exception:
         tags = []
     merged_meta = merge_generated_tags(article.get("meta_json"), tags)
@@ -611,7 +639,12 @@ def api_article_review(article_id: int, payload: ArticleReviewRequest, username:
 
 @app.post("/api/ingestion/run")
 def api_run_ingestion(payload: IngestionRunRequest, username: str = Depends(require_auth)) -> dict:
-    stats = run_ingestion(feed_id=payload.feed_id)
+    stats = run_ingestion(
+        feed_id=payload.feed_id,
+        workers=payload.workers,
+        due_only=payload.due_only,
+        resume_run_id=payload.resume_run_id,
+    )
     return {
         "ok": stats.status == "success",
         "run_id": stats.run_id,
@@ -626,6 +659,38 @@ def api_run_ingestion(payload: IngestionRunRequest, username: str = Depends(requ
     }
 
 
+@app.post("/api/ingestion/run/stream")
+def api_run_ingestion_stream(payload: IngestionRunRequest, username: str = Depends(require_auth)) -> StreamingResponse:
+    """Run an ingestion and stream its progress events as NDJSON (one JSON object per line)."""
+    events = iter_ingestion(
+        feed_id=payload.feed_id,
+        workers=payload.workers,
+        due_only=payload.due_only,
+        resume_run_id=payload.resume_run_id,
+    )
+    return StreamingResponse(
+        (json.dumps(event, ensure_ascii=False) + "\n" for event in events),
+        media_type="application/x-ndjson",
+    )
+
+
+@app.post("/api/ingestion/replay")
+def api_run_replay(payload: ReplayRunRequest, username: str = Depends(require_auth)) -> dict:
+    stats = run_replay(feed_id=payload.feed_id, limit=payload.limit)
+    return {
+        "ok": stats.status == "success",
+        "run_id": stats.run_id,
+        "status": stats.status,
+        "message": stats.message,
+        "stats": {
+            "articles_seen": stats.articles_seen,
+            "articles_replayed": stats.articles_replayed,
+            "missing_archive": stats.missing_archive,
+        },
+        "requested_by": username,
+    }
+
+
 # ---------------------------------------------------------------------------
 # N8N Automation endpoint (API-Key auth, no session cookie required)
 # ---------------------------------------------------------------------------
@@ -666,9 +731,14 @@ async def api_n8n_pipeline(request: Request) -> dict:
 
 @app.post("/api/n8n/ingest")
 def api_n8n_ingest(request: Request) -> dict:
-    """Run only the ingestion step (no rewrite/publish). For N8N."""
+    """Run only the ingestion step (no rewrite/publish). For N8N.
+
+    ``?due_only=1`` polls only feeds whose adaptive schedule is due, so the
+    trigger can run frequently without multiplying outbound traffic.
+    """
     _require_api_key(request)
-    stats = run_ingestion()
+    due_only = request.query_params.get("due_only", "").lower() in {"1", "true", "yes"}
+    stats = run_ingestion(due_only=due_only)
     return {
         "ok": stats.status == "success",
         "stats": {
@@ -0,0 +1,112 @@
+"""Near-duplicate detection across feeds (MinHash + LSH bands in SQLite).
+
+The same press release often arrives via presseportal, Google Alerts and the
+publisher's own feed with different URLs and GUIDs, so the exact dedupe keys
+miss it. Every newly ingested article gets a MinHash signature over word
+shingles of its normalized title and body. The signature is cut into
+``MINHASH_BANDS`` bands of ``MINHASH_ROWS`` values; each band is hashed into
+one key in ``article_minhash_bands``. Articles sharing any band key are
+candidates (one indexed query), and a candidate counts as duplicate if the
+estimated Jaccard similarity reaches ``NEAR_DUPLICATE_THRESHOLD``.
+
+Matches join the cluster of their most similar candidate; the first article
+of a cluster is its representative (``cluster_id`` = its article id). The
+pipeline only sends representatives through scoring and rewriting.
+"""
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+import sqlite3
+import struct
+import unicodedata
+
+from .repositories import find_minhash_candidates, store_article_minhash
+
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16
+MINHASH_ROWS = MINHASH_PERMUTATIONS // MINHASH_BANDS
+NEAR_DUPLICATE_THRESHOLD = 0.6
+SHINGLE_SIZE = 3
+MIN_SHINGLES = 8  # too little text gives meaningless signatures
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20260218)  # fixed seed: signatures must be stable across processes
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(MINHASH_PERMUTATIONS)]
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_SIGNATURE_FORMAT = f">{MINHASH_PERMUTATIONS}Q"
+
+
+def _tokens(text: str) -> list[str]:
+    normalized = unicodedata.normalize("NFKC", text or "").lower()
+    return [token for token in _TOKEN_RE.findall(normalized) if len(token) > 1]
+
+
+def _shingles(title: str, body: str) -> set[str]:
+    shingles: set[str] = set()
+    for part in (title, body):
+        tokens = _tokens(part)
+        if len(tokens) < SHINGLE_SIZE:
+            shingles.update(tokens)
+            continue
+        shingles.update(" ".join(tokens[i : i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1))
+    return shingles
+
+
+def minhash_signature(title: str, body: str) -> tuple[int, ...] | None:
+    """MinHash signature of title + body, or None if the text is too short."""
+    shingles = _shingles(title, body)
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    hashed = [
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big") for shingle in shingles
+    ]
+    return tuple(min((a * value + b) % _PRIME for value in hashed) for a, b in _PERMUTATIONS)
+
+
+def estimate_similarity(left: tuple[int, ...], right: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the underlying shingle sets."""
+    return sum(1 for a, b in zip(left, right) if a == b) / MINHASH_PERMUTATIONS
+
+
+def band_keys(signature: tuple[int, ...]) -> list[int]:
+    """One signed 64-bit lookup key per band (band index is part of the hash)."""
+    keys: list[int] = []
+    for band in range(MINHASH_BANDS):
+        rows = signature[band * MINHASH_ROWS : (band + 1) * MINHASH_ROWS]
+        digest = hashlib.blake2b(struct.pack(f">H{MINHASH_ROWS}Q", band, *rows), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+def pack_signature(signature: tuple[int, ...]) -> bytes:
+    return struct.pack(_SIGNATURE_FORMAT, *signature)
+
+
+def unpack_signature(blob: bytes) -> tuple[int, ...]:
+    return struct.unpack(_SIGNATURE_FORMAT, blob)
+
+
+def assign_cluster(article_id: int, signature: tuple[int, ...], conn: sqlite3.Connection) -> tuple[int, float]:
+    """Index ``article_id`` and return ``(cluster_id, similarity)``.
+
+    ``cluster_id == article_id`` means no near-duplicate was found and the
+    article starts its own cluster.
+    """
+    keys = band_keys(signature)
+    best: tuple[int, float] | None = None
+    for candidate in find_minhash_candidates(keys, exclude_article_id=article_id, conn=conn):
+        similarity = estimate_similarity(signature, unpack_signature(candidate["signature"]))
+        if similarity >= NEAR_DUPLICATE_THRESHOLD and (best is None or similarity > best[1]):
+            best = (int(candidate["cluster_id"]), similarity)
+    cluster_id, similarity = best if best else (article_id, 1.0)
+    store_article_minhash(
+        article_id,
+        signature=pack_signature(signature),
+        cluster_id=cluster_id,
+        similarity=similarity,
+        band_keys=keys,
+        conn=conn,
+    )
+    return cluster_id, similarity
@@ -0,0 +1,470 @@
+"""Single-pass HTML scanner for article extraction.
+
+``scan_page`` walks the tag/text token stream of a page once and collects
+everything the extraction heuristics in ``source_extraction`` need: meta
+tags, ``link rel``, ``<title>``/``<h1>``, headings and paragraphs per
+content section (first ``<article>``, ``<main>``, ``<body>``, the whole
+document and optionally a profile-selected container), one ``ImageScan``
+record per ``<img>``/``<amp-img>`` (sources, dimensions, data-* caption/credit
+and the credit element following it) and ``<figure>``/``<figcaption>``
+captions and credit elements. Script, style and noscript content is skipped the same way the
+regex engine strips it, except for JSON-LD blocks, which are kept verbatim.
+
+The tokenizer is one compiled pattern driven by ``search``; it is
+considerably faster than ``html.parser`` on large pages.
+
+Text of an element is the data between its tags joined with spaces, which
+matches what the regex engine produced by replacing tags with blanks. Chunks
+may still contain inline markup the scanner does not track (``<a>``,
+``<strong>`` ...); consumers run them through ``_clean_text``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from html import unescape
+import re
+from typing import Callable
+
+# Only tags the scanner acts on become tokens: the structural/content tags
+# below, noise containers, and any other tag whose class marks a byline
+# (credit elements are always span/p/div). All other markup stays inside the
+# text chunks and is stripped later by ``_clean_text``, exactly as the regex
+# engine did; that keeps the Python-level loop down to a few tokens per
+# paragraph.
+# Linear on malformed pages: an unclosed comment runs to the end of the
+# document (as in browsers) instead of being retried at every further "<!--",
+# and ``feed`` never searches past the last ">". The byline alternative stops
+# at the next "<" and commits to the first author/byline class it finds
+# (atomic group, possessive tail); the class value is searched for at most
+# 200 characters. Without that, an unclosed tag full of ``class=author``
+# backtracked cubically.
+_TOKEN_RE = re.compile(
+    r"<(?:!--(?:.*?--\s*>|.*)"
+    r"|(/?)(meta|link|title|h[1-4]|p|article|main|body|figure|figcaption|img|amp-img|span|div|script|style|noscript)"
+    r"(?=[\s/>])([^>]*)>"
+    r"|([A-Za-z][\w:-]*)((?>\s[^<>]*?class\s*=\s*[\"']?[^\"'<>]{0,200}?(?:author|byline))[^<>]*+)>)",
+    re.IGNORECASE | re.DOTALL,
+)
+_MARKER_RE = re.compile(r"author|byline|copyright|credit|photographer|bildrechte|fotocredit", re.IGNORECASE)
+_PLAIN_TAGS = {"span", "div"}  # tokens only for credit tracking; usually nothing to do
+_PROFILE_TAGS = {"div", "article", "main"}  # elements an extraction profile may select as content
+_ATTR_RE = re.compile(r"""([^\s=/>"']+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+_NOISE_END_RE = {
+    tag: re.compile(rf"</{tag}\s*>", re.IGNORECASE) for tag in ("script", "style", "noscript")
+}
+_SECTION_TAGS = ("article", "main", "body")
+_CREDIT_ELEMENT_TAGS = {"span", "p", "div"}
+_CREDIT_CLASS_RE = re.compile(
+    r"copyright|credit|photographer|photo-credit|image-credit|bildrechte|fotocredit",
+    re.IGNORECASE,
+)
+_BYLINE_CLASS_RE = re.compile(r"author|byline", re.IGNORECASE)
+# <img> attributes in order of preference; credit: data-credit/-photographer/-copyright,
+# caption: data-caption/-description, srcset: srcset/data-srcset
+_IMG_SRC_ATTRS = ("src", "data-src", "data-lazy-src", "data-original")
+_IMG_TAGS = {"img", "amp-img"}  # AMP pages use <amp-img> (the <img> fallback sits in <noscript>)
+ADJACENT_CREDIT_WINDOW = 200  # chars of HTML after an <img> searched for a credit element
+_BUDGET_CHECK_TOKENS = 256  # tokens between two out_of_time() calls
+
+
+@dataclass
+class SectionText:
+    start: int  # index into PageScan.chunks
+    end: int | None = None
+    headings: list[str] = field(default_factory=list)
+    paragraphs: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ImageScan:
+    url: str  # the image this tag shows, see ``image_from_attrs``
+    src: str | None = None
+    data_src: str | None = None
+    srcset: str | None = None
+    width: int | None = None
+    height: int | None = None
+    credit: str | None = None  # data-credit / data-photographer / data-copyright
+    caption: str | None = None  # data-caption / data-description
+    adjacent_credit: str | None = None  # credit element within ADJACENT_CREDIT_WINDOW chars after the tag
+
+
+@dataclass
+class FigureScan:
+    img_src: str | None = None
+    caption: str | None = None
+    credit: str | None = None
+
+
+@dataclass
+class PageScan:
+    chunks: list[str] = field(default_factory=list)  # text nodes outside noise, in document order
+    metas: list[dict[str, str]] = field(default_factory=list)
+    canonical: str | None = None
+    amphtml: str | None = None  # href of <link rel="amphtml">
+    title: str | None = None
+    h1: str | None = None
+    byline_texts: list[str] = field(default_factory=list)  # text right after author/byline-class elements
+    sections: dict[str, SectionText] = field(default_factory=dict)
+    images: list[ImageScan] = field(default_factory=list)  # every <img>/<amp-img> outside noise, in document order
+    figures: list[FigureScan] = field(default_factory=list)
+    json_ld: list[str] = field(default_factory=list)  # raw application/ld+json script bodies
+    incomplete: bool = False  # the time budget ran out before the end of the page
+
+    def meta_content(self, attr: str, value: str) -> str | None:
+        for content in self.meta_contents(attr, value):
+            return content
+        return None
+
+    def meta_contents(self, attr: str, value: str) -> list[str]:
+        value = value.lower()
+        return [
+            meta["content"]
+            for meta in self.metas
+            if (meta.get(attr) or "").lower() == value and meta.get("content")
+        ]
+
+    def text(self, start: int, end: int | None = None) -> str:
+        return " ".join(self.chunks[start:end])
+
+
+def _largest_srcset_candidate(srcset: str) -> str | None:
+    """URL with the largest ``w``/``x`` descriptor; the first one if none are given."""
+    best: tuple[float, str] | None = None
+    for candidate in srcset.split(","):
+        parts = candidate.split()
+        if not parts:
+            continue
+        size = 0.0
+        if len(parts) > 1 and parts[1][-1:] in ("w", "x"):
+            try:
+                size = float(parts[1][:-1])
+            except ValueError:
+                pass
+        if best is None or size > best[0]:
+            best = (size, parts[0])
+    return best[1] if best else None
+
+
+def _dimension(value: str | None) -> int | None:
+    try:
+        return int(value.strip().removesuffix("px")) if value else None
+    except ValueError:
+        return None
+
+
+def image_from_attrs(attrs: dict[str, str | None]) -> ImageScan | None:
+    """Record for an ``<img>`` with parsed attributes; None if it names no image.
+
+    The URL is the first of src/data-src/data-lazy-src/data-original that is
+    not a ``data:`` placeholder, else the largest srcset candidate, else the
+    placeholder itself. Both extraction engines use this one rule, so image
+    discovery and metadata always agree on the key.
+    """
+    url = placeholder = None
+    for name in _IMG_SRC_ATTRS:
+        value = attrs.get(name)
+        if value and (value := value.strip()):
+            if not value.startswith("data:"):
+                url = value
+                break
+            placeholder = placeholder or value
+    srcset = (attrs.get("srcset") or attrs.get("data-srcset") or "").strip() or None
+    if url is None:
+        url = (_largest_srcset_candidate(srcset) if srcset else None) or placeholder
+        if url is None:
+            return None
+    return ImageScan(
+        url=url,
+        src=attrs.get("src"),
+        data_src=attrs.get("data-src"),
+        srcset=srcset,
+        width=_dimension(attrs.get("width")),
+        height=_dimension(attrs.get("height")),
+        credit=attrs.get("data-credit") or attrs.get("data-photographer") or attrs.get("data-copyright"),
+        caption=attrs.get("data-caption") or attrs.get("data-description"),
+    )
+
+
+def image_from_tag(raw_attrs: str) -> ImageScan | None:
+    """``image_from_attrs`` for the raw attribute text of an ``<img ...>`` tag."""
+    return image_from_attrs(dict(_parse_attrs(raw_attrs)))
+
+
+def _parse_attrs(raw: str) -> list[tuple[str, str | None]]:
+    attrs: list[tuple[str, str | None]] = []
+    for match in _ATTR_RE.finditer(raw):
+        name, double, single, bare = match.groups()
+        value = double if double is not None else single if single is not None else bare
+        if value is not None and "&" in value:
+            value = unescape(value)
+        attrs.append((name.lower(), value))
+    return attrs
+
+
+class _Scanner:
+    def __init__(
+        self, content_classes: tuple[str, ...] = (), out_of_time: Callable[[], bool] | None = None
+    ) -> None:
+        self.scan = PageScan()
+        self._content_classes = content_classes
+        self._out_of_time = out_of_time
+        # Open profile candidates by class priority: [tag, nesting depth]. Each one collects
+        # into section "profile:<priority>"; close() keeps the best one as "profile".
+        self._profile_open: dict[int, list] = {}
+        self._profile_tags: set[str] = set()
+        self._profile_best: int | None = None
+        self._title_start: int | None = None
+        self._h1_start: int | None = None
+        self._heading: tuple[str, int] | None = None
+        self._paragraph_start: int | None = None
+        self._byline_pending = False
+        self._figure: FigureScan | None = None
+        self._figure_depth = 0
+        self._figcaption_start: int | None = None
+        self._figure_credit_start: int | None = None
+        self._last_img: tuple[ImageScan, int] | None = None  # (image, html chars seen since the tag)
+        self._adjacent_credit_start: int | None = None
+        self.scan.sections["document"] = SectionText(start=0)
+
+    # -- helpers -----------------------------------------------------------
+
+    def _open_sections(self) -> list[SectionText]:
+        return [section for section in self.scan.sections.values() if section.end is None]
+
+    def _advance(self, length: int) -> None:
+        if self._last_img is not None:
+            image, seen = self._last_img
+            seen += length
+            if seen > ADJACENT_CREDIT_WINDOW:
+                self._last_img = None
+                self._adjacent_credit_start = None
+            else:
+                self._last_img = (image, seen)
+
+    def _watching_profile(self) -> bool:
+        """A profile content class is configured and no element with the top-priority class has been seen yet."""
+        return bool(self._content_classes) and self._profile_best != 0
+
+    def _close_paragraph(self) -> None:
+        if self._paragraph_start is None:
+            return
+        text = self.scan.text(self._paragraph_start)
+        self._paragraph_start = None
+        for section in self._open_sections():
+            section.paragraphs.append(text)
+
+    # -- token handlers ----------------------------------------------------
+
+    def feed(self, html: str) -> None:
+        pos = 0
+        length = len(html)
+        limit = html.rfind(">") + 1  # no tag can end after the last ">"
+        search = _TOKEN_RE.search
+        out_of_time = self._out_of_time
+        countdown = _BUDGET_CHECK_TOKENS
+        while pos < length:
+            if out_of_time is not None:
+                countdown -= 1
+                if not countdown:
+                    if out_of_time():
+                        self.scan.incomplete = True
+                        break
+                    countdown = _BUDGET_CHECK_TOKENS
+            match = search(html, pos, limit)
+            end = match.start() if match else length
+            if end > pos:
+                text = html[pos:end]
+                self.handle_data(unescape(text) if "&" in text else text)
+            if match is None:
+                break
+            start, pos = match.span()
+            closing_slash, tag, raw_attrs, marker_tag, marker_attrs = match.groups()
+            if tag is None:
+                if marker_tag is not None:
+                    self.handle_starttag(marker_tag.lower(), _parse_attrs(marker_attrs), pos - start)
+                continue  # comment
+            tag = tag.lower()
+            if tag in _PLAIN_TAGS and tag not in self._profile_tags and (
+                self._figure_credit_start is None and self._adjacent_credit_start is None
+                if closing_slash
+                else not _MARKER_RE.search(raw_attrs) and not self._watching_profile()
+            ):
+                if self._last_img is not None:
+                    self._advance(pos - start)
+                self._byline_pending = False
+                continue
+            if closing_slash:
+                self.handle_endtag(tag, pos - start)
+                continue
+            noise_end = _NOISE_END_RE.get(tag)
+            if noise_end is not None:
+                closing = noise_end.search(html, pos)
+                if tag == "script" and "ld+json" in raw_attrs.lower():
+                    self.scan.json_ld.append(html[pos : closing.start() if closing else length])
+                pos = closing.end() if closing else length
+                continue
+            self.handle_starttag(tag, _parse_attrs(raw_attrs), pos - start)
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]], raw_length: int) -> None:
+        self._advance(raw_length)
+        self._byline_pending = False
+        attr_map = {name: value for name, value in attrs}
+        position = len(self.scan.chunks)
+
+        if tag == "meta":
+            self.scan.metas.append({name: (value or "").strip() for name, value in attrs})
+        elif tag == "link":
+            rel = (attr_map.get("rel") or "").lower()
+            if rel == "canonical" and attr_map.get("href") and self.scan.canonical is None:
+                self.scan.canonical = attr_map["href"]
+            elif rel == "amphtml" and attr_map.get("href") and self.scan.amphtml is None:
+                self.scan.amphtml = attr_map["href"]
+        elif tag == "title":
+            if self.scan.title is None and self._title_start is None:
+                self._title_start = position
+        elif tag == "h1":
+            if self.scan.h1 is None and self._h1_start is None:
+                self._h1_start = position
+        elif tag in ("h2", "h3", "h4"):
+            self._heading = (tag, position)
+        elif tag == "p":
+            self._close_paragraph()
+            self._paragraph_start = position
+        elif tag in _SECTION_TAGS:
+            if tag not in self.scan.sections:
+                self.scan.sections[tag] = SectionText(start=position)
+        elif tag == "figure":
+            if self._figure is None:
+                self._figure = FigureScan()
+                self._figure_depth = 1
+            else:
+                self._figure_depth += 1
+        elif tag == "figcaption":
+            if self._figure is not None and self._figure.caption is None and self._figcaption_start is None:
+                self._figcaption_start = position
+        elif tag in _IMG_TAGS:
+            self._handle_img(attr_map)
+
+        css_class = attr_map.get("class") or ""
+        if tag in self._profile_tags:
+            for candidate in self._profile_open.values():
+                if candidate[0] == tag:
+                    candidate[1] += 1
+        if tag in _PROFILE_TAGS and css_class and self._watching_profile():
+            self._open_profile_candidate(tag, css_class.split(), position)
+        if css_class:
+            if _BYLINE_CLASS_RE.search(css_class):
+                self._byline_pending = True
+            if tag in _CREDIT_ELEMENT_TAGS and _CREDIT_CLASS_RE.search(css_class):
+                if self._figcaption_start is not None and self._figure_credit_start is None and self._figure is not None and self._figure.credit is None:
+                    self._figure_credit_start = position
+                elif self._last_img is not None and self._adjacent_credit_start is None:
+                    self._adjacent_credit_start = position
+
+    def _open_profile_candidate(self, tag: str, classes: list[str], position: int) -> None:
+        # Only a class of higher priority than the best element so far can win.
+        best = len(self._content_classes) if self._profile_best is None else self._profile_best
+        priority = next((index for index, name in enumerate(self._content_classes[:best]) if name in classes), None)
+        if priority is None:
+            return
+        self.scan.sections[f"profile:{priority}"] = SectionText(start=position)
+        self._profile_open[priority] = [tag, 1]
+        self._profile_tags.add(tag)
+        self._profile_best = priority
+
+    def _handle_img(self, attr_map: dict[str, str | None]) -> None:
+        image = image_from_attrs(attr_map)
+        if image is None:
+            return
+        self.scan.images.append(image)
+        if self._figure is not None and self._figure.img_src is None:
+            self._figure.img_src = image.url
+        self._last_img = (image, 0)
+        self._adjacent_credit_start = None
+
+    def handle_endtag(self, tag: str, raw_length: int) -> None:
+        self._advance(raw_length)
+        self._byline_pending = False
+        position = len(self.scan.chunks)
+
+        if tag in self._profile_tags:
+            for priority, candidate in list(self._profile_open.items()):
+                if candidate[0] != tag:
+                    continue
+                candidate[1] -= 1
+                if candidate[1] == 0:
+                    self._close_paragraph()
+                    self.scan.sections[f"profile:{priority}"].end = position
+                    del self._profile_open[priority]
+            self._profile_tags = {candidate[0] for candidate in self._profile_open.values()}
+
+        if tag == "title" and self._title_start is not None:
+            self.scan.title = self.scan.text(self._title_start)
+            self._title_start = None
+        elif tag == "h1" and self._h1_start is not None:
+            self.scan.h1 = self.scan.text(self._h1_start)
+            self._h1_start = None
+        elif self._heading is not None and tag == self._heading[0]:
+            text = self.scan.text(self._heading[1])
+            self._heading = None
+            for section in self._open_sections():
+                section.headings.append(text)
+        elif tag == "p":
+            self._close_paragraph()
+        elif tag in _SECTION_TAGS:
+            section = self.scan.sections.get(tag)
+            if section is not None and section.end is None:
+                self._close_paragraph()
+                section.end = position
+        elif tag == "figcaption" and self._figcaption_start is not None and self._figure is not None:
+            self._figure.caption = self.scan.text(self._figcaption_start)
+            self._figcaption_start = None
+        elif tag == "figure" and self._figure is not None:
+            self._figure_depth -= 1
+            if self._figure_depth == 0:
+                self.scan.figures.append(self._figure)
+                self._figure = None
+                self._figcaption_start = None
+                self._figure_credit_start = None
+
+        if tag in _CREDIT_ELEMENT_TAGS:
+            if self._figure_credit_start is not None and self._figure is not None:
+                self._figure.credit = self.scan.text(self._figure_credit_start)
+                self._figure_credit_start = None
+            if self._adjacent_credit_start is not None and self._last_img is not None:
+                self._last_img[0].adjacent_credit = self.scan.text(self._adjacent_credit_start)
+                self._adjacent_credit_start = None
+                self._last_img = None
+
+    def handle_data(self, data: str) -> None:
+        self._advance(len(data))
+        self.scan.chunks.append(data)
+        if self._byline_pending:
+            self.scan.byline_texts.append(data)
+            self._byline_pending = False
+
+    def close(self) -> None:
+        self._close_paragraph()
+        if self._title_start is not None:
+            self.scan.title = self.scan.text(self._title_start)
+        sections = self.scan.sections
+        candidates = {name: sections.pop(name) for name in [name for name in sections if name.startswith("profile:")]}
+        if self._profile_best is not None:
+            sections["profile"] = candidates[f"profile:{self._profile_best}"]
+
+
+def scan_page(
+    html: str, content_classes: tuple[str, ...] = (), out_of_time: Callable[[], bool] | None = None
+) -> PageScan:
+    """Tokenize ``html`` once and return everything the extractor needs.
+
+    ``content_classes`` (from an extraction profile, in priority order)
+    additionally collects as section ``profile`` the first div/article/main
+    carrying the highest-priority class found on the page.
+    ``out_of_time`` is polled every few hundred tokens; once it returns True
+    the scan stops and the partial result is marked ``incomplete``.
+    """
+    scanner = _Scanner(content_classes, out_of_time)
+    scanner.feed(html)
+    scanner.close()
+    return scanner.scan
@@ -3,6 +3,7 @@
 Full automated flow:
 1. Run RSS ingestion
 2. For each new article:
+   - Skip near-duplicates of already stored articles (see near_duplicates.py)
    - Auto-select primary image
    - Score relevance via GPT
    - < warn threshold: reject (error status) → Telegram rejected summary
@@ -25,6 +26,7 @@ from .publisher import enqueue_publish, run_publisher
 from .repositories import (
     ArticleUpsert,
     get_article_by_id,
+    get_near_duplicate_representative,
     list_articles,
     set_article_image_decision,
     update_article_status,
@@ -47,6 +49,7 @@ class PipelineStats:
     warnings: int = 0
     errors: int = 0
     no_image: int = 0
+    duplicates: int = 0
     rejected_articles: list[dict[str, Any]] = field(default_factory=list)
 
 
@@ -107,7 +110,7 @@ def _store_relevance(article_id: int, relevance: dict[str, Any]) -> None:
         )
 
 
-def _do_rewrite_and_draft(article: dict[str, Any]) -> tuple[int, str | None]:
+def _do_rewrite_and_draft(article: dict[str, Any], refresh: bool = False) -> tuple[int, str | None]:
     """Rewrite article and create WP draft. Returns (wp_post_id, wp_post_url)."""
     article_id = int(article["id"])
     settings = get_settings()
@@ -127,7 +130,7 @@ def _do_rewrite_and_draft(article: dict[str, Any]) -> tuple[int, str | None]:
 
     # Rewrite
     logger.info("_do_rewrite_and_draft #%d: starte OpenAI-Rewrite (%d Roh-Wörter)", article_id, raw_words)
-    rewritten = rewrite_article_text(article)
+    rewritten = rewrite_article_text(article, refresh=refresh)
 
     # ── Quality gate 2: rewritten content length ─────────────────────────────
     rewritten_words = len(rewritten.split())
@@ -142,7 +145,7 @@ def _do_rewrite_and_draft(article: dict[str, Any]) -> tuple[int, str | None]:
     logger.info("_do_rewrite_and_draft #%d: Rewrite fertig (%d Wörter), generiere Tags", article_id, len(rewritten.split()))
     tags: list[str] = []
     try:
-        tags = generate_article_tags(article, rewritten_text=rewritten)
+        tags = generate_article_tags(article, rewritten_text=rewritten, refresh=refresh)
     except Exception:
         pass
     merged_meta = merge_generated_tags(article.get("meta_json"), tags)
@@ -264,6 +267,7 @@ def run_auto_pipeline(trigger: str = "auto") -> dict[str, Any]:
         "rejected": stats.rejected,
         "quality_gate_rejected": stats.quality_gate_rejected,
         "no_image": stats.no_image,
+        "duplicates": stats.duplicates,
         "warnings": stats.warnings,
         "errors": stats.errors,
     }
@@ -277,6 +281,20 @@ def _process_article(article: dict[str, Any], stats: PipelineStats, settings: An
 
     article_id = int(article["id"])
 
+    # Near-duplicates of an already stored article (same press release via
+    # another feed) never reach scoring/rewrite; the representative does.
+    representative_id = get_near_duplicate_representative(article_id)
+    if representative_id is not None:
+        update_article_status(
+            article_id,
+            "error",
+            actor="pipeline",
+            note=f"Near-Duplikat von Artikel #{representative_id}",
+        )
+        stats.duplicates += 1
+        logger.info("Artikel #%d übersprungen: Near-Duplikat von #%d", article_id, representative_id)
+        return
+
     # Auto-select image
     _auto_select_image(article)
 
@@ -410,14 +428,17 @@ def _process_article(article: dict[str, Any], stats: PipelineStats, settings: An
 # Callback actions (called from telegram_bot._handle_callback)
 # ---------------------------------------------------------------------------
 
-def rewrite_and_update_draft(article_id: int) -> None:
-    """Rewrite article and update the existing WP draft."""
+def rewrite_and_update_draft(article_id: int, refresh: bool = False) -> None:
+    """Rewrite article and update the existing WP draft.
+
+    ``refresh=True`` asks OpenAI for a new text instead of the cached one.
+    """
     article = get_article_by_id(article_id)
     if not article:
         raise RuntimeError(f"Artikel #{article_id} nicht gefunden")
     _auto_select_image(article)
     fresh = get_article_by_id(article_id)
-    _do_rewrite_and_draft(fresh)
+    _do_rewrite_and_draft(fresh, refresh=refresh)
 
 
 def discard_article(article_id: int) -> None:
@@ -0,0 +1,177 @@
+"""Per-host politeness limits shared by all outbound fetchers.
+
+Every request to a publisher host (feed fetch, article page, image probe,
+image download, admin image proxy) goes through ``host_slot(url)``, which
+enforces two limits per host:
+
+- a concurrency cap (at most N requests in flight per host)
+- a token bucket (sustained requests per second, with a small burst)
+
+Defaults come from the settings; individual domains can be overridden via
+``FETCH_HOST_OVERRIDES`` (``domain=concurrency/rate_per_second``, comma-separated),
+e.g. ``presseportal.de=1/0.5``. Overrides also match subdomains.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+import threading
+import time
+from typing import Iterator
+from urllib.parse import urlparse
+
+from .config import get_settings
+
+
+@dataclass(frozen=True)
+class HostLimits:
+    max_concurrency: int
+    rate_per_second: float  # <= 0 disables the token bucket
+    burst: int
+
+
+class HostBusyError(TimeoutError):
+    """Raised when a host slot could not be acquired within the wait budget."""
+
+
+class _HostState:
+    def __init__(self, limits: HostLimits) -> None:
+        self.limits = limits
+        self.semaphore = threading.BoundedSemaphore(max(1, limits.max_concurrency))
+        self.capacity = float(max(1, limits.burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds to wait before using it.
+
+        Tokens may go negative, so concurrent callers queue up fairly instead
+        of all waking at the same moment.
+        """
+        rate = self.limits.rate_per_second
+        if rate <= 0:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * rate)
+            self.updated = now
+            self.tokens -= 1.0
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / rate
+
+    def refund(self) -> None:
+        """Give back a reserved token whose request was never sent."""
+        if self.limits.rate_per_second <= 0:
+            return
+        with self.lock:
+            self.tokens = min(self.capacity, self.tokens + 1.0)
+
+
+def _host_of(url: str) -> str:
+    try:
+        return (urlparse(url).hostname or "").lower()
+    except Exception:
+        return ""
+
+
+def parse_host_overrides(raw: str | None) -> dict[str, tuple[int, float]]:
+    """Parse ``domain=concurrency/rate`` pairs. Invalid items are ignored."""
+    overrides: dict[str, tuple[int, float]] = {}
+    for item in (raw or "").split(","):
+        if "=" not in item:
+            continue
+        domain, _, value = item.partition("=")
+        domain = domain.strip().lower().lstrip(".")
+        concurrency_raw, _, rate_raw = value.partition("/")
+        try:
+            concurrency = int(concurrency_raw.strip())
+            rate = float(rate_raw.strip()) if rate_raw.strip() else -1.0
+        except ValueError:
+            continue
+        if domain and concurrency > 0:
+            overrides[domain] = (concurrency, rate)
+    return overrides
+
+
+class HostLimiter:
+    def __init__(
+        self,
+        default: HostLimits,
+        overrides: dict[str, tuple[int, float]] | None = None,
+        max_wait_seconds: float = 30.0,
+    ) -> None:
+        self.default = default
+        self.overrides = overrides or {}
+        self.max_wait_seconds = max_wait_seconds
+        self._hosts: dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def limits_for(self, host: str) -> HostLimits:
+        for domain, (concurrency, rate) in self.overrides.items():
+            if host == domain or host.endswith(f".{domain}"):
+                return HostLimits(
+                    max_concurrency=concurrency,
+                    rate_per_second=rate if rate >= 0 else self.default.rate_per_second,
+                    burst=self.default.burst,
+                )
+        return self.default
+
+    def _state(self, host: str) -> _HostState:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = _HostState(self.limits_for(host))
+                self._hosts[host] = state
+            return state
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        host = _host_of(url)
+        if not host:
+            yield
+            return
+        state = self._state(host)
+        delay = state.reserve()
+        if delay > self.max_wait_seconds:
+            state.refund()
+            raise HostBusyError(f"Rate-Limit fuer {host}: Wartezeit {delay:.1f}s zu lang")
+        if delay > 0:
+            time.sleep(delay)
+        if not state.semaphore.acquire(timeout=max(0.0, self.max_wait_seconds - delay)):
+            state.refund()
+            raise HostBusyError(f"Zu viele parallele Anfragen an {host}")
+        try:
+            yield
+        finally:
+            state.semaphore.release()
+
+
+_limiter: HostLimiter | None = None
+_limiter_settings: object | None = None
+_limiter_lock = threading.Lock()
+
+
+def get_host_limiter() -> HostLimiter:
+    """Process-wide limiter; rebuilt whenever the settings object is replaced."""
+    global _limiter, _limiter_settings
+    settings = get_settings()
+    with _limiter_lock:
+        if _limiter is None or _limiter_settings is not settings:
+            _limiter = HostLimiter(
+                default=HostLimits(
+                    max_concurrency=settings.fetch_host_max_concurrency,
+                    rate_per_second=settings.fetch_host_rate_per_second,
+                    burst=settings.fetch_host_burst,
+                ),
+                overrides=parse_host_overrides(settings.fetch_host_overrides),
+                max_wait_seconds=settings.fetch_host_max_wait_seconds,
+            )
+            _limiter_settings = settings
+        return _limiter
+
+
+def host_slot(url: str):
+    """Context manager guarding one outbound request to ``url``'s host."""
+    return get_host_limiter().slot(url)
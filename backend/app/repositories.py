@@ -3,9 +3,12 @@ from __future__ import annotations
 from dataclasses import dataclass
 import json
 from datetime import datetime, timezone
+import sqlite3
 from typing import Any
 
-from .db import get_conn, rows_to_dicts
+from .db import get_conn, rows_to_dicts, use_conn
+
+_RESOLVE = object()
 
 
 @dataclass(frozen=True)
@@ -84,6 +87,7 @@ class ArticleUpsert:
     word_count: int
     status: str
     meta_json: str | None
+    entry_fingerprint: str | None = None
 
 
 @dataclass(frozen=True)
@@ -181,11 +185,15 @@ def list_feeds() -> list[dict[str, Any]]:
         rows = conn.execute(
             """
             SELECT f.id, f.name, f.url, f.source_id, f.is_enabled, f.etag, f.last_modified, f.last_checked_at,
+                   f.poll_interval_minutes, f.next_poll_at, f.new_entries_per_day, f.last_new_entry_at, f.content_hash,
                    f.created_at, f.updated_at, s.name AS source_name, s.license_name AS source_license_name,
                    s.terms_url AS source_terms_url, s.risk_level AS source_risk_level, s.base_url AS source_base_url,
-                   s.last_reviewed_at AS source_last_reviewed_at, s.is_enabled AS source_is_enabled
+                   s.last_reviewed_at AS source_last_reviewed_at, s.is_enabled AS source_is_enabled,
+                   cb.state AS circuit_state, cb.failure_count AS circuit_failure_count,
+                   cb.open_until AS circuit_open_until, cb.last_error AS circuit_last_error
             FROM feeds f
             LEFT JOIN sources s ON s.id = f.source_id
+            LEFT JOIN circuit_breakers cb ON cb.scope = 'feed' AND cb.key = CAST(f.id AS TEXT)
             ORDER BY f.id DESC
             """
         ).fetchall()
@@ -197,6 +205,7 @@ def list_enabled_feeds() -> list[dict[str, Any]]:
         rows = conn.execute(
             """
             SELECT f.id, f.name, f.url, f.source_id, f.is_enabled, f.etag, f.last_modified, f.last_checked_at,
+                   f.poll_interval_minutes, f.next_poll_at, f.new_entries_per_day, f.last_new_entry_at, f.content_hash,
                    s.name AS source_name, s.license_name AS source_license_name, s.terms_url AS source_terms_url,
                    s.risk_level AS source_risk_level, s.base_url AS source_base_url,
                    s.last_reviewed_at AS source_last_reviewed_at, s.is_enabled AS source_is_enabled
@@ -209,11 +218,32 @@ def list_enabled_feeds() -> list[dict[str, Any]]:
     return rows_to_dicts(rows)
 
 
+def list_due_feeds() -> list[dict[str, Any]]:
+    """Enabled feeds whose adaptive schedule says they should be polled now."""
+    with get_conn() as conn:
+        rows = conn.execute(
+            """
+            SELECT f.id, f.name, f.url, f.source_id, f.is_enabled, f.etag, f.last_modified, f.last_checked_at,
+                   f.poll_interval_minutes, f.next_poll_at, f.new_entries_per_day, f.last_new_entry_at, f.content_hash,
+                   s.name AS source_name, s.license_name AS source_license_name, s.terms_url AS source_terms_url,
+                   s.risk_level AS source_risk_level, s.base_url AS source_base_url,
+                   s.last_reviewed_at AS source_last_reviewed_at, s.is_enabled AS source_is_enabled
+            FROM feeds f
+            LEFT JOIN sources s ON s.id = f.source_id
+            WHERE f.is_enabled = 1
+              AND (f.next_poll_at IS NULL OR f.next_poll_at <= datetime('now'))
+            ORDER BY f.id ASC
+            """
+        ).fetchall()
+    return rows_to_dicts(rows)
+
+
 def get_feed_by_id(feed_id: int) -> dict[str, Any] | None:
     with get_conn() as conn:
         row = conn.execute(
             """
             SELECT f.id, f.name, f.url, f.source_id, f.is_enabled, f.etag, f.last_modified, f.last_checked_at,
+                   f.poll_interval_minutes, f.next_poll_at, f.new_entries_per_day, f.last_new_entry_at, f.content_hash,
                    s.name AS source_name, s.license_name AS source_license_name, s.terms_url AS source_terms_url,
                    s.risk_level AS source_risk_level, s.base_url AS source_base_url,
                    s.last_reviewed_at AS source_last_reviewed_at, s.is_enabled AS source_is_enabled
@@ -251,18 +281,183 @@ def delete_feed(feed_id: int) -> bool:
     return cur.rowcount > 0
 
 
-def update_feed_fetch_state(feed_id: int, etag: str | None, last_modified: str | None) -> None:
-    with get_conn() as conn:
+def update_feed_fetch_state(
+    feed_id: int,
+    etag: str | None,
+    last_modified: str | None,
+    content_hash: str | None = None,
+    *,
+    conn: sqlite3.Connection | None = None,
+) -> None:
+    with use_conn(conn) as conn:
         conn.execute(
             """
             UPDATE feeds
-            SET etag = ?, last_modified = ?, last_checked_at = datetime('now')
+            SET etag = ?, last_modified = ?, last_checked_at = datetime('now'),
+                content_hash = COALESCE(?, content_hash)
             WHERE id = ?
             """,
-            (etag, last_modified, feed_id),
+            (etag, last_modified, content_hash, feed_id),
         )
 
 
+def update_feed_poll_schedule(
+    feed_id: int,
+    *,
+    poll_interval_minutes: int,
+    new_entries_per_day: float | None,
+    had_new_entries: bool,
+    conn: sqlite3.Connection | None = None,
+) -> None:
+    with use_conn(conn) as conn:
+        conn.execute(
+            """
+            UPDATE feeds
+            SET poll_interval_minutes = ?,
+                next_poll_at = datetime('now', ?),
+                new_entries_per_day = ?,
+                last_new_entry_at = CASE WHEN ? THEN datetime('now') ELSE last_new_entry_at END
+            WHERE id = ?
+            """,
+            (
+                poll_interval_minutes,
+                f"+{int(poll_interval_minutes)} minutes",
+                round(new_entries_per_day, 3) if new_entries_per_day is not None else None,
+                1 if had_new_entries else 0,
+                feed_id,
+            ),
+        )
+
+
+def list_circuit_breakers(scope: str | None = None, tripped_only: bool = False) -> list[dict[str, Any]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    if scope:
+        clauses.append("scope = ?")
+        params.append(scope)
+    if tripped_only:
+        clauses.append("state != 'closed'")
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    with get_conn() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT scope, key, state, failure_count, open_until, last_error, last_failure_at, updated_at
+            FROM circuit_breakers
+            {where}
+            ORDER BY scope, open_until DESC, key
+            """,
+            params,
+        ).fetchall()
+    return rows_to_dicts(rows)
+
+
+def store_circuit_breakers(rows: list[dict[str, Any]], *, conn: sqlite3.Connection | None = None) -> None:
+    if not rows:
+        return
+    with use_conn(conn) as conn:
+        conn.executemany(
+            """
+            INSERT INTO circuit_breakers (scope, key, state, failure_count, open_until, last_error, last_failure_at, updated_at)
+            VALUES (:scope, :key, :state, :failure_count, :open_until, :last_error, :last_failure_at, datetime('now'))
+            ON CONFLICT(scope, key) DO UPDATE SET
+                state = excluded.state,
+                failure_count = excluded.failure_count,
+                open_until = excluded.open_until,
+                last_error = excluded.last_error,
+                last_failure_at = excluded.last_failure_at,
+                updated_at = excluded.updated_at
+            """,
+            rows,
+        )
+
+
+def list_light_variants(state: str | None = None) -> list[dict[str, Any]]:
+    where = "WHERE state = ?" if state else ""
+    with get_conn() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT host, rule, state, trials, matches, full_bytes, light_bytes, last_error, updated_at
+            FROM light_variants
+            {where}
+            ORDER BY state, host
+            """,
+            [state] if state else [],
+        ).fetchall()
+    return rows_to_dicts(rows)
+
+
+def store_light_variants(rows: list[dict[str, Any]], *, conn: sqlite3.Connection | None = None) -> None:
+    if not rows:
+        return
+    with use_conn(conn) as conn:
+        conn.executemany(
+            """
+            INSERT INTO light_variants (host, rule, state, trials, matches, full_bytes, light_bytes, last_error, updated_at)
+            VALUES (:host, :rule, :state, :trials, :matches, :full_bytes, :light_bytes, :last_error, COALESCE(:updated_at, datetime('now')))
+            ON CONFLICT(host) DO UPDATE SET
+                rule = excluded.rule,
+                state = excluded.state,
+                trials = excluded.trials,
+                matches = excluded.matches,
+                full_bytes = excluded.full_bytes,
+                light_bytes = excluded.light_bytes,
+                last_error = excluded.last_error,
+                updated_at = excluded.updated_at
+            """,
+            rows,
+        )
+
+
+def get_llm_response(model: str, prompt_version: str, temperature: float, input_hash: str) -> str | None:
+    """Stored response for the key, counting the hit; None if there is none."""
+    key = (model, prompt_version, temperature, input_hash)
+    with get_conn() as conn:
+        row = conn.execute(
+            """
+            SELECT response FROM llm_responses
+            WHERE model = ? AND prompt_version = ? AND temperature = ? AND input_hash = ?
+            """,
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            """
+            UPDATE llm_responses SET hit_count = hit_count + 1, last_hit_at = datetime('now')
+            WHERE model = ? AND prompt_version = ? AND temperature = ? AND input_hash = ?
+            """,
+            key,
+        )
+    return str(row["response"])
+
+
+def store_llm_response(model: str, prompt_version: str, temperature: float, input_hash: str, response: str) -> None:
+    with get_conn() as conn:
+        conn.execute(
+            """
+            INSERT INTO llm_responses (model, prompt_version, temperature, input_hash, response)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(model, prompt_version, temperature, input_hash) DO UPDATE SET
+                response = excluded.response,
+                created_at = datetime('now')
+            """,
+            (model, prompt_version, temperature, input_hash, response),
+        )
+
+
+def list_llm_response_stats() -> list[dict[str, Any]]:
+    with get_conn() as conn:
+        rows = conn.execute(
+            """
+            SELECT model, prompt_version, COUNT(*) AS entries, SUM(hit_count) AS hits, MAX(last_hit_at) AS last_hit_at
+            FROM llm_responses
+            GROUP BY model, prompt_version
+            ORDER BY model, prompt_version
+            """
+        ).fetchall()
+    return rows_to_dicts(rows)
+
+
 def create_run(payload: RunCreate) -> int:
     with get_conn() as conn:
         cur = conn.execute(
@@ -284,6 +479,32 @@ def finish_run(run_id: int, status: str, details: str | None = None) -> None:
         )
 
 
+def update_run_progress(
+    run_id: int,
+    details: str,
+    *,
+    status: str = "running",
+    conn: sqlite3.Connection | None = None,
+) -> None:
+    """Store intermediate run details (progress/checkpoint) without finishing the run."""
+    with use_conn(conn) as conn:
+        conn.execute("UPDATE runs SET status = ?, details = ? WHERE id = ?", (status, details, run_id))
+
+
+def claim_run_for_resume(run_id: int, run_type: str) -> bool:
+    """Atomically set a stopped run back to ``running``; False if it is running, finished or unknown."""
+    with get_conn() as conn:
+        cur = conn.execute(
+            """
+            UPDATE runs
+            SET status = 'running', finished_at = NULL
+            WHERE id = ? AND run_type = ? AND status NOT IN ('running', 'success')
+            """,
+            (run_id, run_type),
+        )
+        return cur.rowcount == 1
+
+
 def list_runs(limit: int = 50) -> list[dict[str, Any]]:
     safe_limit = max(1, min(limit, 500))
     with get_conn() as conn:
@@ -312,8 +533,8 @@ def get_run_by_id(run_id: int) -> dict[str, Any] | None:
     return dict(row) if row else None
 
 
-def get_article_by_id(article_id: int) -> dict[str, Any] | None:
-    with get_conn() as conn:
+def get_article_by_id(article_id: int, *, conn: sqlite3.Connection | None = None) -> dict[str, Any] | None:
+    with use_conn(conn) as conn:
         row = conn.execute(
             """
             SELECT a.id, a.feed_id, a.source_article_id, a.source_hash, a.title, a.source_url, a.canonical_url, a.published_at, a.author,
@@ -331,6 +552,23 @@ def get_article_by_id(article_id: int) -> dict[str, Any] | None:
     return dict(row) if row else None
 
 
+def list_article_ids_for_replay(feed_id: int | None = None, limit: int = 500) -> list[int]:
+    """Newest non-closed articles (optionally of one feed) for offline re-extraction."""
+    safe_limit = max(1, min(limit, 5000))
+    with get_conn() as conn:
+        if feed_id is not None:
+            rows = conn.execute(
+                "SELECT id FROM articles WHERE feed_id = ? AND status != 'error' ORDER BY id DESC LIMIT ?",
+                (feed_id, safe_limit),
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT id FROM articles WHERE status != 'error' ORDER BY id DESC LIMIT ?",
+                (safe_limit,),
+            ).fetchall()
+    return [int(row["id"]) for row in rows]
+
+
 def _merge_review_event(meta_json: str | None, event: dict[str, Any]) -> str:
     meta: dict[str, Any] = {}
     if meta_json:
@@ -603,8 +841,110 @@ def mark_article_publish_result(
         )
 
 
-def _resolve_existing_article_id(payload: ArticleUpsert) -> int | None:
+def get_image_probe_results(urls: list[str], max_age_hours: int) -> dict[str, int]:
+    """Return cached HEAD status codes for ``urls`` that are younger than the TTL."""
+    if not urls:
+        return {}
+    placeholders = ", ".join("?" for _ in urls)
+    with get_conn() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT url, status_code FROM image_probe_cache
+            WHERE url IN ({placeholders}) AND checked_at >= datetime('now', ?)
+            """,
+            [*urls, f"-{max(0, max_age_hours)} hours"],
+        ).fetchall()
+    return {row["url"]: int(row["status_code"]) for row in rows}
+
+
+def store_image_probe_results(results: dict[str, int], *, conn: sqlite3.Connection | None = None) -> None:
+    if not results:
+        return
+    with use_conn(conn) as conn:
+        conn.executemany(
+            """
+            INSERT INTO image_probe_cache (url, status_code, checked_at)
+            VALUES (?, ?, datetime('now'))
+            ON CONFLICT(url) DO UPDATE SET status_code = excluded.status_code, checked_at = excluded.checked_at
+            """,
+            list(results.items()),
+        )
+
+
+def find_minhash_candidates(
+    band_keys: list[int],
+    *,
+    exclude_article_id: int | None = None,
+    conn: sqlite3.Connection | None = None,
+) -> list[dict[str, Any]]:
+    """Articles sharing at least one MinHash LSH band with the given keys."""
+    if not band_keys:
+        return []
+    placeholders = ", ".join("?" for _ in band_keys)
+    with use_conn(conn) as conn:
+        rows = conn.execute(
+            f"""
+            SELECT DISTINCT s.article_id, s.signature, s.cluster_id
+            FROM article_minhash_bands b
+            JOIN article_minhash s ON s.article_id = b.article_id
+            WHERE b.band_key IN ({placeholders}) AND s.article_id != ?
+            """,
+            [*band_keys, exclude_article_id if exclude_article_id is not None else -1],
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def store_article_minhash(
+    article_id: int,
+    *,
+    signature: bytes,
+    cluster_id: int,
+    similarity: float,
+    band_keys: list[int],
+    conn: sqlite3.Connection | None = None,
+) -> None:
+    with use_conn(conn) as conn:
+        conn.execute(
+            """
+            INSERT INTO article_minhash (article_id, signature, cluster_id, similarity)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(article_id) DO UPDATE SET
+                signature = excluded.signature,
+                cluster_id = excluded.cluster_id,
+                similarity = excluded.similarity
+            """,
+            (article_id, signature, cluster_id, similarity),
+        )
+        conn.execute("DELETE FROM article_minhash_bands WHERE article_id = ?", (article_id,))
+        conn.executemany(
+            "INSERT OR IGNORE INTO article_minhash_bands (band_key, article_id) VALUES (?, ?)",
+            [(key, article_id) for key in band_keys],
+        )
+
+
+def has_article_minhash(article_id: int, *, conn: sqlite3.Connection | None = None) -> bool:
+    with use_conn(conn) as conn:
+        row = conn.execute("SELECT 1 FROM article_minhash WHERE article_id = ?", (article_id,)).fetchone()
+    return row is not None
+
+
+def get_near_duplicate_representative(article_id: int) -> int | None:
+    """Id of the cluster representative if ``article_id`` is a near-duplicate of another stored article."""
     with get_conn() as conn:
+        row = conn.execute(
+            """
+            SELECT s.cluster_id
+            FROM article_minhash s
+            JOIN articles a ON a.id = s.cluster_id
+            WHERE s.article_id = ? AND s.cluster_id != s.article_id
+            """,
+            (article_id,),
+        ).fetchone()
+    return int(row["cluster_id"]) if row else None
+
+
+def _resolve_existing_article_id(payload: ArticleUpsert, conn: sqlite3.Connection | None = None) -> int | None:
+    with use_conn(conn) as conn:
         # 1) strongest key: source_url
         row = conn.execute(
             "SELECT id FROM articles WHERE source_url = ?",
@@ -634,18 +974,62 @@ def _resolve_existing_article_id(payload: ArticleUpsert) -> int | None:
     return None
 
 
-def find_existing_article_for_upsert(payload: ArticleUpsert) -> dict[str, Any] | None:
-    article_id = _resolve_existing_article_id(payload)
-    if article_id is None:
-        return None
-    return get_article_by_id(article_id)
+def find_article_ingest_state(
+    *,
+    source_url: str,
+    feed_id: int | None,
+    source_article_id: str | None,
+    entry_fingerprint: str | None,
+) -> dict[str, Any] | None:
+    """Cheap pre-extraction lookup: id, owning feed, status and stored entry fingerprint.
+
+    Uses the same key order as the upsert dedupe (source_url -> feed+guid),
+    plus the raw feed-entry fingerprint as last resort.
+    """
+    with get_conn() as conn:
+        row = conn.execute(
+            "SELECT id, feed_id, status, entry_fingerprint FROM articles WHERE source_url = ?",
+            (source_url.strip(),),
+        ).fetchone()
+        if not row and feed_id is not None and source_article_id:
+            row = conn.execute(
+                "SELECT id, feed_id, status, entry_fingerprint FROM articles WHERE feed_id = ? AND source_article_id = ?",
+                (feed_id, source_article_id),
+            ).fetchone()
+        if not row and entry_fingerprint:
+            row = conn.execute(
+                "SELECT id, feed_id, status, entry_fingerprint FROM articles WHERE entry_fingerprint = ? LIMIT 1",
+                (entry_fingerprint,),
+            ).fetchone()
+    return dict(row) if row else None
 
 
-def upsert_article(payload: ArticleUpsert) -> int:
-    existing_id = _resolve_existing_article_id(payload)
-    with get_conn() as conn:
+def find_existing_article_for_upsert(
+    payload: ArticleUpsert, *, conn: sqlite3.Connection | None = None
+) -> dict[str, Any] | None:
+    with use_conn(conn) as conn:
+        article_id = _resolve_existing_article_id(payload, conn)
+        if article_id is None:
+            return None
+        return get_article_by_id(article_id, conn=conn)
+
+
+def upsert_article(
+    payload: ArticleUpsert,
+    *,
+    conn: sqlite3.Connection | None = None,
+    existing_id: Any = _RESOLVE,
+) -> int:
+    """Insert or update an article and return its id.
+
+    Callers that already looked the article up (e.g. the ingestion writer)
+    pass ``existing_id`` (None = insert) to skip the repeated dedupe lookup.
+    """
+    with use_conn(conn) as conn:
+        if existing_id is _RESOLVE:
+            existing_id = _resolve_existing_article_id(payload, conn)
         if existing_id is None:
-            conn.execute(
+            cur = conn.execute(
                 """
                 INSERT INTO articles (
                     feed_id, source_article_id, source_hash, title, source_url, canonical_url, published_at, author,
@@ -653,8 +1037,8 @@ def upsert_article(payload: ArticleUpsert) -> int:
                     source_name_snapshot, source_terms_url_snapshot, source_license_name_snapshot,
                     legal_checked, legal_checked_at, legal_note,
                     wp_post_id, wp_post_url, publish_attempts, publish_last_error, published_to_wp_at,
-                    word_count, status, meta_json
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    word_count, status, meta_json, entry_fingerprint
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     payload.feed_id,
@@ -684,8 +1068,10 @@ def upsert_article(payload: ArticleUpsert) -> int:
                     payload.word_count,
                     payload.status,
                     payload.meta_json,
+                    payload.entry_fingerprint,
                 ),
             )
+            return int(cur.lastrowid)
         else:
             conn.execute(
                 """
@@ -717,7 +1103,8 @@ def upsert_article(payload: ArticleUpsert) -> int:
                     published_to_wp_at = ?,
                     word_count = ?,
                     status = ?,
-                    meta_json = ?
+                    meta_json = ?,
+                    entry_fingerprint = COALESCE(?, entry_fingerprint)
                 WHERE id = ?
                 """,
                 (
@@ -748,13 +1135,11 @@ def upsert_article(payload: ArticleUpsert) -> int:
                     payload.word_count,
                     payload.status,
                     payload.meta_json,
+                    payload.entry_fingerprint,
                     existing_id,
                 ),
             )
-        row = conn.execute("SELECT id FROM articles WHERE source_url = ?", (payload.source_url.strip(),)).fetchone()
-        if row:
-            return int(row["id"])
-    return int(existing_id) if existing_id else 0
+            return int(existing_id)
 
 
 def list_articles_page(
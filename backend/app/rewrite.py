@@ -5,8 +5,15 @@ import re
 from typing import Any
 from urllib.request import Request, urlopen
 
+from . import llm_cache
 from .config import get_settings
 
+# Cache versions of the prompt templates (see llm_cache); bump when a
+# template's meaning changes without its text.
+REWRITE_PROMPT_VERSION = "rewrite-1"
+TAGS_PROMPT_VERSION = "tags-1"
+RELEVANCE_PROMPT_VERSION = "relevance-1"
+
 
 def _sanitize_source_text(text: str) -> str:
     raw = (text or "").strip()
@@ -49,14 +56,37 @@ def _normalize_tags(tags: list[str], max_tags: int = 8) -> list[str]:
     return out
 
 
-def _openai_chat(system: str, user: str, temperature: float = 0.4) -> str:
+def _openai_chat(
+    system: str,
+    user: str,
+    temperature: float = 0.4,
+    *,
+    prompt_version: str | None = None,
+    refresh: bool = False,
+) -> str:
+    """Chat completion; with a ``prompt_version`` answered from the LLM cache if possible.
+
+    ``refresh=True`` skips the cached answer and stores the new one.
+    """
     settings = get_settings()
-    api_key = settings.openai_api_key
+    key = llm_cache.cache_key(settings.openai_model, prompt_version, temperature, system, user) if prompt_version else None
+    if key is not None:
+        cached = llm_cache.lookup(key, refresh=refresh)
+        if cached is not None:
+            return cached
+    content = _openai_request(settings.openai_model, system, user, temperature)
+    if key is not None:
+        llm_cache.store(key, content)
+    return content
+
+
+def _openai_request(model: str, system: str, user: str, temperature: float) -> str:
+    api_key = get_settings().openai_api_key
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY fehlt")
 
     payload = {
-        "model": settings.openai_model,
+        "model": model,
         "temperature": temperature,
         "messages": [
             {"role": "system", "content": system},
@@ -86,7 +116,7 @@ def _openai_chat(system: str, user: str, temperature: float = 0.4) -> str:
     return content.strip()
 
 
-def rewrite_article_text(article: dict[str, Any]) -> str:
+def rewrite_article_text(article: dict[str, Any], refresh: bool = False) -> str:
     source_text = _sanitize_source_text(article.get("content_raw") or "")
     if not source_text:
         source_text = (article.get("summary") or "").strip()
@@ -111,10 +141,14 @@ def rewrite_article_text(article: dict[str, Any]) -> str:
         "Du bist ein deutscher News-Redakteur.",
         prompt,
         temperature=0.4,
+        prompt_version=REWRITE_PROMPT_VERSION,
+        refresh=refresh,
     )
 
 
-def generate_article_tags(article: dict[str, Any], rewritten_text: str | None = None, max_tags: int = 8) -> list[str]:
+def generate_article_tags(
+    article: dict[str, Any], rewritten_text: str | None = None, max_tags: int = 8, refresh: bool = False
+) -> list[str]:
     source_text = rewritten_text or _sanitize_source_text(article.get("content_raw") or "") or (article.get("summary") or "")
     source_text = str(source_text).strip()
     if not source_text:
@@ -131,6 +165,8 @@ def generate_article_tags(article: dict[str, Any], rewritten_text: str | None =
         "Du extrahierst präzise, kurze News-Tags auf Deutsch.",
         prompt,
         temperature=0.2,
+        prompt_version=TAGS_PROMPT_VERSION,
+        refresh=refresh,
     )
     try:
         parsed = json.loads(raw)
@@ -150,11 +186,11 @@ def generate_article_tags(article: dict[str, Any], rewritten_text: str | None =
     return []
 
 
-def score_article_relevance(article: dict[Any, Any]) -> dict[str, Any]:
+def score_article_relevance(article: dict[Any, Any], refresh: bool = False) -> dict[str, Any]:
     """Score article relevance for VanLife/Camping/Outdoor blog (0-100).
 
     Returns {"score": int, "reason": str, "topics": list[str]}.
-    Raises RuntimeError on OpenAI failure.
+    Raises RuntimeError on OpenAI failure. ``refresh=True`` bypasses the LLM cache.
     """
     title = (article.get("title") or "").strip()
     text = _sanitize_source_text(article.get("content_raw") or "")
@@ -175,6 +211,8 @@ def score_article_relevance(article: dict[Any, Any]) -> dict[str, Any]:
         "Du bist ein Redakteur für einen VanLife- und Camping-Blog und bewertest Artikelrelevanz.",
         prompt,
         temperature=0.1,
+        prompt_version=RELEVANCE_PROMPT_VERSION,
+        refresh=refresh,
     )
     try:
         match = re.search(r"\{[\s\S]*\}", raw)
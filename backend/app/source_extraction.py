@@ -1,11 +1,30 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import codecs
+from dataclasses import asdict, dataclass, field, fields, replace
+from functools import lru_cache, partial
 from html import unescape
+import logging
 import re
-from typing import Any
+import time
+from typing import Any, Callable, Iterable, Iterator
 from urllib.parse import urljoin
-from urllib.request import Request, urlopen
+
+import httpx
+
+from .circuit_breaker import CircuitOpenError, host_guard
+from . import dom_scan, extraction_cache, extraction_pool
+from .config import get_settings
+from .extraction_cache import CachedExtraction
+from .html_archive import archive_page
+from .http_client import get_http_client
+from .extraction_profiles import ExtractionProfile, profile_for, record_profile_result
+from .json_ld import JsonLdArticle, parse_json_ld
+from .light_variants import VariantBoard, derive_rule, get_variant_board
+from .page_scan import ADJACENT_CREDIT_WINDOW, FigureScan, ImageScan, PageScan, SectionText, image_from_tag, scan_page
+from .politeness import HostBusyError, host_slot
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT_SECONDS = 10
 DEFAULT_USER_AGENT = "rss-news-bot/1.0 (+https://news.vanityontour.de)"
@@ -22,21 +41,85 @@ class ExtractedArticle:
     press_contact: str | None
     extraction_error: str | None = None
     image_metadata: dict[str, dict] = field(default_factory=dict)
+    truncated: str | None = None  # why the download stopped early: max_bytes / article_end / body_budget
+    published_at: str | None = None  # JSON-LD datePublished (UTC ISO)
+    profile: str | None = None  # extraction profile whose content element supplied the text
+    budget_exhausted: str | None = None  # stage that ran out of EXTRACTION_TIME_BUDGET_MS: scan / heuristics / regex
+    amp_url: str | None = None  # absolute href of <link rel="amphtml">
+    light_variant_url: str | None = None  # lighter variant (AMP/print) the result was extracted from
+    deferred: bool = False  # not requested: host breaker open or host busy; retry later
+    transient_error: bool = False  # extraction_error may go away: transport error, HTTP 5xx/429, deferred
+
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
 
 
 def _clean_text(raw: str | None) -> str | None:
     if not raw:
         return None
     text = unescape(raw)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
+    # Nothing after the last ">" can be a tag; without the cut, a long tail of
+    # stray "<" would be rescanned to the end for every one of them.
+    tags_end = text.rfind(">") + 1
+    if tags_end:
+        text = _TAG_RE.sub(" ", text[:tags_end]) + text[tags_end:]
+    text = _WHITESPACE_RE.sub(" ", text).strip()
     return text or None
 
 
+def _tag_re(pattern: str) -> re.Pattern[str]:
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def _elements(html: str, opening: re.Pattern[str], closing: re.Pattern[str]) -> Iterator[tuple[int, int, int, int]]:
+    """Spans ``(start, inner_start, inner_end, end)`` that ``finditer`` over
+    ``opening([\\s\\S]*?)closing`` would yield, in linear time.
+
+    Once a closing tag is missing no later element can close either, so the
+    search stops instead of rescanning the rest of a malformed page for every
+    further opening tag.
+    """
+    pos = 0
+    while (open_match := opening.search(html, pos)) is not None:
+        close_match = closing.search(html, open_match.end())
+        if close_match is None:
+            return
+        yield open_match.start(), open_match.end(), close_match.start(), close_match.end()
+        pos = close_match.end()
+
+
+def _inner_html(html: str, opening: re.Pattern[str], closing: re.Pattern[str]) -> Iterator[str]:
+    for _, inner_start, inner_end, _ in _elements(html, opening, closing):
+        yield html[inner_start:inner_end]
+
+
+def _first_inner_html(html: str, opening: re.Pattern[str], closing: re.Pattern[str]) -> str | None:
+    return next(_inner_html(html, opening, closing), None)
+
+
+_NOISE_TAGS = tuple((_tag_re(rf"<{tag}"), _tag_re(rf"</{tag}>")) for tag in ("script", "style", "noscript"))
+_TITLE_TAGS = (_tag_re(r"<title[^>]*>"), _tag_re(r"</title>"))
+_H1_TAGS = (_tag_re(r"<h1[^>]*>"), _tag_re(r"</h1>"))
+_SECTION_TAGS = tuple((_tag_re(rf"<{tag}[^>]*>"), _tag_re(rf"</{tag}>")) for tag in ("article", "main", "body"))
+_HEADING_TAGS = (_tag_re(r"<h[2-4][^>]*>"), _tag_re(r"</h[2-4]>"))
+_PARAGRAPH_TAGS = (_tag_re(r"<p[^>]*>"), _tag_re(r"</p>"))
+_FIGURE_TAGS = (_tag_re(r"<figure[^>]*>"), _tag_re(r"</figure>"))
+_FIGCAPTION_TAGS = (_tag_re(r"<figcaption[^>]*>"), _tag_re(r"</figcaption>"))
+_JSON_LD_TAGS = (_tag_re(r"<script[^>]+application/ld\+json[^>]*>"), _tag_re(r"</script>"))
+
+
 def _strip_noise(html: str) -> str:
-    html = re.sub(r"<script[\s\S]*?</script>", " ", html, flags=re.IGNORECASE)
-    html = re.sub(r"<style[\s\S]*?</style>", " ", html, flags=re.IGNORECASE)
-    html = re.sub(r"<noscript[\s\S]*?</noscript>", " ", html, flags=re.IGNORECASE)
+    for opening, closing in _NOISE_TAGS:
+        parts: list[str] = []
+        pos = 0
+        for start, _, _, end in _elements(html, opening, closing):
+            parts.append(html[pos:start])
+            parts.append(" ")
+            pos = end
+        if parts:
+            parts.append(html[pos:])
+            html = "".join(parts)
     return html
 
 
@@ -65,21 +148,15 @@ def _extract_title(html: str) -> str | None:
     if title:
         return title
 
-    match = re.search(r"<title[^>]*>([\s\S]*?)</title>", html, re.IGNORECASE)
-    if match:
-        cleaned = _clean_text(match.group(1))
-        if cleaned:
-            return cleaned
+    cleaned = _clean_text(_first_inner_html(html, *_TITLE_TAGS))
+    if cleaned:
+        return cleaned
+    return _clean_text(_first_inner_html(html, *_H1_TAGS))
 
-    match = re.search(r"<h1[^>]*>([\s\S]*?)</h1>", html, re.IGNORECASE)
-    if match:
-        return _clean_text(match.group(1))
-    return None
 
-
-def _extract_canonical(html: str) -> str | None:
+def _extract_link(html: str, rel: str) -> str | None:
     match = re.search(
-        r"<link[^>]+rel\s*=\s*[\"']canonical[\"'][^>]*href\s*=\s*[\"']([^\"']+)[\"'][^>]*>",
+        rf"<link[^>]+rel\s*=\s*[\"']{rel}[\"'][^>]*href\s*=\s*[\"']([^\"']+)[\"'][^>]*>",
         html,
         re.IGNORECASE,
     )
@@ -87,7 +164,7 @@ def _extract_canonical(html: str) -> str | None:
         return _clean_text(match.group(1))
 
     match = re.search(
-        r"<link[^>]+href\s*=\s*[\"']([^\"']+)[\"'][^>]*rel\s*=\s*[\"']canonical[\"'][^>]*>",
+        rf"<link[^>]+href\s*=\s*[\"']([^\"']+)[\"'][^>]*rel\s*=\s*[\"']{rel}[\"'][^>]*>",
         html,
         re.IGNORECASE,
     )
@@ -96,11 +173,21 @@ def _extract_canonical(html: str) -> str | None:
     return None
 
 
+def _extract_canonical(html: str) -> str | None:
+    return _extract_link(html, "canonical")
+
+
+_AUTHOR_METAS = (("name", "author"), ("property", "article:author"), ("property", "og:article:author"))
+
+
+def _extract_meta_author(html: str) -> str | None:
+    return next((author for attr, value in _AUTHOR_METAS if (author := _meta_content(html, attr, value))), None)
+
+
 def _extract_author(html: str) -> str | None:
-    for attr, value in (("name", "author"), ("property", "article:author"), ("property", "og:article:author")):
-        author = _meta_content(html, attr, value)
-        if author:
-            return author
+    author = _extract_meta_author(html)
+    if author:
+        return author
 
     for pattern in (
         r"(?:Von|Autor(?:in)?)\s*[:\-]\s*([^<\n\r]{3,120})",
@@ -114,55 +201,37 @@ def _extract_author(html: str) -> str | None:
     return None
 
 
-def _extract_images(html: str, page_url: str) -> list[str]:
-    images: list[str] = []
-    seen: set[str] = set()
+_META_IMAGE_RES = tuple(
+    re.compile(
+        rf"<meta[^>]+property\s*=\s*[\"']{re.escape(prop)}[\"'][^>]*content\s*=\s*[\"']([^\"']+)[\"'][^>]*>",
+        re.IGNORECASE,
+    )
+    for prop in ("og:image", "twitter:image")
+)
 
-    for prop in ("og:image", "twitter:image"):
-        pattern = re.compile(
-            rf"<meta[^>]+property\s*=\s*[\"']{re.escape(prop)}[\"'][^>]*content\s*=\s*[\"']([^\"']+)[\"'][^>]*>",
-            re.IGNORECASE,
-        )
-        for match in pattern.finditer(html):
-            src = match.group(1).strip()
-            abs_src = urljoin(page_url, src)
-            if abs_src not in seen:
-                seen.add(abs_src)
-                images.append(abs_src)
-
-    for match in re.finditer(r"<img[^>]+src\s*=\s*[\"']([^\"']+)[\"'][^>]*>", html, re.IGNORECASE):
-        src = match.group(1).strip()
-        abs_src = urljoin(page_url, src)
-        if abs_src not in seen:
-            seen.add(abs_src)
-            images.append(abs_src)
 
-    return images
+def _extract_meta_images(html: str) -> list[str]:
+    return [match.group(1) for pattern in _META_IMAGE_RES for match in pattern.finditer(html)]
 
 
 def _extract_content_text(html: str) -> str | None:
     section = None
-    for pattern in (
-        r"<article[^>]*>([\s\S]*?)</article>",
-        r"<main[^>]*>([\s\S]*?)</main>",
-        r"<body[^>]*>([\s\S]*?)</body>",
-    ):
-        match = re.search(pattern, html, re.IGNORECASE)
-        if match:
-            section = match.group(1)
+    for opening, closing in _SECTION_TAGS:
+        section = _first_inner_html(html, opening, closing)
+        if section is not None:
             break
 
     if not section:
         section = html
 
     paragraphs = []
-    for match in re.finditer(r"<h[2-4][^>]*>([\s\S]*?)</h[2-4]>", section, re.IGNORECASE):
-        text = _clean_text(match.group(1))
-        if text and re.search(r"\b(pressekontakt|press contact|kontakt|agentur)\b", text, re.IGNORECASE):
+    for heading in _inner_html(section, *_HEADING_TAGS):
+        text = _clean_text(heading)
+        if text and _CONTACT_HEADING_RE.search(text):
             paragraphs.append(text)
 
-    for match in re.finditer(r"<p[^>]*>([\s\S]*?)</p>", section, re.IGNORECASE):
-        text = _clean_text(match.group(1))
+    for paragraph in _inner_html(section, *_PARAGRAPH_TAGS):
+        text = _clean_text(paragraph)
         if text and len(text) > 2:
             paragraphs.append(text)
 
@@ -198,11 +267,15 @@ def _extract_press_contact(content_text: str | None) -> str | None:
     return None
 
 
-# CSS class keywords that indicate a copyright/credit element inside a figcaption
+# CSS class keywords that indicate a copyright/credit element (in a figcaption or right after an <img>)
 _CREDIT_CLASS_RE = re.compile(
     r"class\s*=\s*[\"'][^\"']*(?:copyright|credit|photographer|photo-credit|image-credit|bildrechte|fotocredit)[^\"']*[\"']",
     re.IGNORECASE,
 )
+_CREDIT_ELEMENT_RE = re.compile(
+    r"<(?:span|p|div)[^>]*" + _CREDIT_CLASS_RE.pattern + r"[^>]*>([\s\S]*?)</(?:span|p|div)>",
+    re.IGNORECASE,
+)
 
 # Inline text patterns that signal a credit/copyright notice
 _CREDIT_TEXT_RE = re.compile(
@@ -210,225 +283,632 @@ _CREDIT_TEXT_RE = re.compile(
     re.IGNORECASE,
 )
 
-# data-* attribute names that carry credit/caption information directly on <img>
-_IMG_DATA_CREDIT_ATTRS = ("data-credit", "data-photographer", "data-copyright")
-_IMG_DATA_CAPTION_ATTRS = ("data-caption", "data-description")
+_IMG_TAG_RE = re.compile(r"<(?:amp-)?img([^>]*)>", re.IGNORECASE)
 
-# Class keywords for adjacent sibling credit spans/divs after an <img>
-_ADJ_CREDIT_CLASS_RE = re.compile(
-    r"class\s*=\s*[\"'][^\"']*(?:copyright|credit|photographer|photo-credit|image-credit|bildrechte|fotocredit)[^\"']*[\"']",
-    re.IGNORECASE,
-)
 
+def _extract_image_tags(html: str) -> list[ImageScan]:
+    """Every ``<img>`` with its adjacent credit element – one pass feeds discovery and metadata."""
+    images: list[ImageScan] = []
+    for match in _IMG_TAG_RE.finditer(html):
+        image = image_from_tag(match.group(1))
+        if image is None:
+            continue
+        credit_match = _CREDIT_ELEMENT_RE.search(html, match.end(), match.end() + ADJACENT_CREDIT_WINDOW)
+        if credit_match:
+            image.adjacent_credit = credit_match.group(1)
+        images.append(image)
+    return images
+
+
+def _extract_figures(html: str) -> list[FigureScan]:
+    figures: list[FigureScan] = []
+    for fig_html in _inner_html(html, *_FIGURE_TAGS):
+        img_match = _IMG_TAG_RE.search(fig_html)
+        image = image_from_tag(img_match.group(1)) if img_match else None
+        figcaption = _first_inner_html(fig_html, *_FIGCAPTION_TAGS) if image is not None else None
+        if image is None or figcaption is None:
+            continue
+        credit_match = _CREDIT_ELEMENT_RE.search(figcaption)
+        figures.append(
+            FigureScan(
+                img_src=image.url,
+                caption=unescape(figcaption),
+                credit=credit_match.group(1) if credit_match else None,
+            )
+        )
+    return figures
 
-def _extract_image_metadata(html: str, page_url: str) -> dict[str, dict]:
-    """Return a mapping of absolute image URL → {"caption": ..., "credit": ...}.
 
-    Uses three progressive strategies:
-      1. <figure> with <img> + <figcaption>
-      2. data-* attributes on <img> tags not already covered
-      3. <img> tags whose immediately following HTML contains a credit element
+def _image_urls(meta_images: list[str], images: list[ImageScan], resolve: Callable[[str], str]) -> list[str]:
+    """og:image/twitter:image first, then every ``<img>`` in document order; absolute and unique."""
+    urls: list[str] = []
+    seen: set[str] = set()
+    for src in meta_images + [image.url for image in images]:
+        abs_src = resolve(src.strip())
+        if abs_src not in seen:
+            seen.add(abs_src)
+            urls.append(abs_src)
+    return urls
+
+
+def _metadata_entry(raw_caption: str | None, raw_credit: str | None) -> dict[str, Any]:
+    entry: dict[str, Any] = {}
+    caption = _clean_text(raw_caption)
+    credit = _clean_text(raw_credit)
+    if caption:
+        entry["caption"] = caption
+    if credit:
+        entry["credit"] = credit
+    return entry
+
+
+def _image_metadata(
+    figures: list[FigureScan], images: list[ImageScan], resolve: Callable[[str], str]
+) -> dict[str, dict]:
+    """Return a mapping of absolute image URL → {"caption", "credit", "width", "height"}.
+
+    Precedence per image: ``<figure>`` caption/credit, then data-* attributes
+    on the ``<img>``, then a credit element right after it. The ``<img>``
+    width/height are added to the entries found. Both engines feed this from
+    a single walk over their image tags.
     """
     result: dict[str, dict] = {}
 
-    try:
-        # ------------------------------------------------------------------
-        # Strategy 1: <figure> blocks containing <img> and <figcaption>
-        # ------------------------------------------------------------------
-        for fig_match in re.finditer(r"<figure[^>]*>([\s\S]*?)</figure>", html, re.IGNORECASE):
-            fig_html = fig_match.group(1)
-
-            # Locate image src (src or lazy-loaded data-src)
-            img_match = re.search(
-                r"<img[^>]+(?:src|data-src)\s*=\s*[\"']([^\"']+)[\"'][^>]*>",
-                fig_html,
-                re.IGNORECASE,
-            )
-            if not img_match:
-                continue
-            img_src = urljoin(page_url, img_match.group(1).strip())
-
-            # Locate figcaption
-            figcap_match = re.search(
-                r"<figcaption[^>]*>([\s\S]*?)</figcaption>",
-                fig_html,
-                re.IGNORECASE,
-            )
-            if not figcap_match:
-                continue
-            figcap_html = figcap_match.group(1)
-
-            # --- Extract credit ---
-            credit: str | None = None
-
-            # Try credit via class attribute on an inner element
-            credit_elem_match = re.search(
-                r"<(?:span|p|div)[^>]*"
-                + _CREDIT_CLASS_RE.pattern
-                + r"[^>]*>([\s\S]*?)</(?:span|p|div)>",
-                figcap_html,
-                re.IGNORECASE,
-            )
-            if credit_elem_match:
-                credit = _clean_text(credit_elem_match.group(1))
-
-            # Fallback: scan plain text of figcaption for credit patterns
-            if not credit:
-                figcap_text = unescape(re.sub(r"<[^>]+>", " ", figcap_html))
-                cred_text_match = _CREDIT_TEXT_RE.search(figcap_text)
-                if cred_text_match:
-                    credit = _clean_text(cred_text_match.group(1))
-
-            # --- Extract caption (full figcaption text) ---
-            caption = _clean_text(figcap_html)
-
-            # Only store entries that carry at least one piece of metadata
-            if caption or credit:
-                entry: dict[str, str] = {}
-                if caption:
-                    entry["caption"] = caption
-                if credit:
-                    entry["credit"] = credit
-                result[img_src] = entry
-
-        # ------------------------------------------------------------------
-        # Strategy 2: data-* attributes on <img> tags
-        # ------------------------------------------------------------------
-        for img_match in re.finditer(r"<img([^>]+)>", html, re.IGNORECASE):
-            img_attrs = img_match.group(1)
-
-            # Resolve image URL (prefer src over data-src)
-            src_match = re.search(r'(?:^|\s)src\s*=\s*["\']([^"\']+)["\']', img_attrs, re.IGNORECASE)
-            if not src_match:
-                src_match = re.search(r'data-src\s*=\s*["\']([^"\']+)["\']', img_attrs, re.IGNORECASE)
-            if not src_match:
-                continue
-            img_src = urljoin(page_url, src_match.group(1).strip())
-
-            # Skip images already handled by Strategy 1
-            if img_src in result:
-                continue
-
-            credit: str | None = None
-            caption: str | None = None
-
-            for attr in _IMG_DATA_CREDIT_ATTRS:
-                attr_match = re.search(
-                    rf'{re.escape(attr)}\s*=\s*["\']([^"\']+)["\']',
-                    img_attrs,
-                    re.IGNORECASE,
-                )
-                if attr_match:
-                    credit = _clean_text(attr_match.group(1))
-                    break
+    for figure in figures:
+        if not figure.img_src or figure.caption is None:
+            continue
+        credit = figure.credit
+        if not _clean_text(credit):
+            cred_text_match = _CREDIT_TEXT_RE.search(re.sub(r"<[^>]+>", " ", figure.caption))
+            credit = cred_text_match.group(1) if cred_text_match else None
+        entry = _metadata_entry(figure.caption, credit)
+        if entry:
+            result[resolve(figure.img_src)] = entry
+
+    adjacent_only: set[str] = set()
+    for image in images:
+        img_src = resolve(image.url)
+        entry = _metadata_entry(image.caption, image.credit)
+        if entry and (img_src not in result or img_src in adjacent_only):
+            result[img_src] = entry
+            adjacent_only.discard(img_src)
+        elif img_src not in result:
+            credit = _clean_text(image.adjacent_credit)
+            if credit:
+                result[img_src] = {"credit": credit}
+                adjacent_only.add(img_src)
+        if img_src in result:
+            for key, value in (("width", image.width), ("height", image.height)):
+                if value:
+                    result[img_src].setdefault(key, value)
 
-            for attr in _IMG_DATA_CAPTION_ATTRS:
-                attr_match = re.search(
-                    rf'{re.escape(attr)}\s*=\s*["\']([^"\']+)["\']',
-                    img_attrs,
-                    re.IGNORECASE,
-                )
-                if attr_match:
-                    caption = _clean_text(attr_match.group(1))
-                    break
+    return result
 
-            if caption or credit:
-                entry = {}
-                if caption:
-                    entry["caption"] = caption
-                if credit:
-                    entry["credit"] = credit
-                result[img_src] = entry
-
-        # ------------------------------------------------------------------
-        # Strategy 3: <img> followed within 200 chars by a credit element
-        # ------------------------------------------------------------------
-        for img_match in re.finditer(r"<img([^>]+)>", html, re.IGNORECASE):
-            img_attrs = img_match.group(1)
-
-            src_match = re.search(r'(?:^|\s)src\s*=\s*["\']([^"\']+)["\']', img_attrs, re.IGNORECASE)
-            if not src_match:
-                src_match = re.search(r'data-src\s*=\s*["\']([^"\']+)["\']', img_attrs, re.IGNORECASE)
-            if not src_match:
-                continue
-            img_src = urljoin(page_url, src_match.group(1).strip())
-
-            # Skip images already handled by earlier strategies
-            if img_src in result:
-                continue
-
-            # Look at the 200 characters of HTML immediately after the img tag
-            after_start = img_match.end()
-            after_html = html[after_start : after_start + 200]
-
-            adj_match = re.search(
-                r"<(?:span|p|div)[^>]*"
-                + _ADJ_CREDIT_CLASS_RE.pattern
-                + r"[^>]*>([\s\S]*?)</(?:span|p|div)>",
-                after_html,
-                re.IGNORECASE,
-            )
-            if adj_match:
-                credit = _clean_text(adj_match.group(1))
-                if credit:
-                    result[img_src] = {"credit": credit}
 
+def _extract_image_metadata(html: str, images: list[ImageScan], resolve: Callable[[str], str]) -> dict[str, dict]:
+    try:
+        return _image_metadata(_extract_figures(html), images, resolve)
     except Exception:
         return {}
 
-    return result
+
+_ARTICLE_END_RE = re.compile(rb"</article\s*>", re.IGNORECASE)
+_BODY_START_RE = re.compile(rb"<body[\s>]", re.IGNORECASE)
+_MARKER_OVERLAP = 16  # bytes re-scanned per chunk so markers split across chunks are found
+
+
+@dataclass(frozen=True)
+class _PageLimits:
+    max_bytes: int
+    stop_after_article: bool
+    body_budget: int
+
+
+def _page_limits() -> _PageLimits:
+    settings = get_settings()
+    return _PageLimits(
+        max_bytes=max(0, settings.extraction_max_page_bytes),
+        stop_after_article=settings.extraction_stop_after_article,
+        body_budget=max(0, settings.extraction_body_budget_bytes),
+    )
+
+
+def _read_bounded(chunks: Iterable[bytes], limits: _PageLimits) -> tuple[bytes, str | None]:
+    """Collect the response body until it is complete or a limit is hit.
+
+    Returns the bytes read and the reason for stopping early (``None`` if the
+    whole body was read).
+    """
+    buf = bytearray()
+    body_start: int | None = None
+    for chunk in chunks:
+        scan_from = max(0, len(buf) - _MARKER_OVERLAP)
+        buf.extend(chunk)
+        # A body of exactly max_bytes is complete; only a byte past the limit means truncation.
+        if limits.max_bytes and len(buf) > limits.max_bytes:
+            del buf[limits.max_bytes :]
+            return bytes(buf), "max_bytes"
+        if limits.stop_after_article and _ARTICLE_END_RE.search(buf, scan_from):
+            return bytes(buf), "article_end"
+        if limits.body_budget:
+            if body_start is None:
+                match = _BODY_START_RE.search(buf, scan_from)
+                if match:
+                    body_start = match.start()
+            if body_start is not None and len(buf) - body_start >= limits.body_budget:
+                del buf[body_start + limits.body_budget :]
+                return bytes(buf), "body_budget"
+    return bytes(buf), None
+
+
+@dataclass(frozen=True)
+class _FetchedPage:
+    raw: bytes
+    charset: str | None
+    truncated: str | None
+    etag: str | None
+    last_modified: str | None
+    not_modified: bool = False
+
+
+def _fetch_page(url: str, timeout_seconds: int, cached: CachedExtraction | None = None) -> _FetchedPage:
+    """Stream ``url`` within the configured byte limits.
+
+    With a ``cached`` entry the request is conditional; a 304 comes back as
+    ``not_modified`` with an empty body.
+    """
+    limits = _page_limits()
+    headers = {
+        "User-Agent": DEFAULT_USER_AGENT,
+        "Accept-Language": "de-DE,de;q=0.9,en;q=0.8",
+    }
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached and cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+    with host_guard(url), host_slot(url):
+        with get_http_client().stream("GET", url, headers=headers, timeout=timeout_seconds) as resp:
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            if resp.status_code == 304 and cached is not None:
+                return _FetchedPage(b"", None, None, etag, last_modified, not_modified=True)
+            resp.raise_for_status()
+            raw, truncated = _read_bounded(resp.iter_bytes(), limits)
+            charset = resp.charset_encoding
+    return _FetchedPage(raw, charset, truncated, etag, last_modified)
+
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+_CHARSET_SNIFF_BYTES = 4096
+# Browsers decode these labels as windows-1252 (WHATWG encoding standard).
+_CP1252_LABELS = {"ascii", "iso8859-1"}
+
+
+def _codec_name(label: str | bytes | None) -> str | None:
+    if not label:
+        return None
+    if isinstance(label, bytes):
+        label = label.decode("ascii", errors="ignore")
+    try:
+        info = codecs.lookup(label.strip())
+    except LookupError:
+        return None
+    # "hex", "base64", "rot13" & co. are bytes/str transforms, not charsets.
+    if not getattr(info, "_is_text_encoding", True):
+        return None
+    return "cp1252" if info.name in _CP1252_LABELS else info.name
+
+
+def sniff_charset(raw: bytes, declared: str | None) -> str | None:
+    """Charset by precedence BOM > HTTP header > ``<meta charset>``; None if unknown."""
+    for bom, encoding in _BOMS:
+        if raw.startswith(bom):
+            return encoding
+    codec = _codec_name(declared)
+    if codec:
+        return codec
+    match = _META_CHARSET_RE.search(raw, 0, _CHARSET_SNIFF_BYTES)
+    return _codec_name(match.group(1)) if match else None
+
+
+def decode_page(raw: bytes, charset: str | None) -> str:
+    encoding = sniff_charset(raw, charset)
+    if encoding:
+        return raw.decode(encoding, errors="replace")
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        # A byte cap can cut the last multi-byte sequence; that is still UTF-8.
+        if exc.start >= len(raw) - 3:
+            return raw.decode("utf-8", errors="replace")
+        return raw.decode("cp1252", errors="replace")
+
+
+def _failed_extraction(error: str, transient: bool = False) -> ExtractedArticle:
+    return ExtractedArticle(
+        title=None,
+        author=None,
+        canonical_url=None,
+        summary=None,
+        content_text=None,
+        images=[],
+        press_contact=None,
+        extraction_error=error,
+        transient_error=transient,
+    )
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Worth fetching again next poll? 403/404/410 & co. and broken pages are not."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status >= 500 or status in (408, 425, 429)
+    return isinstance(exc, (httpx.TransportError, TimeoutError))
 
 
 def extract_article(url: str, timeout_seconds: int = DEFAULT_TIMEOUT_SECONDS) -> ExtractedArticle:
+    cached = extraction_cache.lookup(url)
+    variants = get_variant_board() if get_settings().light_variants_enabled else None
+    light_url = variants.preferred_url(url) if variants is not None else None
+    if light_url:
+        extracted = _extract_light_variant(url, light_url, timeout_seconds, cached)
+        if extracted is not None:
+            return extracted
+
+    # The cache entry of a variant carries the variant's validators.
+    full_cached = cached if cached is None or not cached.result.get("light_variant_url") else None
     try:
-        req = Request(
-            url=url,
-            headers={
-                "User-Agent": DEFAULT_USER_AGENT,
-                "Accept-Language": "de-DE,de;q=0.9,en;q=0.8",
-            },
-        )
-        with urlopen(req, timeout=timeout_seconds) as resp:
-            raw = resp.read()
-            charset = resp.headers.get_content_charset() or "utf-8"
-        html = raw.decode(charset, errors="replace")
+        page = _fetch_page(url, timeout_seconds, full_cached)
+        if page.not_modified and full_cached is not None:
+            extraction_cache.touch(url)
+            return _extracted_from_dict(full_cached.result)
+    except (CircuitOpenError, HostBusyError) as exc:
+        return replace(_failed_extraction(str(exc), transient=True), deferred=True)
     except Exception as exc:
-        return ExtractedArticle(
-            title=None,
-            author=None,
-            canonical_url=None,
-            summary=None,
-            content_text=None,
-            images=[],
-            press_contact=None,
-            extraction_error=str(exc),
-        )
+        return _failed_extraction(str(exc), transient=_is_transient(exc))
+
+    archive_page(url, page.raw, page.charset)
+    extracted = extract_page(page.raw, page.charset, url)
+    if page.truncated:
+        extracted = replace(extracted, truncated=page.truncated)
+    extraction_cache.store(url, asdict(extracted), page.etag or None, page.last_modified or None)
+    if variants is not None and not extracted.extraction_error:
+        _trial_light_variant(variants, url, extracted, len(page.raw), timeout_seconds)
+    return extracted
+
+
+def _extract_light_variant(
+    url: str, light_url: str, timeout_seconds: int, cached: CachedExtraction | None
+) -> ExtractedArticle | None:
+    """Extraction from the preferred variant of ``url``; None to fall back to the full page.
+
+    The result keeps the identity of ``url``: it is cached and archived
+    under ``url``, and its canonical URL is the variant's canonical link
+    (which points at the full page) or ``url`` itself.
+    """
+    variants = get_variant_board()
+    light_cached = cached if cached is not None and cached.result.get("light_variant_url") == light_url else None
+    try:
+        page = _fetch_page(light_url, timeout_seconds, light_cached)
+        if page.not_modified and light_cached is not None:
+            extraction_cache.touch(url)
+            return _extracted_from_dict(light_cached.result)
+    except (CircuitOpenError, HostBusyError):
+        return None  # says nothing about the variant; the full fetch is deferred the same way
+    except Exception as exc:
+        variants.record_failure(url, str(exc))
+        return None
 
-    html = _strip_noise(html)
-    title = _extract_title(html)
-    author = _extract_author(html)
-    canonical_url = _extract_canonical(html)
-    summary = _meta_content(html, "name", "description")
-    content_text = _extract_content_text(html)
-    if not summary and content_text:
-        summary = _clean_text(content_text[:320])
-    images = _extract_images(html, url)
-    press_contact = _extract_press_contact(content_text)
-    image_metadata = _extract_image_metadata(html, url)
+    extracted = extract_page(page.raw, page.charset, light_url)
+    if extracted.extraction_error or not extracted.content_text:
+        variants.record_failure(url, extracted.extraction_error or "Variante ohne Inhalt")
+        return None
+    canonical = extracted.canonical_url if extracted.canonical_url and extracted.canonical_url != light_url else url
+    extracted = replace(extracted, canonical_url=canonical, light_variant_url=light_url, truncated=page.truncated)
+    archive_page(url, page.raw, page.charset)
+    extraction_cache.store(url, asdict(extracted), page.etag or None, page.last_modified or None)
+    return extracted
+
+
+def _trial_light_variant(variants: VariantBoard, url: str, full: ExtractedArticle, full_bytes: int, timeout_seconds: int) -> None:
+    """Fetch the candidate variant next to the full page while its host is learning."""
+    profile = profile_for(url)
+    rule = (profile.light_variant if profile else None) or (derive_rule(url, full.amp_url) if full.amp_url else None)
+    light_url = variants.trial_url(url, rule) if rule else None
+    if not light_url:
+        return
+    try:
+        page = _fetch_page(light_url, timeout_seconds)
+    except (CircuitOpenError, HostBusyError):
+        return
+    except Exception as exc:
+        variants.record_trial(url, rule, False, full_bytes, 0, f"Abruf fehlgeschlagen: {exc}")
+        return
+    light = extract_page(page.raw, page.charset, light_url)
+    reason = _variant_mismatch(full, light)
+    variants.record_trial(url, rule, reason is None, full_bytes, len(page.raw), reason)
+
+
+def _words(text: str | None) -> set[str]:
+    return set(re.findall(r"\w+", (text or "").lower()))
+
+
+def _variant_mismatch(full: ExtractedArticle, light: ExtractedArticle) -> str | None:
+    """Why ``light`` is no substitute for ``full``; None if it is equivalent."""
+    if light.extraction_error:
+        return f"Extraktion fehlgeschlagen: {light.extraction_error}"
+    if _words(full.title) != _words(light.title):
+        return "Titel weicht ab"
+    full_words = _words(full.content_text)
+    if full_words and len(full_words & _words(light.content_text)) < _VARIANT_MIN_TEXT_SHARE * len(full_words):
+        return "Text unvollstaendig"
+    if full.images and not light.images:
+        return "Keine Bilder"
+    if full.press_contact and not light.press_contact:
+        return "Pressekontakt fehlt"
+    return None
+
+
+_VARIANT_MIN_TEXT_SHARE = 0.9  # words of the full text a light variant has to contain
+_REGEX_MAX_CHARS = 1_000_000  # the regex fallback only looks at this much of a page
+_BUDGET_MAX_IMAGES = 20  # <img> candidates kept once the time budget is used up
+
+
+class _Budget:
+    """CPU time budget for extracting one document.
+
+    Measured with ``time.thread_time`` so other ingestion workers do not eat
+    into it. Python cannot interrupt a running regex, so the budget is
+    checked between steps (and every few hundred tokens by the scanner); the
+    patterns themselves are kept linear on malformed markup.
+    """
+
+    def __init__(self, milliseconds: int) -> None:
+        self._deadline = time.thread_time() + milliseconds / 1000 if milliseconds > 0 else None
+        self.exhausted_at: str | None = None
+
+    def check(self, stage: str) -> bool:
+        """True once the budget is used up; remembers the stage that noticed first."""
+        if self.exhausted_at is not None:
+            return True
+        if self._deadline is None or time.thread_time() <= self._deadline:
+            return False
+        self.exhausted_at = stage
+        return True
+
+    def pick(self, stage: str, full: Callable[[], Any], cheap: Callable[[], Any]) -> Callable[[], Any]:
+        return lambda: cheap() if self.check(stage) else full()
+
+
+def _extracted_from_dict(data: dict[str, Any]) -> ExtractedArticle:
+    known = {item.name for item in fields(ExtractedArticle)}
+    return ExtractedArticle(**{key: value for key, value in data.items() if key in known})
+
+
+def _assemble(
+    url: str,
+    json_ld: JsonLdArticle | None,
+    *,
+    title: Callable[[], str | None],
+    author: Callable[[], str | None],
+    canonical_url: Callable[[], str | None],
+    description: Callable[[], str | None],
+    content_text: Callable[[], str | None],
+    images: Callable[[], list[str]],
+    image_metadata: Callable[[], dict[str, dict]],
+) -> ExtractedArticle:
+    """Build the result from JSON-LD first; heuristics only run for missing fields."""
+    ld = json_ld or JsonLdArticle()
+    content = ld.content_text or content_text()
+    summary = ld.summary or description()
+    if not summary and content:
+        summary = _clean_text(content[:320])
+
+    merged_images = list(ld.images)
+    for image in images():
+        if image not in merged_images:
+            merged_images.append(image)
+    merged_metadata = image_metadata()
+    for image, entry in ld.image_metadata.items():
+        merged_metadata[image] = {**merged_metadata.get(image, {}), **entry}
 
     return ExtractedArticle(
-        title=title,
-        author=author,
-        canonical_url=canonical_url,
+        title=ld.title or title(),
+        author=ld.author or author(),
+        canonical_url=canonical_url() or ld.canonical_url,
         summary=summary,
-        content_text=content_text,
-        images=images,
-        press_contact=press_contact,
+        content_text=content,
+        images=merged_images,
+        press_contact=_extract_press_contact(content),
         extraction_error=None,
-        image_metadata=image_metadata,
+        image_metadata=merged_metadata,
+        published_at=ld.published_at,
     )
 
 
+def _extract_with_regex(html: str, url: str, budget: _Budget | None = None) -> ExtractedArticle:
+    """Regex engine; fallback for pages the tokenizer cannot handle."""
+    budget = budget or _Budget(0)
+    # Nothing after the last ">" is markup; the cut keeps tag patterns from
+    # rescanning a tag-less tail, the cap bounds the work on gigantic pages.
+    html = html[: min(html.rfind(">") + 1 or len(html), _REGEX_MAX_CHARS)]
+    json_ld = parse_json_ld(_inner_html(html, *_JSON_LD_TAGS), url)
+    html = _strip_noise(html)
+    resolve = lru_cache(maxsize=None)(partial(urljoin, url))
+    image_tags = [] if budget.check("regex") else _extract_image_tags(html)
+    extracted = _assemble(
+        url,
+        json_ld,
+        title=lambda: _extract_title(html),
+        author=budget.pick("regex", lambda: _extract_author(html), lambda: _extract_meta_author(html)),
+        canonical_url=lambda: _extract_canonical(html),
+        description=lambda: _meta_content(html, "name", "description"),
+        content_text=lambda: _extract_content_text(html),
+        images=lambda: _image_urls(_extract_meta_images(html), image_tags, resolve),
+        image_metadata=budget.pick("regex", lambda: _extract_image_metadata(html, image_tags, resolve), dict),
+    )
+    amp_url = _extract_link(html, "amphtml")
+    return replace(extracted, amp_url=resolve(amp_url) if amp_url else None, budget_exhausted=budget.exhausted_at)
+
+
+_BYLINE_TEXT_RE = re.compile(r"(?:Von|Autor(?:in)?)\s*[:\-]\s*([^<\n\r]{3,120})", re.IGNORECASE)
+_CONTACT_HEADING_RE = re.compile(r"\b(pressekontakt|press contact|kontakt|agentur)\b", re.IGNORECASE)
+
+
+def _scan_title(scan: PageScan) -> str | None:
+    return _clean_text(scan.meta_content("property", "og:title")) or _clean_text(scan.title) or _clean_text(scan.h1)
+
+
+def _scan_meta_author(scan: PageScan) -> str | None:
+    return next((author for attr, value in _AUTHOR_METAS if (author := _clean_text(scan.meta_content(attr, value)))), None)
+
+
+def _scan_author(scan: PageScan) -> str | None:
+    author = _scan_meta_author(scan)
+    if author:
+        return author
+
+    for chunk in scan.chunks:
+        match = _BYLINE_TEXT_RE.search(chunk)
+        if match:
+            author = _clean_text(match.group(1))
+            if author:
+                return author
+
+    for text in scan.byline_texts:
+        if len(text) <= 180:
+            author = _clean_text(text)
+            if author:
+                return author
+    return None
+
+
+def _section_paragraphs(section: SectionText) -> str | None:
+    paragraphs = []
+    for heading in section.headings:
+        text = _clean_text(heading)
+        if text and _CONTACT_HEADING_RE.search(text):
+            paragraphs.append(text)
+
+    for paragraph in section.paragraphs:
+        text = _clean_text(paragraph)
+        if text and len(text) > 2:
+            paragraphs.append(text)
+    return "\n".join(paragraphs) if paragraphs else None
+
+
+def _scan_content_text(scan: PageScan) -> str | None:
+    section = next((scan.sections[name] for name in ("article", "main", "body") if name in scan.sections), None)
+    if section is None:
+        section = scan.sections["document"]
+    return _section_paragraphs(section) or _clean_text(scan.text(section.start, section.end))
+
+
+def _profile_content_text(scan: PageScan, profile: ExtractionProfile | None) -> str | None:
+    """Paragraphs of the profile's content element; counts the hit or miss."""
+    if profile is None or not profile.content_classes:
+        return None
+    section = scan.sections.get("profile")
+    content = _section_paragraphs(section) if section is not None else None
+    record_profile_result(profile, "content", hit=content is not None)
+    return content
+
+
+# Page scanners by EXTRACTION_BACKEND name: (available, scan function). The
+# builtin tokenizer needs nothing; the others need their optional package.
+SCANNERS: dict[str, tuple[Callable[[], bool], Callable[..., PageScan]]] = {
+    "builtin": (lambda: True, scan_page),
+    "selectolax": (dom_scan.available, dom_scan.scan_page),
+}
+
+
+@lru_cache(maxsize=None)
+def _scanners(name: str) -> tuple[Callable[..., PageScan], ...]:
+    """The configured scanner followed by the builtin one as fallback."""
+    available, scanner = SCANNERS.get(name, (lambda: False, scan_page))
+    if not available():
+        logger.warning("Extraktions-Backend %r nicht verfuegbar, nutze den eingebauten Tokenizer", name)
+        return (scan_page,)
+    return (scanner,) if scanner is scan_page else (scanner, scan_page)
+
+
+def extract_article_from_html(html: str, url: str, backend: str | None = None) -> ExtractedArticle:
+    """Run the extraction heuristics on an already fetched page (no network).
+
+    The page is scanned once by the ``EXTRACTION_BACKEND`` scanner (default:
+    the builtin tokenizer in ``page_scan``, optionally the C parser in
+    ``dom_scan``); if it fails, the builtin tokenizer is tried next and the
+    regex engine last. Fields supplied by a JSON-LD article object win over
+    the markup heuristics; for domains with an extraction profile the
+    content comes from the profile's element.
+
+    Extraction gets ``EXTRACTION_TIME_BUDGET_MS`` of CPU time per page. When
+    it runs out the scan stops where it is and the remaining heuristics fall
+    back to cheap variants (meta author only, the first images, no image
+    metadata); ``budget_exhausted`` names the stage that ran out.
+    """
+    budget = _Budget(get_settings().extraction_time_budget_ms)
+    profile = profile_for(url)
+    for scanner in _scanners(backend or get_settings().extraction_backend):
+        try:
+            scan = scanner(html, profile.content_classes if profile else (), lambda: budget.check("scan"))
+            break
+        except Exception:
+            continue
+    else:
+        return _extract_with_regex(html, url, budget)
+
+    # Pages repeat the same src across og:image, <img> and figures; join each once.
+    resolve = lru_cache(maxsize=None)(partial(urljoin, url))
+    json_ld = parse_json_ld(scan.json_ld, url)
+    profile_content = None if json_ld and json_ld.content_text else _profile_content_text(scan, profile)
+    meta_images = scan.meta_contents("property", "og:image") + scan.meta_contents("property", "twitter:image")
+    extracted = _assemble(
+        url,
+        json_ld,
+        title=lambda: _scan_title(scan),
+        author=budget.pick("heuristics", lambda: _scan_author(scan), lambda: _scan_meta_author(scan)),
+        canonical_url=lambda: _clean_text(scan.canonical),
+        description=lambda: _clean_text(scan.meta_content("name", "description")),
+        content_text=lambda: profile_content or _scan_content_text(scan),
+        images=budget.pick(
+            "heuristics",
+            lambda: _image_urls(meta_images, scan.images, resolve),
+            lambda: _image_urls(meta_images, scan.images[:_BUDGET_MAX_IMAGES], resolve),
+        ),
+        image_metadata=budget.pick("heuristics", lambda: _image_metadata(scan.figures, scan.images, resolve), dict),
+    )
+    amp_url = _clean_text(scan.amphtml)
+    return replace(
+        extracted,
+        profile=profile.name if profile_content else None,
+        amp_url=resolve(amp_url) if amp_url else None,
+        budget_exhausted=budget.exhausted_at,
+    )
+
+
+def _decode_and_extract(raw: bytes, charset: str | None, url: str) -> ExtractedArticle:
+    return extract_article_from_html(decode_page(raw, charset), url)
+
+
+def extract_page(raw: bytes, charset: str | None, url: str) -> ExtractedArticle:
+    """Decode and extract a fetched page; runs in the extraction process pool if enabled.
+
+    Never raises: a page that cannot be decoded or extracted comes back as a
+    failed extraction, like a failed fetch, so one bad page cannot abort a run.
+    """
+    try:
+        return extraction_pool.run(_decode_and_extract, raw, charset, url)
+    except Exception as exc:
+        logger.warning("Extraktion von %s fehlgeschlagen: %s", url, exc)
+        return _failed_extraction(f"Extraktion fehlgeschlagen: {exc}")
+
+
 def extracted_article_to_meta(article: ExtractedArticle) -> dict[str, Any]:
     return {
         "title": article.title,
@@ -439,4 +919,11 @@ def extracted_article_to_meta(article: ExtractedArticle) -> dict[str, Any]:
         "press_contact": article.press_contact,
         "extraction_error": article.extraction_error,
         "image_metadata": article.image_metadata,
+        "truncated": article.truncated,
+        "published_at": article.published_at,
+        "profile": article.profile,
+        "budget_exhausted": article.budget_exhausted,
+        "amp_url": article.amp_url,
+        "light_variant_url": article.light_variant_url,
+        "transient_error": article.transient_error,
     }
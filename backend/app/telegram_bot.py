@@ -291,6 +291,7 @@ def notify_pipeline_done(stats: dict[str, Any]) -> None:
     rejected = stats.get("rejected", 0)
     quality_gate_rejected = stats.get("quality_gate_rejected", 0)
     no_image = stats.get("no_image", 0)
+    duplicates = stats.get("duplicates", 0)
     warnings = stats.get("warnings", 0)
     errors = stats.get("errors", 0)
 
@@ -306,6 +307,8 @@ def notify_pipeline_done(stats: dict[str, Any]) -> None:
         lines.append(f"✂️ Qualitätsprüfung: {quality_gate_rejected}")
     if no_image:
         lines.append(f"🖼️ Kein Bild: {no_image}")
+    if duplicates:
+        lines.append(f"🔁 Near-Duplikate übersprungen: {duplicates}")
     if warnings:
         lines.append(f"⚠️ Warnungen: {warnings}")
     if errors:
@@ -442,7 +445,7 @@ def _handle_callback(callback_query: dict[str, Any]) -> None:
     if action == "rewrite":
         try:
             logger.info("Rewrite #%d: starte rewrite_and_update_draft", article_id)
-            _pipeline.rewrite_and_update_draft(article_id)
+            _pipeline.rewrite_and_update_draft(article_id, refresh=True)  # "Neu schreiben" wants a new text
             logger.info("Rewrite #%d: abgeschlossen, sende Benachrichtigung", article_id)
             updated = get_article_by_id(article_id)
             if updated:
@@ -10,9 +10,10 @@ import re
 from typing import Any
 from html import unescape as _html_unescape
 from urllib.parse import quote_plus, urlparse
-from urllib.request import Request, urlopen
 
 from .config import get_settings
+from .http_client import get_http_client
+from .politeness import host_slot
 
 
 def _auth_header(username: str, app_password: str) -> str:
@@ -30,19 +31,20 @@ def _wp_request(
 ) -> Any:
     url = f"{base_url.rstrip('/')}/wp-json/wp/v2/{endpoint.lstrip('/')}"
     data = json.dumps(payload).encode("utf-8") if payload is not None else None
-    req = Request(
-        url=url,
-        data=data,
-        method=method,
+    resp = get_http_client().request(
+        method,
+        url,
+        content=data,
         headers={
             "Authorization": auth_header,
             "Content-Type": "application/json; charset=utf-8",
             "Accept": "application/json",
             "User-Agent": "rss-news-publisher/1.0",
         },
+        timeout=20,
     )
-    with urlopen(req, timeout=20) as resp:
-        raw = resp.read().decode("utf-8", errors="replace")
+    resp.raise_for_status()
+    raw = resp.content.decode("utf-8", errors="replace")
     return json.loads(raw) if raw else {}
 
 
@@ -172,10 +174,11 @@ def _download_image_bytes(url: str, referer: str | None = None) -> tuple[bytes,
     }
     if referer:
         headers["Referer"] = referer
-    req = Request(url=url, headers=headers)
-    with urlopen(req, timeout=20) as resp:
-        raw = resp.read()
-        content_type = resp.headers.get("Content-Type", "application/octet-stream")
+    with host_slot(url):
+        resp = get_http_client().get(url, headers=headers, timeout=20)
+        resp.raise_for_status()
+    raw = resp.content
+    content_type = resp.headers.get("Content-Type", "application/octet-stream")
     content_type = content_type.split(";")[0].strip() if content_type else "application/octet-stream"
     if not content_type.lower().startswith("image/"):
         raise RuntimeError(f"Ausgewählte Bild-URL liefert kein Bild ({content_type})")
@@ -238,10 +241,9 @@ def _upload_featured_media(
     filename = _guess_filename(image_url, content_type)
 
     media_url = f"{base_url.rstrip('/')}/wp-json/wp/v2/media"
-    media_req = Request(
-        url=media_url,
-        data=image_bytes,
-        method="POST",
+    resp = get_http_client().post(
+        media_url,
+        content=image_bytes,
         headers={
             "Authorization": auth_header,
             "Content-Type": content_type,
@@ -249,9 +251,10 @@ def _upload_featured_media(
             "Accept": "application/json",
             "User-Agent": "rss-news-publisher/1.0",
         },
+        timeout=30,
     )
-    with urlopen(media_req, timeout=30) as resp:
-        media_raw = resp.read().decode("utf-8", errors="replace")
+    resp.raise_for_status()
+    media_raw = resp.content.decode("utf-8", errors="replace")
     media_payload = json.loads(media_raw) if media_raw else {}
     media_id = int(media_payload.get("id", 0)) if isinstance(media_payload, dict) else 0
     if media_id <= 0:
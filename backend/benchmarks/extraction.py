@@ -0,0 +1,271 @@
+"""Offline benchmark for article extraction.
+
+Runs a stored corpus of anonymized article pages through the extractor and
+reports per-stage timings, p50/p95 latency per page, allocation peaks
+(``tracemalloc``) and field-level accuracy against golden outputs. Nothing
+touches the network, so engines and optimizations can be compared on the
+same input.
+
+Corpus layout (default ``backend/benchmarks/extraction_corpus``): one
+``<name>.html`` with the raw bytes as served plus ``<name>.json``::
+
+    {"url": "...", "charset": null, "expected": {"title": "...", ...}}
+
+``charset`` is the Content-Type charset of the original response (``null``
+= none sent). Only fields listed in ``expected`` are compared. The goldens
+are reviewed outputs of the current engine, known heuristic weaknesses
+included (e.g. the presseportal press contact), so any behavior change shows
+up as a mismatch; after an intended change, review the diff and rewrite them
+with ``--update-goldens``.
+
+Usage::
+
+    python -m backend.benchmarks.extraction [--iterations 20] [--engine scan|regex|selectolax] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import asdict, dataclass, field
+from functools import partial
+import json
+import math
+from pathlib import Path
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from backend.app import dom_scan
+from backend.app.extraction_profiles import profile_for
+from backend.app.json_ld import parse_json_ld
+from backend.app.page_scan import scan_page
+from backend.app.source_extraction import (
+    ExtractedArticle,
+    _extract_with_regex,
+    decode_page,
+    extract_article_from_html,
+)
+
+DEFAULT_CORPUS_DIR = Path(__file__).resolve().parent / "extraction_corpus"
+
+GOLDEN_FIELDS = (
+    "title",
+    "author",
+    "canonical_url",
+    "summary",
+    "content_text",
+    "images",
+    "image_metadata",
+    "press_contact",
+    "published_at",
+    "profile",
+)
+
+ENGINES: dict[str, Callable[[str, str], ExtractedArticle]] = {
+    "scan": partial(extract_article_from_html, backend="builtin"),
+    "regex": _extract_with_regex,
+}
+# Page scanner behind each engine, timed as the tokenize stage.
+SCANNERS: dict[str, Callable[..., Any]] = {"scan": scan_page}
+if dom_scan.available():
+    ENGINES["selectolax"] = partial(extract_article_from_html, backend="selectolax")
+    SCANNERS["selectolax"] = dom_scan.scan_page
+
+# decode + extract make up a page's latency; tokenize and json_ld are measured
+# separately to show where the extract time goes (the scanner engines include them).
+STAGES = ("decode", "tokenize", "json_ld", "extract")
+
+
+@dataclass(frozen=True)
+class CorpusPage:
+    name: str
+    url: str
+    raw: bytes
+    charset: str | None
+    expected: dict[str, Any]
+
+
+@dataclass
+class PageResult:
+    name: str
+    stage_seconds: dict[str, list[float]] = field(default_factory=lambda: {stage: [] for stage in STAGES})
+    peak_bytes: int = 0
+    mismatches: list[str] = field(default_factory=list)
+
+    @property
+    def totals(self) -> list[float]:
+        return [decode + extract for decode, extract in zip(self.stage_seconds["decode"], self.stage_seconds["extract"])]
+
+
+@dataclass
+class BenchmarkReport:
+    engine: str
+    iterations: int
+    pages: list[PageResult]
+    field_hits: dict[str, int]
+    field_totals: dict[str, int]
+
+    def accuracy(self) -> dict[str, float]:
+        return {name: self.field_hits[name] / total for name, total in self.field_totals.items() if total}
+
+    def to_dict(self) -> dict[str, Any]:
+        latencies = [value for page in self.pages for value in page.totals]
+        return {
+            "engine": self.engine,
+            "iterations": self.iterations,
+            "pages": len(self.pages),
+            "latency_ms": {"p50": _ms(percentile(latencies, 0.5)), "p95": _ms(percentile(latencies, 0.95))},
+            "stages_ms": {
+                stage: {
+                    "p50": _ms(percentile(values, 0.5)),
+                    "p95": _ms(percentile(values, 0.95)),
+                }
+                for stage in STAGES
+                if (values := [value for page in self.pages for value in page.stage_seconds[stage]])
+            },
+            "peak_kib": {page.name: round(page.peak_bytes / 1024, 1) for page in self.pages},
+            "accuracy": {name: round(value, 3) for name, value in self.accuracy().items()},
+            "mismatches": [f"{page.name}: {item}" for page in self.pages for item in page.mismatches],
+        }
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile; 0.0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def _short(value: Any, limit: int = 100) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else f"{text[: limit - 3]}..."
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def load_corpus(corpus_dir: Path = DEFAULT_CORPUS_DIR) -> list[CorpusPage]:
+    pages = []
+    for html_path in sorted(corpus_dir.glob("*.html")):
+        golden_path = html_path.with_suffix(".json")
+        golden = json.loads(golden_path.read_text(encoding="utf-8")) if golden_path.exists() else {}
+        pages.append(
+            CorpusPage(
+                name=html_path.stem,
+                url=golden.get("url") or f"https://example.org/{html_path.stem}",
+                raw=html_path.read_bytes(),
+                charset=golden.get("charset"),
+                expected=golden.get("expected") or {},
+            )
+        )
+    return pages
+
+
+def _golden_values(article: ExtractedArticle) -> dict[str, Any]:
+    # JSON round trip so values compare like the stored goldens (lists, str keys).
+    data = json.loads(json.dumps(asdict(article), ensure_ascii=False))
+    return {name: data[name] for name in GOLDEN_FIELDS}
+
+
+def _timed(stage_seconds: dict[str, list[float]], stage: str, func: Callable[[], Any]) -> Any:
+    started = time.perf_counter()
+    result = func()
+    stage_seconds[stage].append(time.perf_counter() - started)
+    return result
+
+
+def run_benchmark(pages: list[CorpusPage], iterations: int = 20, engine: str = "scan") -> BenchmarkReport:
+    extract = ENGINES[engine]
+    results = []
+    field_hits = dict.fromkeys(GOLDEN_FIELDS, 0)
+    field_totals = dict.fromkeys(GOLDEN_FIELDS, 0)
+
+    for page in pages:
+        result = PageResult(page.name)
+        profile = profile_for(page.url)
+        content_classes = profile.content_classes if profile else ()
+        article = None
+        for _ in range(max(1, iterations)):
+            html = _timed(result.stage_seconds, "decode", lambda: decode_page(page.raw, page.charset))
+            if engine in SCANNERS:
+                scan = _timed(result.stage_seconds, "tokenize", lambda: SCANNERS[engine](html, content_classes))
+                _timed(result.stage_seconds, "json_ld", lambda: parse_json_ld(scan.json_ld, page.url))
+            article = _timed(result.stage_seconds, "extract", lambda: extract(html, page.url))
+
+        # Separate pass: tracemalloc slows allocation-heavy code and would skew the timings.
+        tracemalloc.start()
+        try:
+            extract(decode_page(page.raw, page.charset), page.url)
+            result.peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        actual = _golden_values(article)
+        for name in GOLDEN_FIELDS:
+            if name not in page.expected:
+                continue
+            field_totals[name] += 1
+            if actual[name] == page.expected[name]:
+                field_hits[name] += 1
+            else:
+                result.mismatches.append(f"{name}: erwartet {_short(page.expected[name])}, erhalten {_short(actual[name])}")
+        results.append(result)
+
+    return BenchmarkReport(engine, max(1, iterations), results, field_hits, field_totals)
+
+
+def update_goldens(pages: list[CorpusPage], corpus_dir: Path = DEFAULT_CORPUS_DIR, engine: str = "scan") -> None:
+    for page in pages:
+        article = ENGINES[engine](decode_page(page.raw, page.charset), page.url)
+        golden = {"url": page.url, "charset": page.charset, "expected": _golden_values(article)}
+        (corpus_dir / f"{page.name}.json").write_text(json.dumps(golden, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+def format_report(report: BenchmarkReport) -> str:
+    data = report.to_dict()
+    lines = [
+        f"Engine: {data['engine']}  Seiten: {data['pages']}  Durchlaeufe: {data['iterations']}",
+        f"Latenz pro Seite: p50 {data['latency_ms']['p50']} ms, p95 {data['latency_ms']['p95']} ms",
+        "Stufen (ms):",
+    ]
+    for stage, values in data["stages_ms"].items():
+        lines.append(f"  {stage:<9} p50 {values['p50']:>8}  p95 {values['p95']:>8}")
+    lines.append("Speicherspitze (KiB):")
+    for name, peak in data["peak_kib"].items():
+        lines.append(f"  {name:<28} {peak:>8}")
+    lines.append("Genauigkeit:")
+    for name, value in data["accuracy"].items():
+        lines.append(f"  {name:<15} {report.field_hits[name]}/{report.field_totals[name]} ({value:.0%})")
+    if data["mismatches"]:
+        lines.append("Abweichungen:")
+        lines.extend(f"  {item}" for item in data["mismatches"])
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline-Benchmark der Artikel-Extraktion")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS_DIR, help="Verzeichnis mit <name>.html/<name>.json")
+    parser.add_argument("--iterations", type=int, default=20, help="Durchlaeufe pro Seite fuer die Zeitmessung")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="scan")
+    parser.add_argument("--json", action="store_true", help="Bericht als JSON ausgeben")
+    parser.add_argument("--update-goldens", action="store_true", help="Erwartete Werte aus der aktuellen Extraktion neu schreiben")
+    args = parser.parse_args(argv)
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        print(f"Kein Korpus unter {args.corpus} gefunden.", file=sys.stderr)
+        return 2
+    if args.update_goldens:
+        update_goldens(pages, args.corpus, args.engine)
+        print(f"{len(pages)} Golden-Dateien geschrieben.")
+        return 0
+
+    report = run_benchmark(pages, args.iterations, args.engine)
+    print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2) if args.json else format_report(report))
+    return 1 if any(page.mismatches for page in report.pages) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+from backend.app import config as config_module
+from backend.app.circuit_breaker import (
+    SCOPE_FEED,
+    SCOPE_HOST,
+    CircuitBoard,
+    CircuitOpenError,
+    get_circuit_board,
+    host_guard,
+)
+from backend.app.db import init_db
+from backend.app.ingestion import run_ingestion
+from backend.app.repositories import FeedCreate, create_feed, list_circuit_breakers, list_feeds
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.environ["APP_DB_PATH"] = str(Path(self.tmp_dir.name) / "circuit.db")
+        config_module.get_settings.cache_clear()
+        init_db()
+
+    def tearDown(self) -> None:
+        config_module.get_settings.cache_clear()
+        os.environ.pop("APP_DB_PATH", None)
+        self.tmp_dir.cleanup()
+
+    def test_opens_after_threshold_and_probes_once_when_half_open(self) -> None:
+        board = CircuitBoard(failure_threshold=2, open_base_minutes=10, open_max_minutes=60)
+        board.record_failure(SCOPE_HOST, "slow.example", "ReadTimeout")
+        self.assertTrue(board.allow(SCOPE_HOST, "slow.example"))
+        board.record_failure(SCOPE_HOST, "slow.example", "ReadTimeout")
+        self.assertFalse(board.allow(SCOPE_HOST, "slow.example"))
+
+        later = datetime.now(timezone.utc) + timedelta(minutes=11)
+        with patch("backend.app.circuit_breaker._now", return_value=later.replace(microsecond=0)):
+            self.assertTrue(board.allow(SCOPE_HOST, "slow.example"))  # the single half-open probe
+            self.assertFalse(board.allow(SCOPE_HOST, "slow.example"))
+            board.record_failure(SCOPE_HOST, "slow.example", "ReadTimeout")
+            row = board._breakers[(SCOPE_HOST, "slow.example")].as_row()
+        self.assertEqual(row["state"], "open")
+        # Third failure doubles the backoff: 10 -> 20 minutes.
+        self.assertEqual(row["open_until"], (later + timedelta(minutes=20)).strftime("%Y-%m-%d %H:%M:%S"))
+
+        board.record_success(SCOPE_HOST, "slow.example")
+        self.assertTrue(board.allow(SCOPE_HOST, "slow.example"))
+
+    def test_state_is_persisted_and_reloaded(self) -> None:
+        board = get_circuit_board()
+        for _ in range(3):
+            board.record_failure(SCOPE_HOST, "down.example", "ConnectError")
+        board.flush()
+
+        rows = list_circuit_breakers(scope="host", tripped_only=True)
+        self.assertEqual([(r["key"], r["state"], r["failure_count"]) for r in rows], [("down.example", "open", 3)])
+
+        config_module.get_settings.cache_clear()
+        self.assertFalse(get_circuit_board().allow(SCOPE_HOST, "down.example"))
+
+    def test_host_guard_counts_transport_errors_but_not_client_errors(self) -> None:
+        board = get_circuit_board()
+        request = httpx.Request("GET", "https://flaky.example/a")
+        for _ in range(2):
+            with self.assertRaises(httpx.HTTPStatusError):
+                with host_guard("https://flaky.example/a"):
+                    raise httpx.HTTPStatusError("404", request=request, response=httpx.Response(404, request=request))
+        self.assertNotIn((SCOPE_HOST, "flaky.example"), board._breakers)
+
+        for _ in range(3):
+            with self.assertRaises(httpx.ConnectError):
+                with host_guard("https://flaky.example/a"):
+                    raise httpx.ConnectError("refused", request=request)
+        with self.assertRaises(CircuitOpenError):
+            with host_guard("https://flaky.example/b"):
+                pass
+
+    def test_ingestion_skips_feed_with_open_breaker(self) -> None:
+        feed_id = create_feed(FeedCreate(name="Tot", url="https://dead.example/feed.xml", source_id=None, is_enabled=True))
+        board = get_circuit_board()
+        for _ in range(3):
+            board.record_failure(SCOPE_FEED, str(feed_id), "HTTP 503")
+
+        with patch("backend.app.ingestion._download_feed") as mock_download:
+            stats = run_ingestion(feed_id=feed_id)
+
+        self.assertEqual(stats.status, "success")
+        mock_download.assert_not_called()
+        feed = next(f for f in list_feeds() if f["id"] == feed_id)
+        self.assertEqual(feed["circuit_state"], "open")
+        self.assertEqual(feed["circuit_failure_count"], 3)
+        self.assertEqual(feed["circuit_last_error"], "HTTP 503")
+
+    def test_failed_feed_poll_counts_once_and_only_on_feed_breaker(self) -> None:
+        feed_id = create_feed(FeedCreate(name="Kaputt", url="https://shared.example/feed.xml", source_id=None, is_enabled=True))
+        client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+        with patch("backend.app.ingestion.get_http_client", return_value=client) as mock_client, patch(
+            "backend.app.ingestion.time.sleep"
+        ):
+            run_ingestion(feed_id=feed_id)
+            run_ingestion(feed_id=feed_id)
+
+        self.assertEqual(mock_client.call_count, 6)  # every retry went out
+        feed = next(f for f in list_feeds() if f["id"] == feed_id)
+        self.assertEqual(feed["circuit_failure_count"], 2)
+        self.assertEqual(feed["circuit_state"], "closed")
+        self.assertTrue(get_circuit_board().allow(SCOPE_HOST, "shared.example"))
+        self.assertEqual(list_circuit_breakers(scope="host"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from unittest.mock import patch
+
+from backend.benchmarks.extraction import STAGES, load_corpus, percentile, run_benchmark
+
+
+class TestExtractionBenchmark(unittest.TestCase):
+    def test_corpus_matches_goldens_offline(self) -> None:
+        pages = load_corpus()
+        self.assertGreaterEqual(len(pages), 5)
+        self.assertTrue(all(page.expected for page in pages))
+
+        with patch("backend.app.source_extraction.get_http_client", side_effect=AssertionError("Netzwerkzugriff")):
+            report = run_benchmark(pages, iterations=1)
+
+        self.assertEqual([item for page in report.pages for item in page.mismatches], [])
+        self.assertEqual(set(report.accuracy().values()), {1.0})
+        data = report.to_dict()
+        self.assertEqual(set(data["stages_ms"]), set(STAGES))
+        self.assertTrue(all(page.peak_bytes > 0 for page in report.pages))
+
+    def test_regex_engine_reports_field_mismatches(self) -> None:
+        report = run_benchmark(load_corpus(), iterations=1, engine="regex")
+        self.assertLess(report.accuracy()["profile"], 1.0)
+        self.assertNotIn("tokenize", report.to_dict()["stages_ms"])
+        self.assertTrue(any("profile:" in item for page in report.pages for item in page.mismatches))
+
+    def test_percentile_uses_nearest_rank(self) -> None:
+        values = [float(value) for value in range(1, 21)]
+        self.assertEqual(percentile(values, 0.5), 10.0)
+        self.assertEqual(percentile(values, 0.95), 19.0)
+        self.assertEqual(percentile([], 0.95), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
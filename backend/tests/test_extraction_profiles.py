@@ -0,0 +1,88 @@
+import unittest
+
+from backend.app import dom_scan
+from backend.app.extraction_profiles import profile_for, profile_stats, reset_profile_stats
+from backend.app.ingestion import _rank_image_candidates
+from backend.app.page_scan import scan_page
+from backend.app.source_extraction import extract_article_from_html
+
+
+PROMOBIL_HTML = """
+<html><body>
+  <div class="teaser-list"><p>Weitere Artikel: Vergleichstest Kastenwagen</p></div>
+  <div class="article__text">
+    <p>Erster Absatz des Tests.</p>
+    <div class="ad"><p>Anzeige</p></div>
+    <p>Zweiter Absatz des Tests.</p>
+  </div>
+  <p>Newsletter abonnieren</p>
+</body></html>
+"""
+
+
+def _stats(name: str) -> dict:
+    return next(item for item in profile_stats() if item["name"] == name)
+
+
+class TestExtractionProfiles(unittest.TestCase):
+    def setUp(self) -> None:
+        reset_profile_stats()
+
+    def test_profile_lookup_matches_subdomains_only(self) -> None:
+        self.assertEqual(profile_for("https://www.promobil.de/test/1").name, "promobil")
+        self.assertEqual(profile_for("https://presseportal.de/pm/1").name, "presseportal")
+        self.assertIsNone(profile_for("https://notpromobil.de/test/1"))
+        self.assertIsNone(profile_for("not a url"))
+
+    def test_profile_content_element_replaces_generic_cascade(self) -> None:
+        extracted = extract_article_from_html(PROMOBIL_HTML, "https://www.promobil.de/test/1")
+        self.assertEqual(extracted.profile, "promobil")
+        self.assertEqual(extracted.content_text, "Erster Absatz des Tests.\nAnzeige\nZweiter Absatz des Tests.")
+        self.assertEqual((_stats("promobil")["content_hits"], _stats("promobil")["content_misses"]), (1, 0))
+
+        # Redesigned page without the container: generic engine, counted as miss.
+        html = PROMOBIL_HTML.replace("article__text", "story")
+        extracted = extract_article_from_html(html, "https://www.promobil.de/test/2")
+        self.assertIsNone(extracted.profile)
+        self.assertIn("Weitere Artikel", extracted.content_text or "")
+        self.assertEqual(_stats("promobil")["content_misses"], 1)
+
+    def test_content_classes_are_tried_in_priority_order(self) -> None:
+        # A lower-priority container comes first in the page and wraps the preferred one.
+        html = """
+        <html><body>
+          <div class="content-text"><p>Teaser oben.</p>
+            <div class="article-content"><p>Zweite Wahl.</p></div>
+          </div>
+          <div class="article__text"><p>Der eigentliche Artikel.</p></div>
+        </body></html>
+        """
+        classes = profile_for("https://www.promobil.de/test/1").content_classes
+        scanners = [scan_page] + ([dom_scan.scan_page] if dom_scan.available() else [])
+        for scanner in scanners:
+            with self.subTest(scanner=scanner.__module__):
+                self.assertEqual(scanner(html, classes).sections["profile"].paragraphs, ["Der eigentliche Artikel."])
+                fallback = scanner(html.replace("article__text", "story"), classes)
+                self.assertEqual(fallback.sections["profile"].paragraphs, ["Zweite Wahl."])
+                self.assertNotIn("profile", scanner(html, ("missing",)).sections)
+
+    def test_presseportal_image_rules_come_from_profile(self) -> None:
+        ranked = _rank_image_candidates(
+            "https://www.presseportal.de/pm/1/2",
+            "Neuer Kastenwagen",
+            [
+                "https://cache.pressmailing.net/thumbnail/liste/a.jpg",
+                "https://cache.pressmailing.net/thumbnail/story_big/b.jpg",
+            ],
+        )
+        self.assertEqual(ranked[0]["url"], "https://cache.pressmailing.net/thumbnail/story_big/b.jpg")
+        self.assertIn("presseportal-story-big", ranked[0]["reasons"])
+        self.assertIn("presseportal-list", ranked[1]["reasons"])
+        self.assertEqual(_stats("presseportal")["image_hits"], 1)
+
+        ranked = _rank_image_candidates("https://example.org/a", "Titel", ["https://example.org/thumbnail/story_big/b.jpg"])
+        self.assertEqual(ranked[0]["reasons"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from backend.app import config as config_module
+from backend.app.db import init_db
+from backend.app.html_archive import archive_page, load_page, store_page
+from backend.app.ingestion import run_replay
+from backend.app.repositories import ArticleUpsert, get_article_by_id, upsert_article
+
+
+ARTICLE_HTML = """
+<html><head>
+<title>Neuer Titel aus dem Archiv</title>
+<meta property="og:image" content="https://example.org/images/archiv-bild.jpg">
+</head><body><article>
+<p>Dieser Absatz stammt aus der archivierten Seite und ist lang genug, um als Inhalt erkannt zu werden.</p>
+<p>Ein zweiter Absatz mit weiteren Informationen zur Meldung aus dem Archiv.</p>
+</article></body></html>
+"""
+
+
+class TestHtmlArchive(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.environ["APP_DB_PATH"] = str(Path(self.tmp_dir.name) / "archive.db")
+        os.environ["HTML_ARCHIVE_DIR"] = str(Path(self.tmp_dir.name) / "html")
+        os.environ["HTML_ARCHIVE_ENABLED"] = "true"
+        config_module.get_settings.cache_clear()
+        init_db()
+
+    def tearDown(self) -> None:
+        config_module.get_settings.cache_clear()
+        for key in ("APP_DB_PATH", "HTML_ARCHIVE_DIR", "HTML_ARCHIVE_ENABLED"):
+            os.environ.pop(key, None)
+        self.tmp_dir.cleanup()
+
+    def test_store_and_load_round_trip_dedupes_blobs(self) -> None:
+        raw = ARTICLE_HTML.encode("utf-8")
+        first = store_page("https://example.org/a", raw, "utf-8")
+        second = store_page("https://example.org/b", raw, None)
+
+        self.assertEqual(first, second)
+        self.assertEqual(load_page("https://example.org/a"), (raw, "utf-8"))
+        self.assertEqual(load_page("https://example.org/b"), (raw, None))
+        self.assertIsNone(load_page("https://example.org/missing"))
+        blobs = list(Path(os.environ["HTML_ARCHIVE_DIR"]).glob("*/*.html.gz"))
+        self.assertEqual(len(blobs), 1)
+
+    def test_archive_page_is_noop_when_disabled(self) -> None:
+        os.environ["HTML_ARCHIVE_ENABLED"] = "false"
+        config_module.get_settings.cache_clear()
+        archive_page("https://example.org/a", b"<html></html>", None)
+        self.assertIsNone(load_page("https://example.org/a"))
+
+    def test_replay_reextracts_from_archive_without_network(self) -> None:
+        def article(source_url: str, source_hash: str) -> ArticleUpsert:
+            return ArticleUpsert(
+                feed_id=None,
+                source_article_id=None,
+                source_hash=source_hash,
+                title="Alter Titel",
+                source_url=source_url,
+                canonical_url=source_url,
+                published_at=None,
+                author=None,
+                summary="Alt",
+                content_raw="Alt",
+                content_rewritten="<p>Rewrite bleibt</p>",
+                image_urls_json=None,
+                press_contact=None,
+                source_name_snapshot=None,
+                source_terms_url_snapshot=None,
+                source_license_name_snapshot=None,
+                legal_checked=False,
+                legal_checked_at=None,
+                legal_note=None,
+                wp_post_id=None,
+                wp_post_url=None,
+                publish_attempts=0,
+                publish_last_error=None,
+                published_to_wp_at=None,
+                word_count=1,
+                status="review",
+                meta_json='{"generated_tags":["Tag"]}',
+            )
+
+        archived_id = upsert_article(article("https://example.org/archiviert", "hash-1"))
+        missing_id = upsert_article(article("https://example.org/fehlt", "hash-2"))
+        store_page("https://example.org/archiviert", ARTICLE_HTML.encode("utf-8"), "utf-8")
+
+        with patch("backend.app.ingestion._probe_image_status", side_effect=AssertionError("network")), patch(
+            "backend.app.source_extraction.get_http_client", side_effect=AssertionError("network")
+        ):
+            stats = run_replay()
+
+        self.assertEqual(stats.status, "success")
+        self.assertEqual((stats.articles_seen, stats.articles_replayed, stats.missing_archive), (2, 1, 1))
+
+        replayed = get_article_by_id(archived_id)
+        self.assertEqual(replayed["title"], "Neuer Titel aus dem Archiv")
+        self.assertIn("archivierten Seite", replayed["content_raw"])
+        self.assertIn("archiv-bild.jpg", replayed["image_urls_json"])
+        self.assertEqual(replayed["status"], "review")
+        self.assertEqual(replayed["content_rewritten"], "<p>Rewrite bleibt</p>")
+        self.assertIn("generated_tags", replayed["meta_json"])
+        self.assertIn("replayed_at", replayed["meta_json"])
+        self.assertEqual(get_article_by_id(missing_id)["content_raw"], "Alt")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,17 @@
+import json
 import os
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 from unittest.mock import patch
 
+import httpx
+
 from backend.app import config as config_module
 from backend.app.db import init_db
-from backend.app.ingestion import run_ingestion
+from backend.app import ingestion as ingestion_module
+from backend.app.ingestion import iter_ingestion, run_ingestion
 from backend.app.repositories import (
     ArticleUpsert,
     FeedCreate,
@@ -14,11 +19,16 @@ from backend.app.repositories import (
     create_feed,
     create_source,
     get_article_by_id,
+    get_feed_by_id,
+    get_run_by_id,
     list_articles,
+    store_image_probe_results,
     upsert_article,
 )
 from backend.app.source_extraction import ExtractedArticle
 
+_real_download_feed = ingestion_module._download_feed
+
 
 class TestIngestion(unittest.TestCase):
     def setUp(self) -> None:
@@ -27,6 +37,16 @@ class TestIngestion(unittest.TestCase):
         config_module.get_settings.cache_clear()
         init_db()
 
+        # Feed bodies come from the mocked feedparser.parse; the download only echoes the URL.
+        download_patcher = patch(
+            "backend.app.ingestion._download_feed",
+            side_effect=lambda feed: httpx.Response(
+                200, content=feed["url"].encode("utf-8"), request=httpx.Request("GET", feed["url"])
+            ),
+        )
+        self.mock_download = download_patcher.start()
+        self.addCleanup(download_patcher.stop)
+
         source_id = create_source(
             SourceCreate(
                 name="Test Source",
@@ -240,6 +260,582 @@ class TestIngestion(unittest.TestCase):
         self.assertEqual(published_row.get("wp_post_id"), 77)
         self.assertIn("generated_tags", published_row.get("meta_json") or "")
 
+    @patch("backend.app.ingestion.extract_article")
+    @patch("backend.app.ingestion.feedparser.parse")
+    def test_ingestion_parallel_workers_use_single_writer(self, mock_parse, mock_extract_article) -> None:
+        second_feed_id = create_feed(
+            FeedCreate(
+                name="Second Feed",
+                url="https://example.org/feed-2.xml",
+                source_id=None,
+                is_enabled=True,
+            )
+        )
+
+        def fake_parse(content, response_headers=None):
+            slug = "a" if content.decode("utf-8").endswith("feed.xml") else "b"
+            return {
+                "etag": None,
+                "modified": None,
+                "entries": [
+                    {"id": f"{slug}-1", "title": f"{slug} 1", "link": f"https://example.org/{slug}/1", "summary": "x"},
+                    {"id": f"{slug}-2", "title": f"{slug} 2", "link": f"https://example.org/{slug}/2", "summary": "y"},
+                ],
+            }
+
+        mock_parse.side_effect = fake_parse
+        mock_extract_article.return_value = ExtractedArticle(
+            title=None,
+            author=None,
+            canonical_url=None,
+            summary=None,
+            content_text="Volltext",
+            images=[],
+            press_contact=None,
+        )
+
+        writer_threads: set[str] = set()
+        original_upsert = ingestion_module.upsert_article
+
+        def tracking_upsert(payload, **kwargs):
+            writer_threads.add(threading.current_thread().name)
+            return original_upsert(payload, **kwargs)
+
+        with patch("backend.app.ingestion.upsert_article", side_effect=tracking_upsert):
+            stats = run_ingestion(workers=4)
+
+        self.assertEqual(stats.status, "success")
+        self.assertEqual(stats.feeds_processed, 2)
+        self.assertEqual(stats.entries_seen, 4)
+        self.assertEqual(stats.articles_upserted, 4)
+        self.assertEqual(writer_threads, {threading.current_thread().name})
+        feed_ids = {a["feed_id"] for a in list_articles()}
+        self.assertEqual(feed_ids, {self.feed_id, second_feed_id})
+
+    @patch("backend.app.ingestion._probe_image_status", return_value=200)
+    @patch("backend.app.ingestion.extract_article")
+    @patch("backend.app.ingestion.feedparser.parse")
+    def test_run_details_count_pages_over_extraction_budget(self, mock_parse, mock_extract_article, _mock_probe) -> None:
+        def extract(link: str) -> ExtractedArticle:
+            return ExtractedArticle(
+                title="Artikel",
+                author=None,
+                canonical_url=None,
+                summary=None,
+                content_text="Volltext",
+                images=[],
+                press_contact=None,
+                budget_exhausted="scan" if link.endswith("/1") else None,
+            )
+
+        mock_extract_article.side_effect = extract
+        mock_parse.return_value = {
+            "etag": None,
+            "modified": None,
+            "entries": [
+                {"id": f"item-{index}", "title": f"Artikel {index}", "link": f"https://example.org/article/{index}"}
+                for index in (1, 2)
+            ],
+        }
+
+        stats = run_ingestion(feed_id=self.feed_id)
+
+        details = json.loads(get_run_by_id(stats.run_id)["details"])
+        self.assertEqual(details["extraction_budget_exhausted"], 1)
+        self.assertEqual(details["feeds"][0]["extraction_budget_exhausted"], 1)
+        article = next(item for item in list_articles() if item["source_url"].endswith("/1"))
+        self.assertEqual(json.loads(article["meta_json"])["extraction"]["budget_exhausted"], "scan")
+
+    @patch("backend.app.ingestion._probe_image_status", return_value=200)
+    @patch("backend.app.ingestion.extract_article")
+    @patch("backend.app.ingestion.feedparser.parse")
+    def test_ingestion_skips_extraction_for_unchanged_entries(self, mock_parse, mock_extract_article, mock_probe) -> None:
+        mock_extract_article.return_value = ExtractedArticle(
+            title="Artikel",
+            author=None,
+            canonical_url=None,
+            summary=None,
+            content_text="Volltext",
+            images=["https://example.org/a.jpg"],
+            press_contact=None,
+        )
+        entry = {"id": "item-1", "title": "Artikel", "link": "https://example.org/article/1", "summary": "A"}
+        mock_parse.return_value = {"etag": None, "modified": None, "entries": [dict(entry)]}
+
+        run_ingestion(feed_id=self.feed_id)
+        self.assertEqual(mock_extract_article.call_count, 1)
+        probes_after_first_run = mock_probe.call_count
+
+        second = run_ingestion(feed_id=self.feed_id)
+        self.assertEqual(second.entries_seen, 1)
+        self.assertEqual(second.articles_upserted, 0)
+        self.assertEqual(mock_extract_article.call_count, 1)
+        self.assertEqual(mock_probe.call_count, probes_after_first_run)
+        details = json.loads(get_run_by_id(second.run_id)["details"])
+        self.assertEqual(details["entries_unchanged"], 1)
+
+        mock_parse.return_value = {"etag": None, "modified": None, "entries": [dict(entry, summary="A geaendert")]}
+        third = run_ingestion(feed_id=self.feed_id)
+        self.assertEqual(third.articles_upserted, 1)
+        self.assertEqual(mock_extract_article.call_count, 2)
+        self.assertEqual(len(list_articles()), 1)
+
+    def test_select_relevant_images_reuses_cached_probe_results(self) -> None:
+        store_image_probe_results({"https://example.org/img/broken.jpg": 404})
+        probe_log: dict[str, int] = {}
+        with patch("backend.app.ingestion._probe_image_status", return_value=200) as mock_probe:
+            kept, primary, _ = ingestion_module._select_relevant_images(
+                "https://example.org/article/1",
+                "Artikel",
+                ["https://example.org/img/broken.jpg", "https://example.org/img/ok.jpg"],
+                probe_log=probe_log,
+            )
+        self.assertEqual(kept, ["https://example.org/img/ok.jpg"])
+        self.assertEqual(primary, "https://example.org/img/ok.jpg")
+        mock_probe.assert_called_once_with("https://example.org/img/ok.jpg")
+        self.assertEqual(probe_log, {"https://example.org/img/ok.jpg": 200})
+
+    @patch("backend.app.ingestion.extract_article")
+    @patch("backend.app.ingestion.feedparser.parse")
+    def test_due_only_skips_feeds_until_next_poll(self, mock_parse, mock_extract_article) -> None:
+        mock_parse.return_value = {"etag": None, "modified": None, "entries": []}
+
+        first = run_ingestion(due_only=True)
+        self.assertEqual(first.feeds_processed, 1)
+        feed = get_feed_by_id(self.feed_id) or {}
+        # No rate observed on the first poll: the 60 minute default applies.
+        self.assertEqual(feed["poll_interval_minutes"], 60)
+        self.assertIsNotNone(feed["next_poll_at"])
+
+        second = run_ingestion(due_only=True)
+        self.assertEqual(second.feeds_processed, 0)
+        self.assertEqual(mock_parse.call_count, 1)
+
+        # Explicit full runs still poll everything.
+        run_ingestion()
+        self.assertEqual(mock_parse.call_count, 2)
+        # Nothing new since the last check: the rate decays from the 24/day the default stands for.
+        feed = get_feed_by_id(self.feed_id) or {}
+        self.assertAlmostEqual(feed["new_entries_per_day"], 16.8)
+        self.assertEqual(feed["poll_interval_minutes"], 86)
+
+    def test_poll_interval_follows_rate_of_new_articles(self) -> None:
+        self.assertEqual(ingestion_module._next_poll_interval(24.0), 60)
+        self.assertEqual(ingestion_module._next_poll_interval(1000.0), 15)
+        self.assertEqual(ingestion_module._next_poll_interval(0.1), 1440)
+        self.assertEqual(ingestion_module._next_poll_interval(None), 60)
+
+        feed = {"new_entries_per_day": 4.0, "last_checked_at": "2000-01-01 00:00:00"}
+        # Only a failed poll keeps the rate; any successful one decays it.
+        self.assertEqual(ingestion_module._observed_entries_per_day(feed, None), 4.0)
+        self.assertLess(ingestion_module._observed_entries_per_day(feed, 0), 4.0)
+
+    def test_first_quiet_poll_backs_off_gradually(self) -> None:
+        # No rate stored yet (e.g. first poll after the migration): seeded from the current interval.
+        feed = {"new_entries_per_day": None, "poll_interval_minutes": 60, "last_checked_at": "2000-01-01 00:00:00"}
+        rate = ingestion_module._observed_entries_per_day(feed, 0)
+        self.assertAlmostEqual(rate, 16.8)
+        self.assertEqual(ingestion_module._next_poll_interval(rate), 86)
+
+        intervals = []
+        for _ in range(10):
+            feed["new_entries_per_day"] = ingestion_module._observed_entries_per_day(feed, 0)
+            intervals.append(ingestion_module._next_poll_interval(feed["new_entries_per_day"]))
+        self.assertEqual(intervals, sorted(intervals))
+        self.assertLess(intervals[2], 1440)
+        self.assertEqual(intervals[-1], 1440)
+
+    @patch("backend.app.ingestion.extract_article")
+    @patch("backend.app.ingestion.feedparser.parse")
+    def test_edited_entries_do_not_count_as_new(self, mock_parse, mock_extract_article) -> None:
+        mock_extract_article.return_value = ExtractedArticle(
+            title="Artikel",
+            author=None,
+            canonical_url=None,
+            summary=None,
+            content_text="Volltext",
+            images=[],
+            press_contact=None,
+        )
+        entry = {"id": "item-1", "title": "Artikel", "link": "https://example.org/article/1", "summary": "A"}
+        mock_parse.return_value = {"etag": None, "modified": None, "entries": [dict(entry)]}
+        run_ingestion(feed_id=self.feed_id)
+
+        mock_parse.return_value = {"etag": None, "modified": None, "entries": [dict(entry, summary="A geaendert")]}
+        edited = run_ingestion(feed_id=self.feed_id)
+        self.assertEqual(edited.articles_upserted, 1)
+        feed = get_feed_by_id(self.feed_id) or {}
+        # Decays like a poll without news (from the 24/day of the default interval).
+        self.assertAlmostEqual(feed["new_entries_per_day"], 16.8)
+        self.assertEqual(feed["poll_interval_minutes"], 86)
+
+    @patch("backend.app.ingestion.extract_article")
+    @patch("backend.app.ingestion.feedparser.parse")
+    def test_not_modified_and_unchanged_feeds_short_circuit(self, mock_parse, mock_extract_article) -> None:
+        mock_extract_article.return_value = ExtractedArticle(
+            title="Artikel",
+            author=None,
+            canonical_url=None,
+            summary=None,
+            content_text="Volltext",
+            images=[],
+            press_contact=None,
+        )
+        body = {
+            "etag": "etag-1",
+            "modified": None,
+            "entries": [{"id": "item-1", "title": "Artikel", "link": "https://example.org/article/1", "summary": "A"}],
+        }
+        mock_parse.return_value = body
+        run_ingestion(feed_id=self.feed_id)
+        self.assertEqual(mock_extract_article.call_count, 1)
+
+        # Same content served again with 200: detected via the stored feed content hash.
+        unchanged = run_ingestion(feed_id=self.feed_id)
+        details = json.loads(get_run_by_id(unchanged.run_id)["details"])
+        self.assertEqual(details["feeds"][0]["fetch_status"], "unchanged")
+        self.assertEqual(details["feeds_unchanged"], 1)
+        self.assertEqual(mock_extract_article.call_count, 1)
+
+        mock_parse.return_value = {"status": 304, "etag": None, "modified": None, "entries": []}
+        not_modified = run_ingestion(feed_id=self.feed_id)
+        details = json.loads(get_run_by_id(not_modified.run_id)["details"])
+        self.assertEqual(details["feeds"][0]["fetch_status"], "not_modified")
+        self.assertEqual(details["feeds_not_modified"], 1)
+        self.assertEqual(mock_extract_article.call_count, 1)
+        # 304 responses without validators keep the stored ETag.
+        self.assertEqual((get_feed_by_id(self.feed_id) or {}).get("etag"), "etag-1")
+
+    @patch("backend.app.ingestion.extract_article")
+    @patch("backend.app.ingestion.feedparser.parse")
+    def test_feed_with_failed_extraction_does_not_short_circuit(self, mock_parse, mock_extract_article) -> None:
+        mock_extract_article.return_value = ExtractedArticle(
+            title=None,
+            author=None,
+            canonical_url=None,
+            summary=None,
+            content_text=None,
+            images=[],
+            press_contact=None,
+            extraction_error="ReadTimeout",
+            transient_error=True,
+        )
+        mock_parse.return_value = {
+            "etag": "etag-1",
+            "modified": None,
+            "entries": [{"id": "item-1", "title": "Artikel", "link": "https://example.org/article/1", "summary": "A"}],
+        }
+        run_ingestion(feed_id=self.feed_id)
+        feed = get_feed_by_id(self.feed_id) or {}
+        self.assertIsNone(feed.get("content_hash"))
+        self.assertIsNone(feed.get("etag"))
+
+        second = run_ingestion(feed_id=self.feed_id)
+        details = json.loads(get_run_by_id(second.run_id)["details"])
+        self.assertEqual(details["feeds"][0]["fetch_status"], "changed")
+
+    @patch("backend.app.ingestion.extract_article")
+    @patch("backend.app.ingestion.feedparser.parse")
+    def test_permanent_extraction_failure_does_not_block_feed(self, mock_parse, mock_extract_article) -> None:
+        mock_extract_article.return_value = ExtractedArticle(
+            title=None,
+            author=None,
+            canonical_url=None,
+            summary=None,
+            content_text=None,
+            images=[],
+            press_contact=None,
+            extraction_error="Client error '410 Gone'",
+        )
+        mock_parse.return_value = {
+            "etag": "etag-1",
+            "modified": None,
+            "entries": [{"id": "item-1", "title": "Artikel", "link": "https://example.org/article/1", "summary": "A"}],
+        }
+        run_ingestion(feed_id=self.feed_id)
+        feed = get_feed_by_id(self.feed_id) or {}
+        self.assertIsNotNone(feed.get("content_hash"))
+        self.assertEqual(feed.get("etag"), "etag-1")
+
+        second = run_ingestion(feed_id=self.feed_id)
+        details = json.loads(get_run_by_id(second.run_id)["details"])
+        self.assertEqual(details["feeds"][0]["fetch_status"], "unchanged")
+        self.assertEqual(mock_extract_article.call_count, 1)
+
+    @patch("backend.app.ingestion._probe_image_status", return_value=200)
+    @patch("backend.app.ingestion.extract_article")
+    @patch("backend.app.ingestion.feedparser.parse")
+    def test_failed_extraction_is_retried_on_next_poll(self, mock_parse, mock_extract_article, _mock_probe) -> None:
+        failed = ExtractedArticle(
+            title=None,
+            author=None,
+            canonical_url=None,
+            summary=None,
+            content_text=None,
+            images=[],
+            press_contact=None,
+            extraction_error="ReadTimeout",
+            transient_error=True,
+        )
+        extracted = ExtractedArticle(
+            title="Artikel",
+            author=None,
+            canonical_url=None,
+            summary=None,
+            content_text="Volltext",
+            images=[],
+            press_contact=None,
+        )
+        mock_extract_article.side_effect = [failed, extracted]
+        mock_parse.return_value = {
+            "etag": None,
+            "modified": None,
+            "entries": [{"id": "item-1", "title": "Artikel", "link": "https://example.org/article/1", "summary": "A"}],
+        }
+        run_ingestion(feed_id=self.feed_id)
+        self.assertEqual(mock_extract_article.call_count, 1)
+
+        second = run_ingestion(feed_id=self.feed_id)
+        self.assertEqual(mock_extract_article.call_count, 2)
+        self.assertEqual(second.articles_upserted, 1)
+        self.assertEqual(list_articles()[0]["content_raw"], "Volltext")
+
+        # Extracted cleanly now: the fingerprint is stored and the page is not fetched again.
+        run_ingestion(feed_id=self.feed_id)
+        self.assertEqual(mock_extract_article.call_count, 2)
+
+    @patch("backend.app.ingestion._probe_image_status", return_value=200)
+    @patch("backend.app.ingestion.extract_article")
+    @patch("backend.app.ingestion.feedparser.parse")
+    def test_story_in_two_feeds_is_not_refetched(self, mock_parse, mock_extract_article, _mock_probe) -> None:
+        alerts_feed_id = create_feed(
+            FeedCreate(name="Google Alerts", url="https://example.org/alerts.xml", source_id=None, is_enabled=True)
+        )
+
+        def fake_parse(content, response_headers=None):
+            alerts = content.decode("utf-8").endswith("alerts.xml")
+            entry = {
+                "id": "alert-7" if alerts else "item-1",
+                "title": "<b>Artikel</b> - Alert" if alerts else "Artikel",
+                "link": "https://example.org/article/1",
+                "summary": "Treffer" if alerts else "A",
+            }
+            return {"etag": None, "modified": None, "entries": [entry]}
+
+        mock_parse.side_effect = fake_parse
+        mock_extract_article.return_value = ExtractedArticle(
+            title="Artikel", author=None, canonical_url=None, summary=None, content_text="Volltext", images=[], press_contact=None
+        )
+        # Both feeds look changed on every poll, so every entry reaches the fingerprint check.
+        polls = iter(range(1000))
+        hash_patch = patch("backend.app.ingestion._feed_content_hash", side_effect=lambda parsed: str(next(polls)))
+        hash_patch.start()
+        self.addCleanup(hash_patch.stop)
+        run_ingestion()
+        extractions = mock_extract_article.call_count
+        owner = list_articles()[0]["feed_id"]
+
+        for _ in range(2):
+            second = run_ingestion()
+            self.assertEqual(second.articles_upserted, 0)
+        self.assertEqual(mock_extract_article.call_count, extractions)
+        self.assertEqual(len(list_articles()), 1)
+        self.assertEqual(list_articles()[0]["feed_id"], owner)
+        self.assertIn(owner, (self.feed_id, alerts_feed_id))
+
+    @patch("backend.app.ingestion._probe_image_status", return_value=200)
+    @patch("backend.app.ingestion.extract_article")
+    @patch("backend.app.ingestion.feedparser.parse")
+    def test_entries_of_blocked_host_are_deferred(self, mock_parse, mock_extract_article, _mock_probe) -> None:
+        blocked = ExtractedArticle(
+            title=None,
+            author=None,
+            canonical_url=None,
+            summary=None,
+            content_text=None,
+            images=[],
+            press_contact=None,
+            extraction_error="Host example.org voruebergehend gesperrt (Circuit Breaker offen)",
+            deferred=True,
+        )
+        extracted = ExtractedArticle(
+            title="Artikel",
+            author=None,
+            canonical_url=None,
+            summary=None,
+            content_text="Volltext",
+            images=[],
+            press_contact=None,
+        )
+        mock_extract_article.side_effect = [blocked, extracted]
+        mock_parse.return_value = {
+            "etag": "etag-1",
+            "modified": None,
+            "entries": [{"id": "item-1", "title": "Artikel", "link": "https://example.org/article/1", "summary": "A"}],
+        }
+        first = run_ingestion(feed_id=self.feed_id)
+        self.assertEqual(first.articles_upserted, 0)
+        self.assertEqual(list_articles(), [])
+        self.assertEqual(json.loads(get_run_by_id(first.run_id)["details"])["entries_deferred"], 1)
+        self.assertIsNone((get_feed_by_id(self.feed_id) or {}).get("etag"))
+
+        second = run_ingestion(feed_id=self.feed_id)
+        self.assertEqual(second.articles_upserted, 1)
+        self.assertEqual(list_articles()[0]["content_raw"], "Volltext")
+
+    @patch("backend.app.ingestion.extract_article")
+    @patch("backend.app.ingestion.feedparser.parse")
+    def test_feed_writes_are_committed_as_one_transaction(self, mock_parse, mock_extract_article) -> None:
+        mock_extract_article.return_value = ExtractedArticle(
+            title=None,
+            author=None,
+            canonical_url=None,
+            summary=None,
+            content_text="Volltext",
+            images=[],
+            press_contact=None,
+        )
+        mock_parse.return_value = {
+            "etag": "etag-1",
+            "modified": None,
+            "entries": [
+                {"id": "a", "title": "A", "link": "https://example.org/a", "summary": "A"},
+                {"id": "b", "title": "B", "link": "https://example.org/b", "summary": "B"},
+            ],
+        }
+        original_upsert = ingestion_module.upsert_article
+        calls: list[str] = []
+
+        def failing_second_upsert(payload, **kwargs):
+            calls.append(payload.source_url)
+            if len(calls) == 2:
+                raise RuntimeError("disk full")
+            return original_upsert(payload, **kwargs)
+
+        with patch("backend.app.ingestion.upsert_article", side_effect=failing_second_upsert):
+            stats = run_ingestion(feed_id=self.feed_id)
+
+        self.assertEqual(stats.status, "failed")
+        self.assertEqual(list_articles(), [])
+        feed = get_feed_by_id(self.feed_id) or {}
+        self.assertIsNone(feed.get("etag"))
+        self.assertIsNone(feed.get("content_hash"))
+
+    def test_fetch_feed_uses_shared_client_with_conditional_headers(self) -> None:
+        seen_headers: list[dict[str, str]] = []
+        rss = (
+            b'<?xml version="1.0"?><rss version="2.0"><channel><title>T</title>'
+            b"<item><guid>g-1</guid><title>Eintrag</title><link>https://example.org/a/1</link></item>"
+            b"</channel></rss>"
+        )
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.append(dict(request.headers))
+            if request.headers.get("if-none-match") == "etag-1":
+                return httpx.Response(304)
+            return httpx.Response(200, content=rss, headers={"ETag": "etag-1", "Content-Type": "application/rss+xml"})
+
+        self.mock_download.side_effect = _real_download_feed
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with patch("backend.app.ingestion.get_http_client", return_value=client):
+            parsed, error = ingestion_module._fetch_feed({"url": "https://example.org/feed.xml"})
+            not_modified, _ = ingestion_module._fetch_feed({"url": "https://example.org/feed.xml", "etag": "etag-1"})
+
+        self.assertIsNone(error)
+        self.assertEqual(parsed["etag"], "etag-1")
+        self.assertEqual(parsed["status"], 200)
+        self.assertEqual(parsed["entries"][0]["link"], "https://example.org/a/1")
+        self.assertEqual(not_modified["status"], 304)
+        self.assertNotIn("if-none-match", seen_headers[0])
+        self.assertEqual(seen_headers[1]["if-none-match"], "etag-1")
+
+    @patch("backend.app.ingestion.extract_article")
+    @patch("backend.app.ingestion.feedparser.parse")
+    def test_progress_checkpoint_allows_resuming_failed_run(self, mock_parse, mock_extract_article) -> None:
+        second_feed_id = create_feed(
+            FeedCreate(name="Second Feed", url="https://example.org/feed-2.xml", source_id=None, is_enabled=True)
+        )
+
+        def fake_parse(content, response_headers=None):
+            slug = "a" if content.decode("utf-8").endswith("feed.xml") else "b"
+            return {
+                "etag": None,
+                "modified": None,
+                "entries": [{"id": f"{slug}-1", "title": slug, "link": f"https://example.org/{slug}/1", "summary": "x"}],
+            }
+
+        mock_parse.side_effect = fake_parse
+        mock_extract_article.return_value = ExtractedArticle(
+            title=None, author=None, canonical_url=None, summary=None, content_text="Volltext", images=[], press_contact=None
+        )
+        original_upsert = ingestion_module.upsert_article
+
+        def failing_feed_b(payload, **kwargs):
+            if "/b/" in payload.source_url:
+                raise RuntimeError("disk full")
+            return original_upsert(payload, **kwargs)
+
+        # Feeds run in id order: the first feed commits, the second one fails.
+        events = []
+        with patch("backend.app.ingestion.upsert_article", side_effect=failing_feed_b):
+            for event in iter_ingestion():
+                events.append(event)
+                if event["event"] == "feed_written":
+                    run = get_run_by_id(event["run_id"])
+                    self.assertEqual(run["status"], "running")
+                    self.assertEqual(json.loads(run["details"])["feeds_processed"], event["feeds_processed"])
+
+        self.assertEqual(events[0]["event"], "started")
+        self.assertEqual(events[-1]["event"], "finished")
+        self.assertEqual(events[-1]["status"], "failed")
+        run_id = events[-1]["run_id"]
+        checkpoint = json.loads(get_run_by_id(run_id)["details"])
+        self.assertEqual(checkpoint["error"], "disk full")
+        self.assertNotIn(second_feed_id, checkpoint["completed_feed_ids"])
+
+        self.mock_download.reset_mock()
+        resumed = run_ingestion(resume_run_id=run_id)
+
+        self.assertEqual(resumed.run_id, run_id)
+        self.assertEqual(resumed.status, "success")
+        self.assertEqual(resumed.feeds_processed, 2)
+        self.assertEqual(resumed.articles_upserted, 2)
+        self.assertEqual([call.args[0]["id"] for call in self.mock_download.call_args_list], [second_feed_id])
+        final = json.loads(get_run_by_id(run_id)["details"])
+        self.assertEqual(sorted(final["completed_feed_ids"]), sorted([self.feed_id, second_feed_id]))
+        self.assertEqual(run_ingestion(resume_run_id=run_id).status, "failed")  # finished runs cannot be resumed
+
+    @patch("backend.app.ingestion.extract_article")
+    @patch("backend.app.ingestion.feedparser.parse")
+    def test_disconnected_run_is_failed_and_resumed_only_once(self, mock_parse, mock_extract_article) -> None:
+        mock_parse.return_value = {
+            "etag": None,
+            "modified": None,
+            "entries": [{"id": "a-1", "title": "a", "link": "https://example.org/a/1", "summary": "x"}],
+        }
+        mock_extract_article.return_value = ExtractedArticle(
+            title=None, author=None, canonical_url=None, summary=None, content_text="Volltext", images=[], press_contact=None
+        )
+
+        # The client goes away right after the start event.
+        stream = iter_ingestion()
+        run_id = next(stream)["run_id"]
+        self.assertEqual(get_run_by_id(run_id)["status"], "running")
+        stream.close()
+        run = get_run_by_id(run_id)
+        self.assertEqual(run["status"], "failed")
+        self.assertEqual(json.loads(run["details"])["error"], "Ingestion abgebrochen")
+
+        resumed = iter_ingestion(resume_run_id=run_id)
+        self.assertEqual(next(resumed)["event"], "started")
+        self.assertEqual(get_run_by_id(run_id)["status"], "running")
+        refused = list(iter_ingestion(resume_run_id=run_id))  # a second client while the first is still running
+        self.assertEqual(refused[-1]["status"], "failed")
+        self.assertIn("laeuft noch", refused[-1]["message"])
+
+        self.assertEqual([event["event"] for event in resumed][-1], "finished")
+        self.assertEqual(get_run_by_id(run_id)["status"], "success")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,145 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+from backend.app import config as config_module
+from backend.app.db import init_db
+from backend.app.light_variants import VariantBoard, apply_rule, derive_rule, get_variant_board
+from backend.app.repositories import list_light_variants
+from backend.app.source_extraction import extract_article
+
+TEXT = (
+    "Der neue Dachzelt-Test zeigt grosse Unterschiede bei Aufbauzeit, Gewicht und Liegekomfort. "
+    "Vor allem die Hartschalenzelte ueberzeugen auf langen Touren durch Skandinavien."
+)
+
+FULL_HTML = f"""
+<html><head>
+<title>Dachzelte im Test</title>
+<link rel="amphtml" href="{{amp}}">
+<script>{"var tracking = 1;" * 2000}</script>
+</head><body>
+<nav>{"<a href='/rubrik'>Rubrik</a>" * 200}</nav>
+<article><h1>Dachzelte im Test</h1><p>{TEXT}</p><img src="/bilder/zelt.jpg" alt="Zelt"></article>
+</body></html>
+"""
+
+AMP_HTML = f"""
+<html><head>
+<title>Dachzelte im Test</title>
+<link rel="canonical" href="{{canonical}}">
+</head><body>
+<article><h1>Dachzelte im Test</h1><p>{TEXT}</p><amp-img src="/bilder/zelt.jpg" width="800" height="600"></amp-img></article>
+</body></html>
+"""
+
+
+class TestLightVariants(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.environ["APP_DB_PATH"] = str(Path(self.tmp_dir.name) / "variants.db")
+        os.environ["EXTRACTION_CACHE_PATH"] = str(Path(self.tmp_dir.name) / "extraction_cache.sqlite")
+        os.environ["LIGHT_VARIANTS_ENABLED"] = "true"
+        os.environ["LIGHT_VARIANT_MIN_TRIALS"] = "2"
+        config_module.get_settings.cache_clear()
+        init_db()
+        self.requested: list[str] = []
+        self.amp_status = 200
+
+    def tearDown(self) -> None:
+        for name in ("APP_DB_PATH", "EXTRACTION_CACHE_PATH", "LIGHT_VARIANTS_ENABLED", "LIGHT_VARIANT_MIN_TRIALS"):
+            os.environ.pop(name, None)
+        config_module.get_settings.cache_clear()
+        self.tmp_dir.cleanup()
+
+    def _handler(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        self.requested.append(url)
+        if url.endswith("/amp/"):
+            if self.amp_status != 200:
+                return httpx.Response(self.amp_status)
+            return httpx.Response(200, html=AMP_HTML.format(canonical=url[: -len("amp/")]))
+        return httpx.Response(200, html=FULL_HTML.format(amp=f"{url}amp/"))
+
+    def test_derive_and_apply_rules(self) -> None:
+        cases = [
+            ("https://a.example/2024/zelt/", "https://a.example/2024/zelt/amp/", "suffix:/amp/"),
+            ("https://a.example/zelt.html", "https://a.example/zelt.html?outputType=valid_amp", "query:outputType=valid_amp"),
+            ("https://a.example/reise/zelt", "https://a.example/amp/reise/zelt", "prefix:/amp"),
+            ("https://a.example/reise/zelt.html", "https://a.example/reise/zelt.amp.html", "ext:.amp"),
+            ("https://www.a.example/reise/zelt", "https://amp.a.example/reise/zelt", "host:amp.a.example"),
+        ]
+        for url, variant, rule in cases:
+            with self.subTest(rule=rule):
+                self.assertEqual(derive_rule(url, variant), rule)
+                self.assertEqual(apply_rule(url, rule), variant)
+        self.assertEqual(apply_rule("https://a.example/2025/grill/", "suffix:/amp/"), "https://a.example/2025/grill/amp/")
+        self.assertIsNone(derive_rule("https://a.example/zelt", "https://b.example/anderes"))
+        self.assertIsNone(derive_rule("https://a.example/zelt/", "https://a.example/zelt"))
+
+    def test_board_prefers_only_equivalent_and_cheaper_variants(self) -> None:
+        board = VariantBoard(min_trials=2, min_savings=0.2)
+        url = "https://a.example/zelt/"
+        self.assertEqual(board.trial_url(url, "suffix:/amp/"), "https://a.example/zelt/amp/")
+        board.record_trial(url, "suffix:/amp/", True, 10_000, 2_000)
+        self.assertIsNone(board.preferred_url(url))
+        board.record_trial(url, "suffix:/amp/", True, 10_000, 2_000)
+        self.assertEqual(board.preferred_url("https://a.example/grill/"), "https://a.example/grill/amp/")
+        self.assertIsNone(board.trial_url(url, "suffix:/amp/"))
+
+        board.record_failure(url, "HTTP 500")
+        self.assertIsNone(board.preferred_url(url))
+        board.record_trial(url, "suffix:/amp/", False, 10_000, 2_000, "Titel weicht ab")
+        self.assertIsNone(board.trial_url(url, "suffix:/amp/"))  # rejected
+        later = datetime.now(timezone.utc) + timedelta(days=31)
+        with patch("backend.app.light_variants._now", return_value=later.replace(microsecond=0)):
+            self.assertIsNotNone(board.trial_url(url, "suffix:/amp/"))
+
+        small = VariantBoard(min_trials=1, min_savings=0.5)
+        small.trial_url(url, "suffix:/amp/")
+        small.record_trial(url, "suffix:/amp/", True, 10_000, 8_000)
+        row = small._hosts["a.example"].as_row()
+        self.assertEqual(row["state"], "rejected")
+        self.assertIn("Ersparnis", row["last_error"])
+
+    @patch("backend.app.source_extraction.get_http_client")
+    def test_extract_article_learns_and_then_fetches_amp_variant(self, mock_client) -> None:
+        mock_client.return_value = httpx.Client(transport=httpx.MockTransport(self._handler))
+        for slug in ("zelt-eins", "zelt-zwei"):
+            extracted = extract_article(f"https://reise.example/{slug}/")
+            self.assertIsNone(extracted.light_variant_url)
+            self.assertEqual(extracted.amp_url, f"https://reise.example/{slug}/amp/")
+        self.assertEqual(len(self.requested), 4)  # full page plus variant while learning
+
+        self.requested.clear()
+        url = "https://reise.example/zelt-drei/"
+        extracted = extract_article(url)
+        self.assertEqual(self.requested, [f"{url}amp/"])
+        self.assertEqual(extracted.light_variant_url, f"{url}amp/")
+        self.assertEqual(extracted.canonical_url, url)
+        self.assertEqual(extracted.images, ["https://reise.example/bilder/zelt.jpg"])
+        self.assertIn("Hartschalenzelte", extracted.content_text)
+
+        get_variant_board().flush()
+        row = list_light_variants()[0]
+        self.assertEqual((row["host"], row["rule"], row["state"], row["trials"]), ("reise.example", "suffix:/amp/", "preferred", 2))
+        self.assertLess(row["light_bytes"] * 5, row["full_bytes"])
+
+        # A failing variant falls back to the full page and restarts learning.
+        self.amp_status = 404
+        self.requested.clear()
+        extracted = extract_article("https://reise.example/zelt-vier/")
+        self.assertIsNone(extracted.light_variant_url)
+        self.assertEqual(self.requested[:2], ["https://reise.example/zelt-vier/amp/", "https://reise.example/zelt-vier/"])
+        self.assertIn("Hartschalenzelte", extracted.content_text)
+        get_variant_board().flush()
+        self.assertEqual(list_light_variants()[0]["state"], "rejected")  # the fallback's trial failed too
+
+
+if __name__ == "__main__":
+    unittest.main()
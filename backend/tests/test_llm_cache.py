@@ -0,0 +1,83 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from backend.app import config as config_module
+from backend.app.db import init_db
+from backend.app.llm_cache import cache_stats, reset_cache_stats
+from backend.app.rewrite import generate_article_tags, rewrite_article_text, score_article_relevance
+
+ARTICLE = {
+    "title": "Neue Stellplaetze an der Ostsee",
+    "content_raw": "Kopf\nOrt\nDatum\nAn der Ostsee entstehen 40 neue Stellplaetze fuer Wohnmobile.\nPressekontakt: Max Muster",
+    "source_name_snapshot": "Kurverwaltung",
+}
+
+
+def _completion(content: str) -> io.BytesIO:
+    return io.BytesIO(json.dumps({"choices": [{"message": {"content": content}}]}).encode("utf-8"))
+
+
+class TestLlmCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.environ["APP_DB_PATH"] = str(Path(self.tmp_dir.name) / "llm.db")
+        os.environ["OPENAI_API_KEY"] = "sk-test"
+        config_module.get_settings.cache_clear()
+        init_db()
+        reset_cache_stats()
+        self.answers = iter(["<p>Erster Text</p>", "<p>Zweiter Text</p>", "<p>Dritter Text</p>"])
+        patcher = patch("backend.app.rewrite.urlopen", side_effect=lambda *args, **kwargs: _completion(next(self.answers)))
+        self.urlopen = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        for name in ("APP_DB_PATH", "OPENAI_API_KEY", "OPENAI_MODEL", "LLM_CACHE_ENABLED"):
+            os.environ.pop(name, None)
+        config_module.get_settings.cache_clear()
+        reset_cache_stats()
+        self.tmp_dir.cleanup()
+
+    def test_identical_input_is_answered_from_cache_until_refresh(self) -> None:
+        self.assertEqual(rewrite_article_text(ARTICLE), "<p>Erster Text</p>")
+        # Different raw text, same sanitized input (header lines and press contact are cut).
+        same_input = {**ARTICLE, "content_raw": ARTICLE["content_raw"].replace("Max Muster", "Erika Muster")}
+        self.assertEqual(rewrite_article_text(same_input), "<p>Erster Text</p>")
+        self.assertEqual(self.urlopen.call_count, 1)
+
+        self.assertEqual(rewrite_article_text(ARTICLE, refresh=True), "<p>Zweiter Text</p>")
+        self.assertEqual(rewrite_article_text(ARTICLE), "<p>Zweiter Text</p>")
+        self.assertEqual(self.urlopen.call_count, 2)
+
+        stats = cache_stats()
+        self.assertEqual(stats["counters"]["rewrite-1"], {"hits": 2, "misses": 1, "bypassed": 1})
+        self.assertEqual(
+            [(row["prompt_version"], row["entries"], row["hits"]) for row in stats["stored"]],
+            [("rewrite-1", 1, 2)],
+        )
+
+    def test_model_prompt_and_disabled_cache_miss(self) -> None:
+        rewrite_article_text(ARTICLE)
+        generate_article_tags(ARTICLE, rewritten_text="<p>Erster Text</p>")  # other prompt version and input
+        self.assertEqual(self.urlopen.call_count, 2)
+
+        os.environ["OPENAI_MODEL"] = "gpt-4o"
+        config_module.get_settings.cache_clear()
+        rewrite_article_text(ARTICLE)
+        self.assertEqual(self.urlopen.call_count, 3)
+
+        os.environ["LLM_CACHE_ENABLED"] = "false"
+        config_module.get_settings.cache_clear()
+        self.answers = iter(['{"score": 80, "reason": "Camping", "topics": ["Stellplatz"]}'] * 2)
+        self.assertEqual(score_article_relevance(ARTICLE)["score"], 80)
+        self.assertEqual(score_article_relevance(ARTICLE)["score"], 80)
+        self.assertEqual(self.urlopen.call_count, 5)
+        self.assertNotIn("relevance-1", cache_stats()["counters"])
+
+
+if __name__ == "__main__":
+    unittest.main()
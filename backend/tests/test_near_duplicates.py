@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from backend.app import config as config_module
+from backend.app.db import get_conn, init_db
+from backend.app.near_duplicates import (
+    NEAR_DUPLICATE_THRESHOLD,
+    assign_cluster,
+    band_keys,
+    estimate_similarity,
+    minhash_signature,
+)
+from backend.app.repositories import ArticleUpsert, get_near_duplicate_representative, upsert_article
+
+
+PRESS_RELEASE = (
+    "Die Stadtwerke Musterstadt nehmen am kommenden Montag einen neuen Stellplatz fuer Wohnmobile "
+    "am Seeufer in Betrieb. Insgesamt stehen 40 Plaetze mit Strom, Frischwasser und Entsorgung bereit, "
+    "die Buchung erfolgt ueber eine App. Die Gebuehr betraegt 18 Euro pro Nacht inklusive Kurtaxe."
+)
+
+
+def _article(title: str, content: str, url: str) -> ArticleUpsert:
+    return ArticleUpsert(
+        feed_id=None,
+        source_article_id=None,
+        source_hash=url,
+        title=title,
+        source_url=url,
+        canonical_url=url,
+        published_at=None,
+        author=None,
+        summary=None,
+        content_raw=content,
+        content_rewritten=None,
+        image_urls_json=None,
+        press_contact=None,
+        source_name_snapshot=None,
+        source_terms_url_snapshot=None,
+        source_license_name_snapshot=None,
+        legal_checked=False,
+        legal_checked_at=None,
+        legal_note=None,
+        wp_post_id=None,
+        wp_post_url=None,
+        publish_attempts=0,
+        publish_last_error=None,
+        published_to_wp_at=None,
+        word_count=len(content.split()),
+        status="new",
+        meta_json=None,
+    )
+
+
+class TestNearDuplicates(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.environ["APP_DB_PATH"] = str(Path(self.tmp_dir.name) / "near_duplicates.db")
+        config_module.get_settings.cache_clear()
+        init_db()
+
+    def tearDown(self) -> None:
+        config_module.get_settings.cache_clear()
+        os.environ.pop("APP_DB_PATH", None)
+        self.tmp_dir.cleanup()
+
+    def test_signature_is_stable_under_syndication_noise(self) -> None:
+        original = minhash_signature("Neuer Wohnmobilstellplatz am Seeufer", PRESS_RELEASE)
+        syndicated = minhash_signature("Neuer Wohnmobilstellplatz am Seeufer", "Musterstadt (ots) - " + PRESS_RELEASE)
+        other = minhash_signature(
+            "Campingplatz erweitert Saison",
+            "Der Campingplatz am Waldrand verlaengert seine Saison bis Ende November und bietet "
+            "erstmals beheizte Sanitaeranlagen sowie einen Broetchenservice fuer Dauercamper an.",
+        )
+        self.assertIsNotNone(original)
+        self.assertGreaterEqual(estimate_similarity(original, syndicated), NEAR_DUPLICATE_THRESHOLD)
+        self.assertTrue(set(band_keys(original)) & set(band_keys(syndicated)))
+        self.assertLess(estimate_similarity(original, other), 0.2)
+        self.assertIsNone(minhash_signature("Kurz", "zu wenig Text"))
+
+    def test_assign_cluster_groups_copies_under_first_article(self) -> None:
+        first_id = upsert_article(_article("Stellplatz am See", PRESS_RELEASE, "https://a.example/1"))
+        copy_id = upsert_article(_article("Stellplatz am See", PRESS_RELEASE + " Weitere Infos online.", "https://b.example/2"))
+        other_text = "Ein voellig anderer Text ueber Reifendruck, Achslast und Zuladung bei Wohnmobilen im Winter."
+        other_id = upsert_article(_article("Zuladung richtig berechnen", other_text, "https://c.example/3"))
+
+        with get_conn() as conn:
+            first_signature = minhash_signature("Stellplatz am See", PRESS_RELEASE)
+            self.assertEqual(assign_cluster(first_id, first_signature, conn), (first_id, 1.0))
+            cluster_id, _ = assign_cluster(
+                copy_id, minhash_signature("Stellplatz am See", PRESS_RELEASE + " Weitere Infos online."), conn
+            )
+            self.assertEqual(cluster_id, first_id)
+            other_signature = minhash_signature("Zuladung richtig berechnen", other_text)
+            self.assertEqual(assign_cluster(other_id, other_signature, conn), (other_id, 1.0))
+
+        self.assertIsNone(get_near_duplicate_representative(first_id))
+        self.assertEqual(get_near_duplicate_representative(copy_id), first_id)
+        self.assertIsNone(get_near_duplicate_representative(other_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
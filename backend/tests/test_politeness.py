@@ -0,0 +1,74 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from backend.app.politeness import HostBusyError, HostLimiter, HostLimits, parse_host_overrides
+
+
+class TestHostLimiter(unittest.TestCase):
+    def test_parse_host_overrides_skips_invalid_items(self) -> None:
+        overrides = parse_host_overrides("presseportal.de=1/0.5, .example.org=3, broken, bad=x/1")
+        self.assertEqual(overrides, {"presseportal.de": (1, 0.5), "example.org": (3, -1.0)})
+
+    def test_override_matches_subdomains_only(self) -> None:
+        limiter = HostLimiter(HostLimits(max_concurrency=4, rate_per_second=2.0, burst=4), {"presseportal.de": (1, 0.5)})
+        self.assertEqual(limiter.limits_for("www.presseportal.de").max_concurrency, 1)
+        self.assertEqual(limiter.limits_for("www.presseportal.de").rate_per_second, 0.5)
+        self.assertEqual(limiter.limits_for("notpresseportal.de").max_concurrency, 4)
+
+    def test_token_bucket_delays_after_burst(self) -> None:
+        limiter = HostLimiter(HostLimits(max_concurrency=4, rate_per_second=2.0, burst=2))
+        with patch("backend.app.politeness.time.monotonic", return_value=100.0), patch(
+            "backend.app.politeness.time.sleep"
+        ) as mock_sleep:
+            for _ in range(3):
+                with limiter.slot("https://example.org/a"):
+                    pass
+            # Different host has its own bucket.
+            with limiter.slot("https://example.net/a"):
+                pass
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 0.5)
+
+    def test_concurrency_cap_raises_when_host_stays_busy(self) -> None:
+        limiter = HostLimiter(HostLimits(max_concurrency=1, rate_per_second=0, burst=1), max_wait_seconds=0.05)
+        entered = threading.Event()
+        release = threading.Event()
+
+        def hold_slot() -> None:
+            with limiter.slot("https://example.org/slow"):
+                entered.set()
+                release.wait(2)
+
+        worker = threading.Thread(target=hold_slot)
+        worker.start()
+        entered.wait(2)
+        try:
+            with self.assertRaises(HostBusyError):
+                with limiter.slot("https://example.org/other"):
+                    pass
+        finally:
+            release.set()
+            worker.join()
+
+    def test_refused_slot_gives_its_token_back(self) -> None:
+        limiter = HostLimiter(HostLimits(max_concurrency=4, rate_per_second=1.0, burst=1), max_wait_seconds=0.5)
+        with patch("backend.app.politeness.time.monotonic", return_value=100.0), patch(
+            "backend.app.politeness.time.sleep"
+        ) as mock_sleep:
+            with limiter.slot("https://example.org/a"):
+                pass
+            for _ in range(3):
+                with self.assertRaises(HostBusyError):
+                    with limiter.slot("https://example.org/b"):
+                        pass
+            # Refused callers did not push the queue further out: the next wait is still one token.
+            limiter.max_wait_seconds = 5.0
+            with limiter.slot("https://example.org/c"):
+                pass
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
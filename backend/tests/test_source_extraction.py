@@ -1,7 +1,33 @@
+from dataclasses import replace
+import gzip
+import os
+from pathlib import Path
+import tempfile
+import time
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
-from backend.app.source_extraction import extract_article
+import httpx
+
+from backend.app import config as config_module
+from backend.app import dom_scan
+from backend.app.circuit_breaker import CircuitOpenError
+from backend.app.extraction_pool import shutdown_pool
+from backend.app.extraction_profiles import profile_stats, reset_profile_stats
+from backend.app.http_client import accept_encoding
+from backend.app.politeness import HostBusyError
+from backend.app.source_extraction import (
+    _PageLimits,
+    _extract_with_regex,
+    _read_bounded,
+    _scanners,
+    decode_page,
+    extract_article,
+    extract_article_from_html,
+    extract_page,
+    extracted_article_to_meta,
+)
+from backend.benchmarks.extraction import load_corpus
 
 
 SAMPLE_HTML = """
@@ -45,33 +71,67 @@ SAMPLE_HTML_AGENTUR = """
 </html>
 """
 
+SAMPLE_HTML_IMAGES = """
+<html>
+<head><title>Bilder &amp; Credits</title>
+<script>var tpl = '<p>kein Absatz</p><img src="/script.jpg">';</script></head>
+<body>
+  <div class="byline"><a href="/autor/erika">Erika Beispiel</a></div>
+  <main>
+    <figure><img data-src="/img/hero.jpg" alt=""><figcaption>Kastenwagen am See <span class="photo-credit">&copy; Hersteller</span></figcaption></figure>
+    <figure><img src="/img/second.jpg"><figcaption>Innenraum. Foto: Max Fotograf</figcaption></figure>
+    <p>Der neue <strong>Kastenwagen</strong> kommt im Fr&uuml;hjahr.</p>
+    <img src="/img/detail.jpg" data-photographer="Lisa Licht" data-caption="Heckansicht">
+    <img src="/img/adjacent.jpg"><span class="credit">Bild: Agentur Nord</span>
+    <noscript><img src="/img/noscript.jpg"></noscript>
+  </main>
+</body>
+</html>
+"""
 
-class _FakeHeaders:
-    @staticmethod
-    def get_content_charset():
-        return "utf-8"
-
-
-class _FakeResponse:
-    headers = _FakeHeaders()
+SAMPLE_HTML_JSON_LD = """
+<html>
+<head>
+  <title>Fallback-Titel</title>
+  <meta name="author" content="Meta Autor" />
+  <meta name="description" content="Meta-Beschreibung" />
+  <script type="application/ld+json">
+  {"@context": "https://schema.org", "@graph": [
+    {"@type": "WebSite", "name": "Beispielverlag"},
+    {"@type": ["NewsArticle"], "headline": "Neue Kastenwagen &amp; Campervans",
+     "author": [{"@type": "Person", "name": "Erika Beispiel"}, {"@type": "Person", "name": "Max Muster"}],
+     "datePublished": "2026-03-01T09:30:00+01:00",
+     "image": [{"@type": "ImageObject", "url": "/img/ld.jpg", "width": 1200, "height": 800,
+                "caption": "Der neue Van", "creditText": "Hersteller"}, "https://example.org/img/og.jpg"],
+     "articleBody": "Erster Absatz aus JSON-LD.\n\nPressekontakt: Agentur Nord\nTel. 040 123"}
+  ]}
+  </script>
+</head>
+<body><article><p>Absatz aus dem Markup.</p><img src="/img/og.jpg"><img src="/img/inline.jpg"></article></body>
+</html>
+"""
 
-    def __init__(self, body: str):
-        self._body = body.encode("utf-8")
 
-    def read(self):
-        return self._body
+def _mock_client(body: str) -> httpx.Client:
+    return httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, html=body)))
 
-    def __enter__(self):
-        return self
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        return False
+class TestSourceExtraction(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.environ["APP_DB_PATH"] = str(Path(self.tmp_dir.name) / "extraction.db")
+        os.environ["EXTRACTION_CACHE_PATH"] = str(Path(self.tmp_dir.name) / "extraction_cache.sqlite")
+        config_module.get_settings.cache_clear()
 
+    def tearDown(self) -> None:
+        os.environ.pop("APP_DB_PATH", None)
+        os.environ.pop("EXTRACTION_CACHE_PATH", None)
+        config_module.get_settings.cache_clear()
+        self.tmp_dir.cleanup()
 
-class TestSourceExtraction(unittest.TestCase):
-    @patch("backend.app.source_extraction.urlopen")
-    def test_extract_article_parses_author_images_and_press_contact(self, mock_urlopen) -> None:
-        mock_urlopen.return_value = _FakeResponse(SAMPLE_HTML)
+    @patch("backend.app.source_extraction.get_http_client")
+    def test_extract_article_parses_author_images_and_press_contact(self, mock_client) -> None:
+        mock_client.return_value = _mock_client(SAMPLE_HTML)
 
         extracted = extract_article("https://www.presseportal.de/pm/118273/6158137")
         self.assertEqual(extracted.title, "Demo Meldung von Presseportal")
@@ -83,14 +143,321 @@ class TestSourceExtraction(unittest.TestCase):
         self.assertIn("Pressekontakt", extracted.press_contact or "")
         self.assertIsNone(extracted.extraction_error)
 
-    @patch("backend.app.source_extraction.urlopen")
-    def test_extract_article_detects_agentur_block_as_press_contact(self, mock_urlopen) -> None:
-        mock_urlopen.return_value = _FakeResponse(SAMPLE_HTML_AGENTUR)
+    @patch("backend.app.source_extraction.get_http_client")
+    def test_extract_article_detects_agentur_block_as_press_contact(self, mock_client) -> None:
+        mock_client.return_value = _mock_client(SAMPLE_HTML_AGENTUR)
         extracted = extract_article("https://www.presseportal.de/pm/155103/6210401")
         self.assertIn("Agentur", extracted.press_contact or "")
         self.assertIn("Agenturname", extracted.press_contact or "")
         self.assertIn("presse@agentur.example", extracted.press_contact or "")
 
+    def test_refused_requests_are_deferred_not_failed(self) -> None:
+        for error in (CircuitOpenError("Breaker offen"), HostBusyError("Host busy"), httpx.ReadTimeout("timeout")):
+            with self.subTest(error=type(error).__name__):
+                with patch("backend.app.source_extraction._fetch_page", side_effect=error):
+                    extracted = extract_article("https://www.presseportal.de/pm/118273/6158137")
+                self.assertEqual(extracted.deferred, not isinstance(error, httpx.ReadTimeout))
+                self.assertIsNotNone(extracted.extraction_error)
+
+    @patch("backend.app.source_extraction.get_http_client")
+    def test_only_transient_failures_are_marked_for_retry(self, mock_client) -> None:
+        for status, transient in ((404, False), (410, False), (403, False), (429, True), (503, True)):
+            with self.subTest(status=status):
+                mock_client.return_value = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(status)))
+                extracted = extract_article(f"https://www.presseportal.de/pm/118273/{status}")
+                self.assertIsNotNone(extracted.extraction_error)
+                self.assertEqual(extracted.transient_error, transient)
+                self.assertEqual(extracted_article_to_meta(extracted)["transient_error"], transient)
+        with patch("backend.app.source_extraction._fetch_page", side_effect=httpx.ConnectError("reset")):
+            self.assertTrue(extract_article("https://www.presseportal.de/pm/118273/1").transient_error)
+
+    def test_extract_article_from_html_collects_image_metadata(self) -> None:
+        extracted = extract_article_from_html(SAMPLE_HTML_IMAGES, "https://example.org/news/1")
+        self.assertEqual(extracted.title, "Bilder & Credits")
+        self.assertEqual(extracted.author, "Erika Beispiel")
+        self.assertEqual(extracted.content_text, "Der neue Kastenwagen kommt im Frühjahr.")
+        self.assertEqual(
+            extracted.images,
+            [
+                "https://example.org/img/hero.jpg",
+                "https://example.org/img/second.jpg",
+                "https://example.org/img/detail.jpg",
+                "https://example.org/img/adjacent.jpg",
+            ],
+        )
+        self.assertEqual(
+            extracted.image_metadata,
+            {
+                "https://example.org/img/hero.jpg": {"caption": "Kastenwagen am See © Hersteller", "credit": "© Hersteller"},
+                "https://example.org/img/second.jpg": {"caption": "Innenraum. Foto: Max Fotograf", "credit": "Foto: Max Fotograf"},
+                "https://example.org/img/detail.jpg": {"caption": "Heckansicht", "credit": "Lisa Licht"},
+                "https://example.org/img/adjacent.jpg": {"credit": "Bild: Agentur Nord"},
+            },
+        )
+
+    def test_lazy_images_use_real_source_for_urls_and_metadata(self) -> None:
+        html = """
+        <article>
+          <img src="data:image/gif;base64,R0lGOD" data-src="/img/lazy.jpg" data-credit="Foto: Lazy" width="800" height="600px">
+          <img src="data:image/gif;base64,R0lGOD" data-srcset="/img/small.jpg 480w, /img/large.jpg 1280w">
+          <span class="credit">Bild: Srcset</span>
+          <img data-original="/img/original.jpg" src="/img/original-thumb.jpg" width="auto">
+        </article>
+        """
+        url = "https://example.org/news/2"
+        extracted = extract_article_from_html(html, url)
+        self.assertEqual(
+            extracted.images,
+            ["https://example.org/img/lazy.jpg", "https://example.org/img/large.jpg", "https://example.org/img/original-thumb.jpg"],
+        )
+        self.assertEqual(
+            extracted.image_metadata,
+            {
+                "https://example.org/img/lazy.jpg": {"credit": "Foto: Lazy", "width": 800, "height": 600},
+                "https://example.org/img/large.jpg": {"credit": "Bild: Srcset"},
+            },
+        )
+        self.assertEqual(_extract_with_regex(html, url), extracted)
+
+    def test_extraction_degrades_when_time_budget_runs_out(self) -> None:
+        figures = "".join(
+            f'<figure><img src="/img/{index}.jpg"><figcaption>Bild {index} <span class="credit">Foto: F{index}</span></figcaption></figure><p>Absatz {index}</p>'
+            for index in range(5000)
+        )
+        html = f'<html><head><meta property="og:title" content="Riesenseite"><meta name="author" content="Meta Autor"></head><body><article>{figures}</article></body></html>'
+        url = "https://example.org/news/huge"
+
+        os.environ["EXTRACTION_TIME_BUDGET_MS"] = "1"
+        config_module.get_settings.cache_clear()
+        try:
+            extracted = extract_article_from_html(html, url)
+        finally:
+            os.environ.pop("EXTRACTION_TIME_BUDGET_MS", None)
+            config_module.get_settings.cache_clear()
+
+        self.assertIn(extracted.budget_exhausted, {"scan", "heuristics"})
+        self.assertEqual(extracted.title, "Riesenseite")
+        self.assertEqual(extracted.author, "Meta Autor")
+        self.assertEqual(extracted.image_metadata, {})
+        self.assertLessEqual(len(extracted.images), 20)
+        self.assertEqual(extracted_article_to_meta(extracted)["budget_exhausted"], extracted.budget_exhausted)
+        self.assertIsNone(extract_article_from_html(html, url).budget_exhausted)
+
+    def test_malformed_markup_does_not_backtrack(self) -> None:
+        # Each of these took seconds with the former lazy-match patterns.
+        url = "https://example.org/news/broken"
+        unclosed_bylines = ["<a" + attrs * 2000 + "<p>Text</p>" for attrs in (" class=author", " class=x", " class='x")]
+        for html in ("<article>" * 8000, "<figure>" * 8000, "<!--" * 8000, "<p x" * 8000, "<a b" * 8000 + ">", *unclosed_bylines):
+            for extract in (extract_article_from_html, _extract_with_regex):
+                started = time.perf_counter()
+                extract(html, url)
+                self.assertLess(time.perf_counter() - started, 1.0)
+
+    def test_process_pool_returns_same_result_and_profile_counts(self) -> None:
+        page = next(item for item in load_corpus() if item.name == "promobil_test")
+        reset_profile_stats()
+        in_process = extract_page(page.raw, page.charset, page.url)
+
+        os.environ["EXTRACTION_PROCESSES"] = "2"
+        config_module.get_settings.cache_clear()
+        try:
+            pooled = [extract_page(page.raw, page.charset, page.url) for _ in range(2)]
+        finally:
+            shutdown_pool()
+            os.environ.pop("EXTRACTION_PROCESSES", None)
+            config_module.get_settings.cache_clear()
+
+        self.assertEqual(pooled, [in_process, in_process])
+        stats = next(item for item in profile_stats() if item["name"] == "promobil")
+        self.assertEqual(stats["content_hits"], 3)
+        reset_profile_stats()
+
+    def test_single_pass_engine_matches_regex_engine(self) -> None:
+        url = "https://www.presseportal.de/pm/118273/6158137"
+        for html in (SAMPLE_HTML, SAMPLE_HTML_AGENTUR):
+            self.assertEqual(extract_article_from_html(html, url), _extract_with_regex(html, url))
+        # The regex byline pattern runs on greedily into the following elements;
+        # the tokenizer stops at the byline element. Everything else must match.
+        self.assertEqual(
+            replace(extract_article_from_html(SAMPLE_HTML_IMAGES, url), author=None),
+            replace(_extract_with_regex(SAMPLE_HTML_IMAGES, url), author=None),
+        )
+
+    @unittest.skipUnless(dom_scan.available(), "selectolax nicht installiert")
+    def test_selectolax_backend_matches_builtin_tokenizer(self) -> None:
+        pages = [(html, "https://www.presseportal.de/pm/118273/6158137") for html in (SAMPLE_HTML, SAMPLE_HTML_AGENTUR, SAMPLE_HTML_IMAGES)]
+        pages += [(decode_page(page.raw, page.charset), page.url) for page in load_corpus()]
+        for html, url in pages:
+            self.assertEqual(
+                extract_article_from_html(html, url, backend="selectolax"),
+                extract_article_from_html(html, url, backend="builtin"),
+                url,
+            )
+
+    def test_unavailable_or_failing_backend_falls_back_to_builtin_tokenizer(self) -> None:
+        url = "https://www.presseportal.de/pm/118273/6158137"
+        expected = extract_article_from_html(SAMPLE_HTML, url, backend="builtin")
+        self.assertEqual(extract_article_from_html(SAMPLE_HTML, url, backend="unbekannt"), expected)
+        broken = Mock(side_effect=RuntimeError("kaputt"))
+        with patch.dict("backend.app.source_extraction.SCANNERS", {"kaputt": (lambda: True, broken)}):
+            _scanners.cache_clear()
+            try:
+                self.assertEqual(extract_article_from_html(SAMPLE_HTML, url, backend="kaputt"), expected)
+            finally:
+                _scanners.cache_clear()
+        broken.assert_called_once()
+
+    def test_read_bounded_stops_at_limits(self) -> None:
+        page = b"<html><head></head><body><article><p>Text</p></art" + b"icle><footer>" + b"x" * 500
+        chunks = [page[i : i + 7] for i in range(0, len(page), 7)]
+
+        raw, truncated = _read_bounded(iter(chunks), _PageLimits(max_bytes=0, stop_after_article=False, body_budget=0))
+        self.assertEqual((raw, truncated), (page, None))
+
+        raw, truncated = _read_bounded(iter(chunks), _PageLimits(max_bytes=100, stop_after_article=False, body_budget=0))
+        self.assertEqual((raw, truncated), (page[:100], "max_bytes"))
+        raw, truncated = _read_bounded(iter(chunks), _PageLimits(max_bytes=len(page), stop_after_article=False, body_budget=0))
+        self.assertEqual((raw, truncated), (page, None))
+        raw, truncated = _read_bounded(iter(chunks), _PageLimits(max_bytes=len(page) - 1, stop_after_article=False, body_budget=0))
+        self.assertEqual((raw, truncated), (page[:-1], "max_bytes"))
+
+        raw, truncated = _read_bounded(iter(chunks), _PageLimits(max_bytes=0, stop_after_article=True, body_budget=0))
+        self.assertEqual(truncated, "article_end")
+        self.assertIn(b"</article>", raw)
+        self.assertLess(len(raw), len(page))
+
+        raw, truncated = _read_bounded(iter(chunks), _PageLimits(max_bytes=0, stop_after_article=False, body_budget=20))
+        self.assertEqual(truncated, "body_budget")
+        self.assertEqual(raw, page[: page.index(b"<body>") + 20])
+
+    @patch("backend.app.source_extraction._page_limits")
+    @patch("backend.app.source_extraction.get_http_client")
+    def test_extract_article_records_truncation(self, mock_client, mock_limits) -> None:
+        mock_client.return_value = _mock_client(SAMPLE_HTML + "<!--" + "x" * 5000 + "-->")
+        mock_limits.return_value = _PageLimits(max_bytes=0, stop_after_article=True, body_budget=0)
+
+        extracted = extract_article("https://www.presseportal.de/pm/118273/6158137")
+        self.assertEqual(extracted.truncated, "article_end")
+        self.assertEqual(extracted.author, "Max Mustermann")
+        self.assertIn("Pressekontakt", extracted.press_contact or "")
+        self.assertEqual(extracted_article_to_meta(extracted)["truncated"], "article_end")
+
+    def test_decode_page_sniffs_bom_and_meta_charset(self) -> None:
+        latin = '<html><head><meta charset="iso-8859-1"></head><body>Gr\u00fc\u00dfe \u2013 Caf\u00e9</body></html>'
+        self.assertIn("Grüße – Café", decode_page(latin.encode("cp1252"), None))
+        # HTTP header wins over <meta>, BOM wins over both.
+        self.assertIn("Grüße", decode_page(latin.replace("iso-8859-1", "utf-8").encode("cp1252"), "windows-1252"))
+        self.assertEqual(decode_page(b"\xef\xbb\xbf<p>\xc3\xa4</p>", "iso-8859-1"), "<p>ä</p>")
+        self.assertEqual(decode_page("<p>ä</p>".encode("utf-16"), None), "<p>ä</p>")
+        # No declaration: UTF-8 if it decodes (also when cut mid-character), else windows-1252.
+        self.assertEqual(decode_page("<p>Grüße</p>".encode("utf-8"), None), "<p>Grüße</p>")
+        self.assertEqual(decode_page("<p>ä".encode("utf-8")[:-1], None), "<p>\ufffd")
+        self.assertEqual(decode_page("<p>Grüße</p>".encode("cp1252"), None), "<p>Grüße</p>")
+
+    @patch("backend.app.source_extraction.get_http_client")
+    def test_non_text_codec_labels_are_ignored(self, mock_client) -> None:
+        page = '<html><head><meta charset="hex"></head><body><p>Gr\u00fc\u00dfe</p></body></html>'
+        self.assertIn("Grüße", decode_page(page.encode("utf-8"), None))
+        self.assertIn("Grüße", decode_page(page.replace("hex", "iso-8859-1").encode("cp1252"), "base64"))
+
+        mock_client.return_value = httpx.Client(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(
+                    200,
+                    content=SAMPLE_HTML.replace('charset="utf-8"', 'charset="hex"').encode("utf-8"),
+                    headers={"Content-Type": "text/html; charset=base64"},
+                )
+            )
+        )
+        extracted = extract_article("https://www.presseportal.de/pm/118273/6158137")
+        self.assertIsNone(extracted.extraction_error)
+        self.assertEqual(extracted.title, "Demo Meldung von Presseportal")
+
+        # Whatever else goes wrong in extraction ends as a failed entry, not an exception.
+        with patch("backend.app.source_extraction.extract_article_from_html", side_effect=ValueError("kaputt")):
+            extracted = extract_article("https://www.presseportal.de/pm/118273/6158138")
+        self.assertIn("kaputt", extracted.extraction_error or "")
+
+    @patch("backend.app.source_extraction.get_http_client")
+    def test_extract_article_decodes_compressed_response(self, mock_client) -> None:
+        seen_headers: dict[str, str] = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.update(request.headers)
+            body = gzip.compress(SAMPLE_HTML.replace('charset="utf-8"', 'charset="iso-8859-1"').replace("Demo Meldung", "Demo M\u00e4ldung").encode("cp1252"))
+            return httpx.Response(200, content=body, headers={"Content-Type": "text/html", "Content-Encoding": "gzip"})
+
+        mock_client.return_value = httpx.Client(transport=httpx.MockTransport(handler), headers={"Accept-Encoding": accept_encoding()})
+        extracted = extract_article("https://www.presseportal.de/pm/118273/6158137")
+        self.assertIn("gzip", seen_headers.get("accept-encoding", ""))
+        self.assertEqual(extracted.title, "Demo Mäldung von Presseportal")
+
+    def test_json_ld_article_wins_over_heuristics(self) -> None:
+        for engine in (extract_article_from_html, _extract_with_regex):
+            extracted = engine(SAMPLE_HTML_JSON_LD, "https://example.org/news/1")
+            self.assertEqual(extracted.title, "Neue Kastenwagen & Campervans")
+            self.assertEqual(extracted.author, "Erika Beispiel, Max Muster")
+            self.assertEqual(extracted.summary, "Meta-Beschreibung")
+            self.assertEqual(extracted.content_text, "Erster Absatz aus JSON-LD.\nPressekontakt: Agentur Nord\nTel. 040 123")
+            self.assertIn("Agentur Nord", extracted.press_contact or "")
+            self.assertEqual(extracted.published_at, "2026-03-01T08:30:00+00:00")
+            self.assertEqual(
+                extracted.images,
+                ["https://example.org/img/ld.jpg", "https://example.org/img/og.jpg", "https://example.org/img/inline.jpg"],
+            )
+            self.assertEqual(
+                extracted.image_metadata["https://example.org/img/ld.jpg"],
+                {"caption": "Der neue Van", "credit": "Hersteller", "width": 1200, "height": 800},
+            )
+
+    def test_invalid_json_ld_falls_back_to_heuristics(self) -> None:
+        html = SAMPLE_HTML.replace("</head>", '<script type="application/ld+json">{"@type": "NewsArticle",</script></head>')
+        url = "https://www.presseportal.de/pm/118273/6158137"
+        self.assertEqual(extract_article_from_html(html, url), extract_article_from_html(SAMPLE_HTML, url))
+
+    @patch("backend.app.source_extraction.get_http_client")
+    def test_extract_article_revalidates_cached_result(self, mock_client) -> None:
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304, headers={"ETag": '"v1"'})
+            return httpx.Response(200, html=SAMPLE_HTML, headers={"ETag": '"v1"', "Last-Modified": "Wed, 01 Apr 2026 08:00:00 GMT"})
+
+        mock_client.return_value = httpx.Client(transport=httpx.MockTransport(handler))
+        first = extract_article("https://www.presseportal.de/pm/118273/6158137?utm_source=feed")
+        second = extract_article("https://WWW.presseportal.de/pm/118273/6158137#top")
+
+        self.assertEqual(second, first)
+        self.assertEqual(len(requests), 2)
+        self.assertNotIn("If-None-Match", requests[0].headers)
+        self.assertEqual(requests[1].headers["If-None-Match"], '"v1"')
+        self.assertEqual(requests[1].headers["If-Modified-Since"], "Wed, 01 Apr 2026 08:00:00 GMT")
+
+        # A changed page (200 despite validators) is parsed again.
+        mock_client.return_value = httpx.Client(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, html=SAMPLE_HTML_AGENTUR, headers={"ETag": '"v2"'}))
+        )
+        third = extract_article("https://www.presseportal.de/pm/118273/6158137")
+        self.assertEqual(third.title, "Demo Meldung Agentur")
+
+    def test_extraction_cache_evicts_least_recently_used(self) -> None:
+        from backend.app import extraction_cache
+
+        os.environ["EXTRACTION_CACHE_MAX_ENTRIES"] = "2"
+        config_module.get_settings.cache_clear()
+        try:
+            for index in range(3):
+                extraction_cache.store(f"https://example.org/{index}", {"title": str(index)}, f'"{index}"', None)
+            self.assertIsNone(extraction_cache.lookup("https://example.org/0"))
+            self.assertEqual(extraction_cache.lookup("https://example.org/2").result, {"title": "2"})
+            # Entries without validators cannot be revalidated and are not kept.
+            extraction_cache.store("https://example.org/plain", {"title": "x"}, None, None)
+            self.assertIsNone(extraction_cache.lookup("https://example.org/plain"))
+        finally:
+            os.environ.pop("EXTRACTION_CACHE_MAX_ENTRIES", None)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,13 @@
+import gzip
+import json
 import os
 import unittest
 from unittest.mock import patch
 
+import httpx
+
 from backend.app import config as config_module
-from backend.app.wordpress import publish_article_draft
+from backend.app.wordpress import _wp_request, publish_article_draft
 
 
 class TestWordpressPublish(unittest.TestCase):
@@ -134,6 +138,24 @@ class TestWordpressPublish(unittest.TestCase):
         self.assertIn("<!-- wp:list -->", content)
         self.assertNotIn("<!-- wp:html -->", content)
 
+    @patch("backend.app.wordpress.get_http_client")
+    def test_wp_request_decodes_compressed_json(self, mock_client) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.assertEqual(request.headers["Authorization"], "Basic abc")
+            self.assertEqual(json.loads(request.content), {"title": "T"})
+            body = gzip.compress(json.dumps({"id": 7, "title": "Grüße"}).encode("utf-8"))
+            return httpx.Response(201, content=body, headers={"Content-Encoding": "gzip"})
+
+        mock_client.return_value = httpx.Client(transport=httpx.MockTransport(handler))
+        result = _wp_request(
+            base_url="https://example.org/",
+            auth_header="Basic abc",
+            method="POST",
+            endpoint="posts",
+            payload={"title": "T"},
+        )
+        self.assertEqual(result, {"id": 7, "title": "Grüße"})
+
 
 if __name__ == "__main__":
     unittest.main()